@@ -0,0 +1,89 @@
+"""
+Benchmark for the responsibility assignment solver on generated models.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+
+import argparse
+import random
+import time
+
+from goalmodeling.schema import Agent, AgentType, OperationCategory
+from goalmodeling.responsibility import ResponsibilityIndex
+from goalmodeling.assignment import AgentProfile, Requirement, assign
+from benchmarks.loadtest import build_model
+
+
+def build_profiles(count, seed):
+    """
+    Make agents of both types, some of them able to perform both operation categories.
+    :param int count: The number of agents.
+    :param int seed: The random seed.
+    :return list[AgentProfile]: The profiles.
+    """
+    generator = random.Random(seed)
+    profiles = []
+    for i in range(count):
+        agent_type = AgentType.SOFTWARE_AGENT if i % 2 else AgentType.ENVIRONMENT_AGENT
+        categories = None
+        if generator.random() < 0.25:
+            categories = set(OperationCategory)
+        capacity = generator.choice([None, None, 200, 500])
+        profiles.append(AgentProfile(Agent(f"Agent{i}", agent_type), categories, capacity,
+                                     cost=generator.choice([1.0, 1.5, 2.0])))
+    return profiles
+
+
+def build_requirements(goals, seed):
+    """
+    Give every goal a random requirement.
+    :return dict: The goals mapped to their requirements.
+    """
+    generator = random.Random(seed)
+    choices = [
+        Requirement(),
+        Requirement({AgentType.SOFTWARE_AGENT}),
+        Requirement({AgentType.ENVIRONMENT_AGENT}),
+        Requirement(categories={OperationCategory.SOFTWARE_TO_BE_OPERATION}),
+        Requirement({AgentType.ENVIRONMENT_AGENT}, {OperationCategory.SOFTWARE_TO_BE_OPERATION}),
+    ]
+    return {goal: generator.choice(choices) for goal in goals}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="assignment",
+        description="Time the responsibility assignment solver on a generated model.",
+        epilog="For example, python3 -m benchmarks.assignment --depth 4 --branching 8 --agents 40"
+    )
+
+    parser.add_argument("--depth", type=int, default=4, help="Depth of the model")
+    parser.add_argument("--branching", type=int, default=8, help="Branching of the model")
+    parser.add_argument("--agents", type=int, default=40, help="Number of agents")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs")
+
+    args = parser.parse_args()
+
+    root = build_model(args.depth, args.branching, "A")
+    responsibilities = ResponsibilityIndex([root])
+    goals = responsibilities.uncovered()
+    profiles = build_profiles(args.agents, args.seed)
+    requirements = build_requirements(goals, args.seed)
+
+    timings = []
+    result = None
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        result = assign(responsibilities, profiles, requirements.get)
+        timings.append(time.perf_counter() - start)
+
+    print(f"Goals:      {len(goals)} ({len(result.unassigned)} unassignable)")
+    print(f"Agents:     {len(profiles)}")
+    print(f"Load:       min {min(result.loads)}, max {max(result.loads)}, cost {result.cost():.0f}")
+    print(f"Time:       best {min(timings) * 1000:.1f} ms, worst {max(timings) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Synthetic goal models of controllable size and shape for benchmarks.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+
+import random
+from collections import deque
+
+from goalmodeling.schema import (
+    AchieveGoal,
+    MaintainGoal,
+    SoftGoal,
+    Obstacle,
+    Refinement,
+    Agent,
+    AgentType,
+    Operation,
+    OperationCategory,
+    PerformanceLink,
+    ConflictLink,
+    ObstructionLink,
+    ResolutionLink,
+)
+
+GOAL_CLASSES = (AchieveGoal, AchieveGoal, MaintainGoal, SoftGoal)
+WORDS = ("request", "book", "copy", "door", "train", "signal", "speed", "user", "bill", "payment",
+         "weather", "zip", "code", "sensor", "moving", "closed", "available", "borrowed", "due", "safe")
+
+
+def annotation_text(generator: random.Random, length: int):
+    """
+    Make an annotation of about the given length from a small vocabulary.
+    :param random.Random generator: The random generator.
+    :param int length: The number of characters.
+    :return str: The annotation, empty for a length of 0.
+    """
+    words = []
+    size = 0
+    while size < length:
+        word = generator.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:length]
+
+
+def generate_model(vertices: int = 1000,
+                   branching: int = 4,
+                   depth: int = None,
+                   sharing: float = 0.0,
+                   obstacle_density: float = 0.0,
+                   conflict_density: float = 0.0,
+                   annotation_length: int = 0,
+                   agents: int = 8,
+                   seed: int = 0):
+    """
+    Generate a goal model breadth first from one root.
+
+    Goals are refined level by level until the model has the requested number of goals and
+    refinements or every goal sits at the maximum depth; the goals left unrefined are leaves,
+    each performed by one of a pool of agents. A shared child is an existing goal of the level
+    below, so sharing never creates a cycle. Obstacles and links come on top of the requested
+    size.
+    :param int vertices: The number of goals and refinements.
+    :param int branching: The number of children of each refinement.
+    :param int depth: The most refinement levels below the root, or None for no limit.
+    :param float sharing: The probability that a child is a goal already refining another goal.
+    :param float obstacle_density: The share of leaf goals obstructed by an obstacle; every other
+        obstacle is refined into two sub-obstacles and every third resolved by a new goal.
+    :param float conflict_density: The number of conflicts per goal.
+    :param int annotation_length: The length of the annotation of every goal, 0 for none.
+    :param int agents: The number of distinct agents performing leaf goals.
+    :param int seed: The random seed; the same arguments always give the same model.
+    :return tuple: The root goals and the list of links.
+    """
+    generator = random.Random(seed)
+    counter = [0]
+
+    def goal():
+        counter[0] += 1
+        cls = generator.choice(GOAL_CLASSES)
+        annotation = annotation_text(generator, annotation_length) if annotation_length else ""
+        return cls(f"G{counter[0]}", annotation=annotation)
+
+    root = goal()
+    goals = [root]
+    by_level = {0: [root]}
+    count = 1
+    queue = deque([(root, 0)])
+    while queue and count < vertices:
+        parent, level = queue.popleft()
+        if depth is not None and level >= depth:
+            queue.appendleft((parent, level))
+            break
+        below = by_level.setdefault(level + 1, [])
+        children = []
+        for _ in range(branching):
+            if sharing and below and generator.random() < sharing:
+                child = generator.choice(below)
+                if child not in children:
+                    children.append(child)
+                    continue
+            child = goal()
+            goals.append(child)
+            below.append(child)
+            children.append(child)
+            queue.append((child, level + 1))
+            count += 1
+        parent.disjunctions.append(Refinement(generator.random() < 0.5, children))
+        count += 1
+
+    leaves = [g for g in goals if not g.disjunctions]
+    pool = [(f"Agent{i}", AgentType.SOFTWARE_AGENT if i % 2 else AgentType.ENVIRONMENT_AGENT)
+            for i in range(max(1, agents))]
+    for leaf in leaves:
+        leaf.leaf = True
+        name, agent_type = generator.choice(pool)
+        category = (OperationCategory.SOFTWARE_TO_BE_OPERATION if agent_type == AgentType.SOFTWARE_AGENT
+                    else OperationCategory.ENVIRONMENT_OPERATION)
+        leaf.performs.append(PerformanceLink(Agent(name, agent_type), Operation(f"Do {leaf.name}", category)))
+
+    links = []
+    obstacles = 0
+    for leaf in leaves:
+        if not obstacle_density or generator.random() >= obstacle_density:
+            continue
+        obstacles += 1
+        obstacle = Obstacle(f"<b>not</b> {leaf.name}")
+        if obstacles % 2 == 0:
+            obstacle.refinements.append(Refinement(False, [Obstacle(f"O{obstacles}a"), Obstacle(f"O{obstacles}b")]))
+        links.append(ObstructionLink(leaf, obstacle))
+        if obstacles % 3 == 0:
+            links.append(ResolutionLink(goal(), obstacle))
+
+    for _ in range(int(round(conflict_density * len(goals)))):
+        first, second = generator.sample(goals, 2) if len(goals) > 1 else (root, root)
+        links.append(ConflictLink(first, second))
+
+    return [root], links
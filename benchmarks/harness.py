@@ -0,0 +1,159 @@
+"""
+Benchmark harness timing model construction, rendering, and link generation, with peak memory,
+on the example figures and on synthetic models of growing size.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from goalmodeling.schema import generate_graph, generate_pako_link
+from goalmodeling.examples import MODELS
+from goalmodeling.stats import model_stats
+from benchmarks.generator import generate_model
+
+METRICS = ("construct", "render", "link", "peak_memory")
+
+
+def measure(build, repeat: int, memory: bool):
+    """
+    Measure one case.
+    :param build: A function without arguments returning the root goals and the links.
+    :param int repeat: The number of timed runs; the best time of each step is kept.
+    :param bool memory: Also measure peak memory, in a separate untimed run under tracemalloc.
+    :return dict: The vertices, the output size, the best times in seconds, and the peak memory in bytes.
+    """
+    best = {"construct": float("inf"), "render": float("inf"), "link": float("inf")}
+    roots = links = output = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        roots, links = build()
+        middle = time.perf_counter()
+        output = generate_graph(roots, links)
+        end = time.perf_counter()
+        generate_pako_link(output)
+        best["construct"] = min(best["construct"], middle - start)
+        best["render"] = min(best["render"], end - middle)
+        best["link"] = min(best["link"], time.perf_counter() - end)
+    result = {"vertices": model_stats(roots, links)["vertices"], "output_bytes": len(output)}
+    result.update(best)
+    del roots, links, output
+    if memory:
+        tracemalloc.start()
+        roots, links = build()
+        generate_pako_link(generate_graph(roots, links))
+        result["peak_memory"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def cases(args):
+    """
+    List the cases to run: the example figures, then one synthetic model per size.
+    :return list[tuple]: Case names and build functions.
+    """
+    selected = []
+    if not args.no_examples:
+        selected.extend((f"example:{name}", build) for name, build in MODELS.items())
+    for size in args.sizes:
+        def build(size=size):
+            return generate_model(size,
+                                  branching=args.branching,
+                                  sharing=args.sharing,
+                                  obstacle_density=args.obstacles,
+                                  conflict_density=args.conflicts,
+                                  annotation_length=args.annotation,
+                                  seed=args.seed)
+        selected.append((f"synthetic:{size}", build))
+    return selected
+
+
+def compare(results: dict, baseline: dict, threshold: float):
+    """
+    Print every metric next to the same metric of an earlier run.
+    :param dict results: The results of this run, by case.
+    :param dict baseline: The results of the earlier run, by case.
+    :param float threshold: The relative increase reported as a regression, e.g. 0.2 for 20%.
+    :return list[str]: The regressions, as "case metric" strings.
+    """
+    regressions = []
+    print(f"{'case':<28} {'metric':<12} {'before':>12} {'after':>12} {'ratio':>7}")
+    for case, result in results.items():
+        before = baseline.get(case)
+        if before is None:
+            continue
+        for metric in METRICS:
+            if metric not in result or not before.get(metric):
+                continue
+            ratio = result[metric] / before[metric]
+            flag = ""
+            if ratio > 1 + threshold:
+                flag = " slower" if metric != "peak_memory" else " larger"
+                regressions.append(f"{case} {metric}")
+            print(f"{case:<28} {metric:<12} {before[metric]:>12.6g} {result[metric]:>12.6g} {ratio:>7.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="harness",
+        description="Time model construction, generate_graph, and generate_pako_link, and measure "
+                    "peak memory, on the example figures and on synthetic models.",
+        epilog="For example, python3 -m benchmarks.harness --sizes 100 10000 1000000 "
+               "--output after.json --compare before.json"
+    )
+
+    parser.add_argument("--sizes", type=int, nargs="*", default=[100, 1000, 10000, 100000],
+                        help="Numbers of goals and refinements of the synthetic models")
+    parser.add_argument("--branching", type=int, default=4, help="Children per refinement")
+    parser.add_argument("--sharing", type=float, default=0.1, help="Probability that a child is shared")
+    parser.add_argument("--obstacles", type=float, default=0.1, help="Share of leaf goals obstructed")
+    parser.add_argument("--conflicts", type=float, default=0.01, help="Conflicts per goal")
+    parser.add_argument("--annotation", type=int, default=0, help="Annotation length of every goal")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs per case")
+    parser.add_argument("--no-examples", action="store_true", help="Skip the example figures")
+    parser.add_argument("--no-memory", action="store_true", help="Skip measuring peak memory")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Compare with the results of an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Relative increase reported as a regression")
+
+    args = parser.parse_args()
+
+    results = {}
+    for name, build in cases(args):
+        result = measure(build, args.repeat, not args.no_memory)
+        results[name] = result
+        memory = f"{result['peak_memory'] / 2 ** 20:9.1f} MiB" if "peak_memory" in result else ""
+        print(f"{name:<28} {result['vertices']:>8} vertices  construct {result['construct'] * 1000:9.2f} ms"
+              f"  render {result['render'] * 1000:9.2f} ms  link {result['link'] * 1000:9.2f} ms  {memory}")
+
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump({
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "arguments": vars(args),
+                "results": results,
+            }, fp, indent=2)
+
+    if args.compare:
+        with open(args.compare) as fp:
+            baseline = json.load(fp)["results"]
+        print()
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Load test for the local render server: measures throughput and latency percentiles.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+
+import argparse
+import http.client
+import threading
+import time
+from urllib.parse import urlparse
+
+from goalmodeling.schema import AchieveGoal, Refinement
+from goalmodeling.serialization import dumps
+from goalmodeling.server import make_server
+
+
+def build_model(depth, branching, tag):
+    """
+    Build a complete refinement tree of achievement goals.
+    :param int depth: The number of levels below the root.
+    :param int branching: The number of children of each refinement.
+    :param str tag: A prefix making models with different tags distinct.
+    :return AchieveGoal: The root goal.
+    """
+    counter = [0]
+
+    def goal(level):
+        counter[0] += 1
+        name = f"{tag}G{counter[0]}"
+        if level == depth:
+            return AchieveGoal(name, leaf=True)
+        children = [goal(level + 1) for _ in range(branching)]
+        return AchieveGoal(name, refinements=[Refinement(False, children)])
+
+    return goal(0)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run(url, bodies, clients, requests_per_client, output):
+    parsed = urlparse(url)
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def client(number):
+        connection = http.client.HTTPConnection(parsed.hostname, parsed.port)
+        local = []
+        for i in range(requests_per_client):
+            body = bodies[(number + i) % len(bodies)]
+            start = time.perf_counter()
+            connection.request("POST", f"/render?output={output}", body=body,
+                               headers={"Content-Type": "application/octet-stream"})
+            response = connection.getresponse()
+            response.read()
+            local.append(time.perf_counter() - start)
+            if response.status != 200:
+                with lock:
+                    errors.append(response.status)
+        connection.close()
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "seconds": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": max(latencies, default=0.0) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="loadtest",
+        description="Measure throughput and latency of the goal model render server.",
+        epilog="For example, python3 -m benchmarks.loadtest --clients 16 --requests 200"
+    )
+
+    parser.add_argument("--url", type=str, default=None,
+                        help="Server to test; an in-process server is started when omitted")
+    parser.add_argument("--clients", type=int, default=8, help="Number of concurrent clients")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per client")
+    parser.add_argument("--models", type=int, default=4, help="Number of distinct models sent")
+    parser.add_argument("--depth", type=int, default=4, help="Depth of each model")
+    parser.add_argument("--branching", type=int, default=4, help="Branching of each model")
+    parser.add_argument("--output", choices=["mermaid", "link"], default="mermaid")
+
+    args = parser.parse_args()
+
+    bodies = [dumps([build_model(args.depth, args.branching, f"M{m}")], binary=True)
+              for m in range(args.models)]
+
+    server = None
+    url = args.url
+    if url is None:
+        server = make_server(port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://{server.server_address[0]}:{server.server_address[1]}"
+
+    try:
+        result = run(url, bodies, args.clients, args.requests, args.output)
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+
+    print(f"Requests:   {result['requests']} ({result['errors']} errors)")
+    print(f"Throughput: {result['throughput']:.1f} requests/s")
+    print(f"Latency:    p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms, "
+          f"max {result['max_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1 @@
-__all__ = ["schema", "examples"]
\ No newline at end of file
+__all__ = ["schema", "examples", "aio", "serialization", "server", "bulk", "sqlstore", "lazy", "index", "subgraph", "lod", "validation", "evaluation", "whatif", "cutsets", "reachability", "impact", "responsibility", "assignment", "search", "stats", "profiling", "persistent", "transfer", "fragments", "workspace", "transforms", "registry"]
\ No newline at end of file
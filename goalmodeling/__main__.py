@@ -0,0 +1,61 @@
+"""
+Command line tools for serialized goal models.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+
+import argparse
+import json
+import sys
+
+from .serialization import decode
+from .stats import model_stats
+
+
+def read_model(path: str):
+    """
+    Read a model written by serialization.dumps, in JSON or binary.
+    :param str path: The file, or - for standard input.
+    :return tuple: The root vertices and the list of links.
+    """
+    if path == "-":
+        data = sys.stdin.buffer.read()
+    else:
+        with open(path, "rb") as fp:
+            data = fp.read()
+    return decode(data).build()
+
+
+def stats(args):
+    reports = {}
+    for path in args.models:
+        roots, links = read_model(path)
+        reports[path] = model_stats(roots, links)
+    output = reports[args.models[0]] if len(args.models) == 1 else reports
+    print(json.dumps(output, indent=args.indent))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="goalmodeling",
+        description="Tools for serialized goal models.",
+        epilog="For example, python3 -m goalmodeling stats model.json --indent 2"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    parser_stats = commands.add_parser(
+        "stats",
+        help="Print model metrics as JSON",
+        description="Print the size, depth, fan-out, completeness, responsibility, and obstacle "
+                    "coverage of models as JSON. Several models give an object keyed by file.")
+    parser_stats.add_argument("models", nargs="+", help="Model files in JSON or binary, or - for standard input")
+    parser_stats.add_argument("--indent", type=int, default=None, help="Indent the JSON output")
+    parser_stats.set_defaults(run=stats)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Asynchronous counterparts of generate_graph and generate_pako_link for asyncio applications.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+import asyncio
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from . import schema
+from .schema import (
+    Goal,
+    ObstructionLink,
+    ConflictLink,
+    ResolutionLink,
+    COMPRESS_CHUNK_SIZE,
+)
+
+
+class RenderCancelled(Exception):
+    """
+    Raised inside a worker when the coroutine waiting on it has been cancelled.
+    """
+    pass
+
+
+def _check(cancelled: threading.Event):
+    if cancelled.is_set():
+        raise RenderCancelled()
+
+
+def _render_graph(goals: list[Goal], links, scope, lod, profile, cancelled: threading.Event):
+    """
+    generate_graph, checking for cancellation before every goal, obstacle, and link.
+    """
+    return schema.generate_graph(goals, links, scope, lod, profile, check=lambda: _check(cancelled))
+
+
+def _render_pako_link(text: str, mode: str, host: str, config: dict, profile, cancelled: threading.Event):
+    """
+    generate_pako_link, checking for cancellation between compression chunks.
+    """
+    return schema.generate_pako_link(text, mode, host, config, profile, check=lambda: _check(cancelled))
+
+
+class AsyncRenderer:
+    """
+    Runs rendering and pako compression in a bounded pool of worker threads.
+
+    At most max_concurrent jobs occupy the pool at once; further callers wait on the event loop
+    without blocking it. Cancelling a waiting coroutine stops its worker at the next goal, obstacle,
+    link, or compression chunk, and the slot is handed back once the worker has actually stopped.
+
+    Workers are threads: the model is shared with them rather than copied, and cancellation is a
+    threading.Event. While a worker walks the model it holds the GIL, so the event loop and other
+    workers run between its bytecode slices rather than fully in parallel; zlib compression
+    releases the GIL.
+    """
+    def __init__(self, max_concurrent: int = 4, executor=None):
+        """
+        Initialize the renderer.
+        :param int max_concurrent: The maximum number of renders running at the same time.
+        :param ThreadPoolExecutor executor: An optional thread pool to use instead of an owned one.
+        """
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        if executor is not None and not isinstance(executor, ThreadPoolExecutor):
+            raise TypeError(f"executor must be a ThreadPoolExecutor, not {type(executor).__name__}")
+        self.max_concurrent = max_concurrent
+        self._owns_executor = executor is None
+        self._executor = executor if executor else ThreadPoolExecutor(
+            max_workers=max_concurrent,
+            thread_name_prefix="goalmodeling-render")
+        # Keyed weakly so a closed event loop and its semaphore can be collected.
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def _semaphore(self):
+        # asyncio primitives are bound to the loop they are first used on.
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphore()
+        await semaphore.acquire()
+
+        cancelled = threading.Event()
+        try:
+            future = loop.run_in_executor(self._executor, func, *args, cancelled)
+        except BaseException:
+            semaphore.release()
+            raise
+        future.add_done_callback(lambda _: semaphore.release())
+
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            cancelled.set()
+            # Retrieve the worker's RenderCancelled so it is not reported as never retrieved.
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            raise
+
+    async def generate_graph(
+            self,
+            goals: list[Goal],
+            links: list[ObstructionLink or ConflictLink or ResolutionLink] = None,
+            scope: set = None,
+            lod=None,
+            profile=None):
+        """
+        Generate a Mermaid js diagram for the given goals and links without blocking the event loop.
+        :param list[Goal] goals: The goals in the graph.
+        :param list[ObstructionLink or ConflictLink or ResolutionLink] links: The conflicts, obstructions, and resolutions in the graph.
+        :param set scope: If given, only vertices whose node ids are in scope, and links between them, are included.
+        :param LevelOfDetail lod: If given, subtrees beyond its depth or size limits are collapsed into summary nodes.
+        :param RenderProfile profile: If given, the phases of the render are timed and its counters recorded into it.
+        :return str: The Mermaid diagram definition.
+        """
+        return await self._run(_render_graph, goals, links, scope, lod, profile)
+
+    async def generate_pako_link(
+            self,
+            text: str,
+            mode: str = "view",
+            host: str = "https://mermaid.live",
+            config: dict = {"theme": "neutral"},
+            profile=None):
+        """
+        Generate a Mermaid pako link without blocking the event loop.
+        :param str text: The diagram definition.
+        :param str mode: "view" or "edit"
+        :param str host: The host to use for the pako link.
+        :param dict config: Additional Mermaid configuration.
+        :param RenderProfile profile: If given, the phases are timed and the sizes counted into it.
+        :return str: pako link
+        """
+        return await self._run(_render_pako_link, text, mode, host, config, profile)
+
+    def close(self):
+        """
+        Shut down the owned thread pool. Jobs already running are allowed to finish.
+        """
+        if self._owns_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+
+_default_renderer = None
+_default_renderer_lock = threading.Lock()
+
+
+def get_default_renderer():
+    """
+    Get the renderer shared by generate_graph_async and generate_pako_link_async.
+    :return AsyncRenderer: The shared renderer, created on first use.
+    """
+    global _default_renderer
+    with _default_renderer_lock:
+        if _default_renderer is None:
+            _default_renderer = AsyncRenderer()
+        return _default_renderer
+
+
+async def generate_graph_async(
+        goals: list[Goal],
+        links: list[ObstructionLink or ConflictLink or ResolutionLink] = None,
+        scope: set = None,
+        lod=None,
+        profile=None):
+    """
+    Asynchronous counterpart of generate_graph using the shared renderer.
+    :param list[Goal] goals: The goals in the graph.
+    :param list[ObstructionLink or ConflictLink or ResolutionLink] links: The conflicts, obstructions, and resolutions in the graph.
+    :param set scope: If given, only vertices whose node ids are in scope, and links between them, are included.
+    :param LevelOfDetail lod: If given, subtrees beyond its depth or size limits are collapsed into summary nodes.
+    :param RenderProfile profile: If given, the phases of the render are timed and its counters recorded into it.
+    :return str: The Mermaid diagram definition.
+    """
+    return await get_default_renderer().generate_graph(goals, links, scope, lod, profile)
+
+
+async def generate_pako_link_async(
+        text: str,
+        mode: str = "view",
+        host: str = "https://mermaid.live",
+        config: dict = {"theme": "neutral"},
+        profile=None):
+    """
+    Asynchronous counterpart of generate_pako_link using the shared renderer.
+    :param str text: The diagram definition.
+    :param str mode: "view" or "edit"
+    :param str host: The host to use for the pako link.
+    :param dict config: Additional Mermaid configuration.
+    :param RenderProfile profile: If given, the phases are timed and the sizes counted into it.
+    :return str: pako link
+    """
+    return await get_default_renderer().generate_pako_link(text, mode, host, config, profile)
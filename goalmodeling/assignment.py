@@ -0,0 +1,240 @@
+"""
+Proposing agents for leaf goals that nobody performs, respecting capabilities and balancing load.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+from collections import deque
+
+from .schema import (
+    Goal,
+    Agent,
+    AgentType,
+    Operation,
+    OperationCategory,
+)
+from .responsibility import ResponsibilityIndex
+
+
+class AgentProfile:
+    """
+    What an agent can take on in an assignment.
+    """
+    def __init__(self,
+                 agent: Agent,
+                 categories: set[OperationCategory] = None,
+                 capacity: int = None,
+                 cost: float = 1.0):
+        """
+        :param Agent agent: The agent.
+        :param set[OperationCategory] categories: The operation categories the agent can perform.
+            Defaults to software-to-be operations for software agents and environment operations
+            for environment agents.
+        :param int capacity: The most goals the agent can take on, counting those it already performs.
+        :param float cost: The cost of one unit of load on this agent. Every additional goal costs
+            more than the last, which spreads goals out.
+        """
+        self.agent = agent
+        if categories is None:
+            categories = {OperationCategory.SOFTWARE_TO_BE_OPERATION
+                          if agent.type == AgentType.SOFTWARE_AGENT
+                          else OperationCategory.ENVIRONMENT_OPERATION}
+        self.categories = set(categories)
+        self.capacity = capacity
+        self.cost = cost
+
+
+class Requirement:
+    """
+    What a goal needs from the agent performing it.
+    """
+    def __init__(self, agent_types: set[AgentType] = None, categories: set[OperationCategory] = None):
+        """
+        :param set[AgentType] agent_types: The agent types allowed, or None for any.
+        :param set[OperationCategory] categories: The operation categories allowed, or None for any.
+        """
+        self.agent_types = set(agent_types) if agent_types is not None else None
+        self.categories = set(categories) if categories is not None else None
+
+    def allows(self, profile: AgentProfile):
+        """
+        Whether an agent can perform a goal with this requirement.
+        """
+        if self.agent_types is not None and profile.agent.type not in self.agent_types:
+            return False
+        if self.categories is not None and not (self.categories & profile.categories):
+            return False
+        return True
+
+    def category(self, profile: AgentProfile):
+        """
+        Get the category of the operation the agent would perform.
+        :return OperationCategory: The lowest category both allow.
+        """
+        allowed = profile.categories if self.categories is None else self.categories & profile.categories
+        return min(allowed)
+
+
+class Assignment:
+    """
+    A proposed agent for every leaf goal that could be assigned.
+    """
+    def __init__(self, goals: dict, profiles: list[AgentProfile], unassigned: list[Goal], loads: list[int],
+                 requirements: dict):
+        """
+        :param dict goals: The goals mapped to the profile of the proposed agent.
+        :param list[AgentProfile] profiles: The agents.
+        :param list[Goal] unassigned: The goals no agent can take on.
+        :param list[int] loads: The resulting load of every agent, in the order of profiles.
+        :param dict requirements: The goals mapped to their requirements.
+        """
+        self.goals = goals
+        self.profiles = profiles
+        self.unassigned = unassigned
+        self.loads = loads
+        self.requirements = requirements
+
+    def cost(self):
+        """
+        Get the total cost: the sum over agents of cost times 1 + 2 + ... + load.
+        """
+        return sum(p.cost * n * (n + 1) / 2 for p, n in zip(self.profiles, self.loads))
+
+    def apply(self, responsibilities: ResponsibilityIndex):
+        """
+        Write a performance link for every proposal into the model.
+
+        Each goal gets its own Agent object with the name and type of the proposed agent, as
+        diagrams draw one agent node per goal, and an operation named after the goal.
+        :param ResponsibilityIndex responsibilities: The index of the model.
+        :return int: The number of performance links written.
+        """
+        for goal, profile in self.goals.items():
+            requirement = self.requirements[goal]
+            agent = Agent(profile.agent.name, profile.agent.type)
+            operation = Operation(goal.name, requirement.category(profile))
+            responsibilities.add_perform(goal, agent, operation)
+        return len(self.goals)
+
+
+def assign(responsibilities: ResponsibilityIndex,
+           profiles: list[AgentProfile],
+           requirement=None,
+           goals: list[Goal] = None):
+    """
+    Propose an agent for every uncovered leaf goal.
+
+    Goals are placed greedily, the most constrained first, on the allowed agent whose next
+    goal costs least; when every allowed agent is full, an augmenting path moves goals between
+    agents to make room. The result is then improved until no chain of moves between agents
+    lowers the total cost. Since the cost of an agent only depends on its load, such chains
+    are found on a graph with one vertex per agent, which keeps this fast for thousands of
+    goals and dozens of agents.
+    :param ResponsibilityIndex responsibilities: The index of the model, giving the current loads.
+    :param list[AgentProfile] profiles: The agents that may be proposed.
+    :param requirement: A function from a goal to its Requirement, or None for any agent.
+    :param list[Goal] goals: The goals to assign, by default the uncovered leaf goals.
+    :return Assignment: The proposals; call apply to write them into the model.
+    """
+    if goals is None:
+        goals = responsibilities.uncovered()
+    loads = [responsibilities.load(p.agent) for p in profiles]
+    capacity = [p.capacity if p.capacity is not None else float("inf") for p in profiles]
+
+    # Goals allowing the same agents behave the same, so they are grouped by that set.
+    requirements = {}
+    groups = {}
+    for goal in goals:
+        need = requirement(goal) if requirement is not None else None
+        need = need if need is not None else Requirement()
+        requirements[goal] = need
+        allowed = tuple(i for i, p in enumerate(profiles) if need.allows(p))
+        groups.setdefault(allowed, []).append(goal)
+
+    # agent -> allowed set -> goals placed there.
+    placed = [{} for _ in profiles]
+    where = {}
+    unassigned = list(groups.pop((), []))
+
+    def marginal(i):
+        return profiles[i].cost * (loads[i] + 1)
+
+    def move(goal, source, target, allowed):
+        if source is not None:
+            placed[source][allowed].remove(goal)
+            loads[source] -= 1
+        placed[target].setdefault(allowed, []).append(goal)
+        loads[target] += 1
+        where[goal] = (target, allowed)
+
+    def augment(allowed):
+        # Breadth-first search from the allowed agents, through goals that could move on, to
+        # an agent with room.
+        previous = {}
+        queue = deque()
+        for i in allowed:
+            previous[i] = None
+            queue.append(i)
+        while queue:
+            i = queue.popleft()
+            if loads[i] < capacity[i]:
+                return previous, i
+            for other, members in placed[i].items():
+                if not members:
+                    continue
+                for j in other:
+                    if j not in previous:
+                        previous[j] = (i, other)
+                        queue.append(j)
+        return None, None
+
+    for allowed in sorted(groups, key=len):
+        for goal in groups[allowed]:
+            free = [i for i in allowed if loads[i] < capacity[i]]
+            if free:
+                move(goal, None, min(free, key=marginal), allowed)
+                continue
+            previous, end = augment(allowed)
+            if end is None:
+                unassigned.append(goal)
+                continue
+            while previous[end] is not None:
+                source, other = previous[end]
+                move(placed[source][other][-1], source, end, other)
+                end = source
+            move(goal, None, end, allowed)
+
+    # Improve: move a goal along a chain of agents from an agent a to an agent b when that
+    # lowers the cost, i.e. when b's next goal costs less than a's last one.
+    improved = True
+    while improved:
+        improved = False
+        for start in sorted(range(len(profiles)), key=lambda i: -profiles[i].cost * loads[i]):
+            saving = profiles[start].cost * loads[start]
+            previous = {start: None}
+            queue = deque([start])
+            best = None
+            while queue:
+                i = queue.popleft()
+                for other, members in placed[i].items():
+                    if not members:
+                        continue
+                    for j in other:
+                        if j not in previous:
+                            previous[j] = (i, other)
+                            queue.append(j)
+                            if loads[j] < capacity[j] and marginal(j) < saving - 1e-12:
+                                if best is None or marginal(j) < marginal(best):
+                                    best = j
+            if best is None:
+                continue
+            end = best
+            while previous[end] is not None:
+                source, other = previous[end]
+                move(placed[source][other][-1], source, end, other)
+                end = source
+            improved = True
+            break
+
+    proposals = {goal: profiles[where[goal][0]] for goal in goals if goal in where}
+    return Assignment(proposals, profiles, unassigned, loads, requirements)
@@ -0,0 +1,380 @@
+"""
+Bulk loading of goal models from CSV vertex and refinement tables.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+
+The vertex table has a header row and one row per goal, obstacle, or domain property:
+
+    id,kind,name,parent,agent,agent_type,operation,operation_category,leaf,annotation
+
+Only id and kind are required. kind is one of Achieve, Maintain, Avoid, Cease, Soft, Goal,
+Obstacle, or Domain (the class names, e.g. AchieveGoal, are accepted too). parent is the id of
+the refinement the vertex is a child of; when no refinement with that id exists but a vertex
+does, the vertex becomes a child of a single implicit refinement of that parent. agent and
+operation create a performance link; agent_type is "software" or "environment" (the default)
+and operation_category is "software" or "environment" (the default).
+
+The optional refinement table has one row per refinement:
+
+    id,parent,complete,annotation
+
+where parent is the id of the refined goal or obstacle.
+
+Rows with errors are skipped and reported; the rest of the model is still loaded. A vertex
+whose parent cannot be resolved, or whose chain of parents leads back to itself, is reported and
+kept as a root.
+"""
+import csv
+import io
+from collections import Counter
+from itertools import accumulate, compress
+from operator import itemgetter
+
+from .schema import AgentType, OperationCategory
+from .serialization import ModelTable, KIND_CODES
+from .schema import (
+    Goal,
+    AchieveGoal,
+    MaintainGoal,
+    AvoidGoal,
+    CeaseGoal,
+    SoftGoal,
+    Obstacle,
+    Refinement,
+    Agent,
+    Operation,
+    DomainProperty,
+)
+
+DEFAULT_CHUNK_SIZE = 65536
+
+KIND_ALIASES = {
+    "achieve": AchieveGoal,
+    "maintain": MaintainGoal,
+    "avoid": AvoidGoal,
+    "cease": CeaseGoal,
+    "soft": SoftGoal,
+    "goal": Goal,
+    "obstacle": Obstacle,
+    "domain": DomainProperty,
+    "domainproperty": DomainProperty,
+}
+for _cls in (AchieveGoal, MaintainGoal, AvoidGoal, CeaseGoal, SoftGoal):
+    KIND_ALIASES[_cls.__name__.lower()] = _cls
+
+TRUE_VALUES = frozenset(("1", "true", "t", "yes", "y", "x"))
+FALSE_VALUES = frozenset(("", "0", "false", "f", "no", "n"))
+AGENT_TYPES = {
+    "": AgentType.ENVIRONMENT_AGENT,
+    "environment": AgentType.ENVIRONMENT_AGENT,
+    "environment_agent": AgentType.ENVIRONMENT_AGENT,
+    "software": AgentType.SOFTWARE_AGENT,
+    "software_agent": AgentType.SOFTWARE_AGENT,
+}
+OPERATION_CATEGORIES = {
+    "": OperationCategory.ENVIRONMENT_OPERATION,
+    "environment": OperationCategory.ENVIRONMENT_OPERATION,
+    "environment_operation": OperationCategory.ENVIRONMENT_OPERATION,
+    "software": OperationCategory.SOFTWARE_TO_BE_OPERATION,
+    "software_to_be_operation": OperationCategory.SOFTWARE_TO_BE_OPERATION,
+}
+
+VERTEX_COLUMNS = ("id", "kind", "name", "parent", "agent", "agent_type", "operation",
+                  "operation_category", "leaf", "annotation")
+REFINEMENT_COLUMNS = ("id", "parent", "complete", "annotation")
+
+
+class RowError:
+    """
+    A problem with one row of an input table.
+    """
+    def __init__(self, table: str, line: int, column: str, message: str):
+        """
+        Initialize the row error.
+        :param str table: "vertices" or "refinements".
+        :param int line: The line number in the file, counting the header as line 1.
+        :param str column: The offending column, or "" for the whole row.
+        :param str message: What is wrong.
+        """
+        self.table = table
+        self.line = line
+        self.column = column
+        self.message = message
+
+    def __repr__(self):
+        return f"RowError({self.table!r}, {self.line}, {self.column!r}, {self.message!r})"
+
+    def __str__(self):
+        column = f", column {self.column}" if self.column else ""
+        return f"{self.table} line {self.line}{column}: {self.message}"
+
+
+def _open(source):
+    if isinstance(source, (str, bytes)) or hasattr(source, "__fspath__"):
+        return open(source, "r", encoding="utf-8", newline=""), True
+    return source, False
+
+
+def _read_chunks(source, table_name, columns, required, errors, chunk_size):
+    """
+    Yield lists of (line, row), each row a tuple of the known columns in order.
+    Absent columns read as "".
+    """
+    handle, owned = _open(source)
+    try:
+        reader = csv.reader(handle, skipinitialspace=True)
+        header = next(reader, None)
+        if header is None:
+            return
+        header = [h.strip().lower() for h in header]
+        missing = [c for c in required if c not in header]
+        if missing:
+            errors.append(RowError(table_name, 1, missing[0], "missing required column"))
+            return
+        width = len(header)
+        # Absent columns are read from an empty string appended to every row.
+        project = itemgetter(*[header.index(c) if c in header else width for c in columns])
+        padding = [""] * (width + 1)
+
+        chunk = []
+        for line, row in enumerate(reader, 2):
+            if len(row) != width:
+                if not row:
+                    continue
+                row = (row + padding)[:width]
+            row.append("")
+            chunk.append((line, project(row)))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        if owned:
+            handle.close()
+
+
+def _lookup(values, mapping):
+    """
+    Resolve the distinct values of one column of a chunk case-insensitively.
+    :return dict: The resolved value of each distinct raw value, None when unknown.
+    """
+    return {value: mapping.get(value.strip().lower()) for value in set(values)}
+
+
+def _flag(value, table, line, column, errors):
+    lowered = value.lower()
+    if lowered in TRUE_VALUES:
+        return True
+    if lowered not in FALSE_VALUES:
+        errors.append(RowError(table, line, column, f"expected a boolean, got {value!r}"))
+    return False
+
+
+def load_table(vertices, refinements=None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Load vertex and refinement tables into a ModelTable.
+    :param vertices: A path or text file object with the vertex table.
+    :param refinements: An optional path or text file object with the refinement table.
+    :param int chunk_size: The number of rows validated together.
+    :return tuple: The ModelTable and the list of RowError, in input order.
+    """
+    errors = []
+    table = ModelTable()
+    kind_append = table.kind.append
+    name_append = table.name.append
+    annotation_append = table.annotation.append
+    leaf_append = table.leaf.append
+
+    # Positions of vertices and refinements by id, and the line each was defined on.
+    vertex_position = {}
+    vertex_line = []
+    # Parent id of each vertex, resolved once every id is known.
+    vertex_parent = []
+    # (vertex position, agent name, agent type, operation name, operation category).
+    performs = []
+
+    for chunk in _read_chunks(vertices, "vertices", VERTEX_COLUMNS, ("id", "kind"), errors, chunk_size):
+        # Resolve the categorical columns once per distinct value in the chunk.
+        kinds = _lookup([row[1] for _, row in chunk], KIND_ALIASES)
+        agent_types = _lookup([row[5] for _, row in chunk], AGENT_TYPES)
+        categories = _lookup([row[7] for _, row in chunk], OPERATION_CATEGORIES)
+
+        for line, (vid, kind, name, parent, agent, agent_type, operation, category, leaf,
+                   annotation) in chunk:
+            cls = kinds[kind]
+            if not vid or vid in vertex_position or cls is None:
+                if not vid:
+                    errors.append(RowError("vertices", line, "id", "missing id"))
+                elif cls is None:
+                    errors.append(RowError("vertices", line, "kind", f"unknown kind {kind!r}"))
+                else:
+                    errors.append(RowError("vertices", line, "id", f"duplicate id {vid!r}"))
+                continue
+            if agent or operation:
+                resolved_agent_type = agent_types[agent_type]
+                resolved_category = categories[category]
+                if not issubclass(cls, Goal):
+                    errors.append(RowError("vertices", line, "agent", "only goals have performance links"))
+                    continue
+                if not agent:
+                    errors.append(RowError("vertices", line, "agent", "operation without an agent"))
+                    continue
+                if resolved_agent_type is None:
+                    errors.append(RowError("vertices", line, "agent_type",
+                                           f"unknown agent type {agent_type!r}"))
+                    continue
+                if resolved_category is None:
+                    errors.append(RowError("vertices", line, "operation_category",
+                                           f"unknown operation category {category!r}"))
+                    continue
+                performs.append((len(vertex_line), agent, resolved_agent_type, operation, resolved_category))
+
+            vertex_position[vid] = len(vertex_line)
+            vertex_line.append(line)
+            vertex_parent.append(parent)
+            kind_append(KIND_CODES[cls])
+            name_append(name or vid)
+            annotation_append(annotation)
+            leaf_append(1 if leaf and _flag(leaf, "vertices", line, "leaf", errors) else 0)
+
+    count = len(vertex_line)
+    table.attr = [0] * count
+    table.node_id = [-1] * count
+
+    goal_count = len(vertex_line)
+    domain_code = KIND_CODES[DomainProperty]
+    refinement_code = KIND_CODES[Refinement]
+
+    # Refinements follow the vertices, in table order.
+    refinement_position = {}
+    refinement_parent = []
+    if refinements is not None:
+        for chunk in _read_chunks(refinements, "refinements", REFINEMENT_COLUMNS, ("id", "parent"),
+                                  errors, chunk_size):
+            for line, (rid, parent, complete, annotation) in chunk:
+                if not rid:
+                    errors.append(RowError("refinements", line, "id", "missing id"))
+                    continue
+                if rid in refinement_position:
+                    errors.append(RowError("refinements", line, "id", f"duplicate id {rid!r}"))
+                    continue
+                parent_position = vertex_position.get(parent)
+                if parent_position is None:
+                    errors.append(RowError("refinements", line, "parent", f"unknown parent {parent!r}"))
+                    continue
+                if table.kind[parent_position] == domain_code:
+                    errors.append(RowError("refinements", line, "parent",
+                                           "domain properties cannot be refined"))
+                    continue
+                refinement_position[rid] = len(table.kind)
+                refinement_parent.append(parent_position)
+                table.add_vertex(refinement_code, "", annotation, False,
+                                 _flag(complete, "refinements", line, "complete", errors))
+
+    # Resolve the parent of each vertex to a refinement, or to a vertex refined implicitly.
+    child_parent = [-1] * goal_count
+    above = [-1] * goal_count
+    for position, parent in enumerate(vertex_parent):
+        if not parent:
+            continue
+        refinement = refinement_position.get(parent)
+        if refinement is not None:
+            child_parent[position] = refinement
+            above[position] = refinement_parent[refinement - goal_count]
+            continue
+        parent_position = vertex_position.get(parent)
+        if parent_position is None or table.kind[parent_position] == domain_code:
+            reason = "unknown parent" if parent_position is None else "domain properties cannot be refined"
+            errors.append(RowError("vertices", vertex_line[position], "parent", f"{reason} {parent!r}"))
+            continue
+        above[position] = parent_position
+
+    # Each vertex has at most one parent, so a vertex no root reaches is on a cycle of parents
+    # or below one. The vertices on a cycle become roots, which makes those below reachable.
+    state = [0] * goal_count
+    for start in range(goal_count):
+        path = []
+        position = start
+        while position >= 0 and not state[position]:
+            state[position] = 1
+            path.append(position)
+            position = above[position]
+        if position >= 0 and state[position] == 1:
+            for cycle in path[path.index(position):]:
+                errors.append(RowError("vertices", vertex_line[cycle], "parent",
+                                       f"cycle of parents through {vertex_parent[cycle]!r}"))
+                child_parent[cycle] = -1
+                above[cycle] = -1
+        for position in path:
+            state[position] = 2
+
+    # Create the implicit refinements, one per vertex refined through parent.
+    implicit = {}
+    for position, parent_position in enumerate(above):
+        if parent_position < 0 or child_parent[position] >= 0:
+            continue
+        refinement = implicit.get(parent_position)
+        if refinement is None:
+            refinement = table.add_vertex(refinement_code)
+            refinement_parent.append(parent_position)
+            implicit[parent_position] = refinement
+        child_parent[position] = refinement
+
+    # Agents and operations, shared by name and type.
+    agent_position = {}
+    operation_position = {}
+    agent_code = KIND_CODES[Agent]
+    operation_code = KIND_CODES[Operation]
+    for position, agent, agent_type, operation, category in performs:
+        key = (agent, agent_type)
+        agent_at = agent_position.get(key)
+        if agent_at is None:
+            agent_at = table.add_vertex(agent_code, agent, "", False, agent_type)
+            agent_position[key] = agent_at
+        operation_at = -1
+        if operation:
+            key = (operation, category)
+            operation_at = operation_position.get(key)
+            if operation_at is None:
+                operation_at = table.add_vertex(operation_code, operation, "", False, category)
+                operation_position[key] = operation_at
+        table.performs.append((position, agent_at, operation_at))
+
+    count = len(table.kind)
+
+    # Children in compressed sparse row form: refinements of each parent, then children of each refinement.
+    parent_of = child_parent + refinement_parent
+    parent_of.extend([-1] * (count - len(parent_of)))
+    # A stable sort by parent keeps children in table order.
+    children = sorted(compress(range(count), [p >= 0 for p in parent_of]), key=parent_of.__getitem__)
+    counts = Counter(parent_of)
+    table.child_offsets = list(accumulate((counts.get(i, 0) for i in range(count)), initial=0))
+    table.child_index = children
+
+    table.roots = [position for position, parent in enumerate(child_parent) if parent < 0]
+
+    errors.sort(key=lambda e: (e.table != "vertices", e.line))
+    return table, errors
+
+
+def load_model(vertices, refinements=None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Load vertex and refinement tables into schema objects.
+    :param vertices: A path or text file object with the vertex table.
+    :param refinements: An optional path or text file object with the refinement table.
+    :param int chunk_size: The number of rows validated together.
+    :return tuple: The root vertices, the list of links, and the list of RowError.
+    """
+    table, errors = load_table(vertices, refinements, chunk_size)
+    roots, links = table.build()
+    return roots, links, errors
+
+
+def loads_csv(vertices: str, refinements: str = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Like load_model, but reading the tables from strings.
+    """
+    return load_model(io.StringIO(vertices), io.StringIO(refinements) if refinements is not None else None,
+                      chunk_size)
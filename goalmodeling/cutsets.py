@@ -0,0 +1,280 @@
+"""
+Minimal cut sets: the smallest sets of leaf obstacles that together obstruct a goal.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+import math
+
+from .schema import (
+    Vertex,
+    Goal,
+    Obstacle,
+    Refinement,
+    ObstructionLink,
+)
+from .index import ModelIndex, refinements_of
+
+# A family of cut sets is a list of bitsets over the leaf obstacles. The family with only the
+# empty set is always obstructed; the empty family never is.
+_ALWAYS = [0]
+_NEVER = []
+
+
+class CutSets:
+    """
+    The minimal cut sets of one goal or obstacle.
+    """
+    def __init__(self, vertex: Vertex, sets: list[list[Obstacle]], truncated: bool):
+        """
+        :param Vertex vertex: The goal or obstacle.
+        :param list[list[Obstacle]] sets: The cut sets, smallest or most likely first.
+        :param bool truncated: True when a cap dropped cut sets, so the list may be incomplete.
+        """
+        self.vertex = vertex
+        self.sets = sets
+        self.truncated = truncated
+
+    def __len__(self):
+        return len(self.sets)
+
+    def __iter__(self):
+        return iter(self.sets)
+
+    def single_points(self):
+        """
+        Get the leaf obstacles that obstruct the vertex on their own.
+        :return list[Obstacle]: The obstacles.
+        """
+        return [s[0] for s in self.sets if len(s) == 1]
+
+    def importance(self):
+        """
+        Rank leaf obstacles by how many cut sets they appear in, sets of one counting most.
+        :return list[tuple]: Pairs of obstacle and score, best countermeasure target first.
+        """
+        scores = {}
+        obstacles = {}
+        for cut in self.sets:
+            for obstacle in cut:
+                obstacles[obstacle.node_id] = obstacle
+                scores[obstacle.node_id] = scores.get(obstacle.node_id, 0) + 1 / len(cut)
+        ranked = sorted(scores.items(), key=lambda item: -item[1])
+        return [(obstacles[node_id], score) for node_id, score in ranked]
+
+
+class CutSetAnalysis:
+    """
+    Computes minimal cut sets bottom up, sharing the result of every subtree.
+
+    A leaf obstacle is its own cut set. An obstacle occurs when all children of one of its
+    refinements occur; domain properties and goals in an obstacle refinement are taken to
+    hold. A refinement of a goal is obstructed when any child is, and a goal when every one of
+    its refinements is or when an obstacle obstructing it occurs. Resolution links are ignored,
+    since the cut sets are what they are chosen against.
+
+    Cut sets are bitsets over the leaf obstacles and every family is kept free of supersets.
+    max_order drops cut sets with more obstacles than that. top_k keeps only the k smallest,
+    or most likely when probabilities are given, cut sets of every intermediate family, so
+    products stay small; the result is then the best cut sets found, not necessarily all of
+    the best ones. Either cap marks the results it affected as truncated.
+    """
+    def __init__(self,
+                 roots: list[Vertex],
+                 links: list = None,
+                 max_order: int = None,
+                 top_k: int = None,
+                 probabilities: dict = None,
+                 index: ModelIndex = None):
+        """
+        :param list[Vertex] roots: The root goals.
+        :param list links: The conflict, obstruction, and resolution links.
+        :param int max_order: The most leaf obstacles in one cut set.
+        :param int top_k: The most cut sets kept per vertex.
+        :param dict probabilities: Leaf obstacles mapped to their probability of occurring.
+        :param ModelIndex index: An index of the model, if one was already built.
+        """
+        self.index = index if index is not None else ModelIndex(roots, links)
+        self.max_order = max_order
+        self.top_k = top_k
+        # bit position -> leaf obstacle.
+        self.leaves = []
+        self.bit = {}
+        for vertex in self.index.vertices.values():
+            if isinstance(vertex, Obstacle) and not vertex.refinements:
+                self.bit[vertex.node_id] = len(self.leaves)
+                self.leaves.append(vertex)
+        self.cost = None
+        if probabilities:
+            self.cost = [-math.log(max(probabilities.get(leaf, 1.0), 1e-300)) for leaf in self.leaves]
+        # node id -> family, and the node ids whose families were cut short.
+        self.families = {}
+        self.truncated = set()
+
+    def _obstructions(self, goal: Vertex):
+        return [link.obstacle for link in self.index.links_of(goal)
+                if type(link) == ObstructionLink and link.goal is goal]
+
+    def _below(self, vertex: Vertex):
+        if isinstance(vertex, Refinement):
+            return vertex.children
+        if isinstance(vertex, Goal):
+            return list(refinements_of(vertex)) + self._obstructions(vertex)
+        return refinements_of(vertex)
+
+    def family(self, vertex: Vertex):
+        """
+        Get the cut sets of a vertex as bitsets over the leaf obstacles.
+        :param Vertex vertex: The goal, obstacle, or refinement.
+        :return list[int]: The bitsets.
+        """
+        if vertex.node_id not in self.families:
+            self._compute(vertex)
+        return self.families[vertex.node_id]
+
+    def _compute(self, start: Vertex):
+        # Iterative post-order walk; a vertex met again on the walk path closes a cycle and
+        # cannot obstruct anything through it.
+        families = self.families
+        on_path = set()
+        stack = [(start, False)]
+        while stack:
+            vertex, expanded = stack.pop()
+            if vertex.node_id in families:
+                continue
+            if not expanded:
+                if vertex.node_id in on_path:
+                    continue
+                on_path.add(vertex.node_id)
+                stack.append((vertex, True))
+                for child in self._below(vertex):
+                    if child.node_id not in families and child.node_id not in on_path:
+                        stack.append((child, False))
+                continue
+            families[vertex.node_id] = self._combine(vertex)
+            on_path.discard(vertex.node_id)
+
+    def _combine(self, vertex: Vertex):
+        families = self.families
+        parent_of_obstacles = False
+        if isinstance(vertex, Refinement):
+            owner = self.index.owner.get(vertex.node_id)
+            parent_of_obstacles = isinstance(owner, Obstacle)
+        if isinstance(vertex, Obstacle):
+            if not vertex.refinements:
+                return [1 << self.bit[vertex.node_id]]
+            return self._union(vertex, [families.get(r.node_id, _NEVER) for r in vertex.refinements])
+        if isinstance(vertex, Refinement) and parent_of_obstacles:
+            result = _ALWAYS
+            for child in vertex.children:
+                if isinstance(child, Obstacle):
+                    result = self._product(vertex, result, families.get(child.node_id, _NEVER))
+            return result
+        if isinstance(vertex, Refinement):
+            return self._union(vertex, [families.get(c.node_id, _NEVER) for c in vertex.children])
+        if isinstance(vertex, Goal):
+            refinements = refinements_of(vertex)
+            result = _NEVER
+            if refinements:
+                result = _ALWAYS
+                for refinement in refinements:
+                    result = self._product(vertex, result, families.get(refinement.node_id, _NEVER))
+            direct = [families.get(o.node_id, _NEVER) for o in self._obstructions(vertex)]
+            return self._union(vertex, [result] + direct)
+        return _NEVER
+
+    def _union(self, vertex: Vertex, families: list[list[int]]):
+        merged = []
+        for family in families:
+            merged.extend(family)
+        return self._minimize(vertex, merged)
+
+    def _product(self, vertex: Vertex, left: list[int], right: list[int]):
+        if not left or not right:
+            return _NEVER
+        if left == _ALWAYS:
+            return right
+        if right == _ALWAYS:
+            return left
+        return self._minimize(vertex, [a | b for a in left for b in right])
+
+    def _minimize(self, vertex: Vertex, family: list[int]):
+        truncated = False
+        candidates = set(family)
+        if self.max_order is not None:
+            kept = {s for s in candidates if s.bit_count() <= self.max_order}
+            truncated = len(kept) < len(candidates)
+            candidates = kept
+        # Subsets sort before their supersets, so each set only needs checking against the
+        # sets kept so far.
+        minimal = []
+        for cut in sorted(candidates, key=lambda s: (s.bit_count(), s)):
+            if not any(m & cut == m for m in minimal):
+                minimal.append(cut)
+        minimal.sort(key=self._rank)
+        if self.top_k is not None and len(minimal) > self.top_k:
+            minimal = minimal[:self.top_k]
+            truncated = True
+        if truncated:
+            self.truncated.add(vertex.node_id)
+        return minimal
+
+    def _rank(self, cut: int):
+        # The most likely sets first when probabilities are known, otherwise the smallest.
+        order = cut.bit_count()
+        if self.cost is None:
+            return order, cut
+        cost = 0.0
+        while cut:
+            low = cut & -cut
+            cost += self.cost[low.bit_length() - 1]
+            cut ^= low
+        return cost, order
+
+    def _was_truncated(self, vertex: Vertex):
+        stack = [vertex]
+        seen = set()
+        while stack:
+            current = stack.pop()
+            if current.node_id in seen:
+                continue
+            seen.add(current.node_id)
+            if current.node_id in self.truncated:
+                return True
+            stack.extend(self._below(current))
+        return False
+
+    def cut_sets(self, vertex: Vertex):
+        """
+        Get the minimal cut sets of a goal or obstacle.
+        :param Vertex vertex: The goal or obstacle.
+        :return CutSets: The cut sets as lists of leaf obstacles.
+        """
+        family = self.family(vertex)
+        sets = []
+        for cut in family:
+            members = []
+            while cut:
+                low = cut & -cut
+                members.append(self.leaves[low.bit_length() - 1])
+                cut ^= low
+            sets.append(members)
+        return CutSets(vertex, sets, self._was_truncated(vertex))
+
+
+def minimal_cut_sets(roots: list[Vertex],
+                     links: list = None,
+                     max_order: int = None,
+                     top_k: int = None,
+                     probabilities: dict = None):
+    """
+    Compute the minimal cut sets of every root goal.
+    :param list[Vertex] roots: The root goals.
+    :param list links: The conflict, obstruction, and resolution links.
+    :param int max_order: The most leaf obstacles in one cut set.
+    :param int top_k: The most cut sets kept per vertex.
+    :param dict probabilities: Leaf obstacles mapped to their probability of occurring.
+    :return dict: The roots mapped to their CutSets.
+    """
+    analysis = CutSetAnalysis(roots, links, max_order, top_k, probabilities)
+    return {root: analysis.cut_sets(root) for root in roots}
@@ -0,0 +1,272 @@
+"""
+Evaluating which goals are satisfied given the leaf goals that hold and the obstacles that occur.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+import heapq
+from collections import deque
+from enum import IntEnum
+
+from .schema import (
+    Vertex,
+    Obstacle,
+    Refinement,
+    DomainProperty,
+    ObstructionLink,
+    ResolutionLink,
+)
+from .index import ModelIndex, refinements_of
+
+
+class Label(IntEnum):
+    """
+    Qualitative satisfaction labels, ordered from worst to best. For an obstacle, satisfied
+    means the obstacle occurs.
+    """
+    DENIED = 0
+    WEAKLY_DENIED = 1
+    UNKNOWN = 2
+    WEAKLY_SATISFIED = 3
+    SATISFIED = 4
+
+
+_NEGATION = {
+    Label.DENIED: Label.SATISFIED,
+    Label.WEAKLY_DENIED: Label.WEAKLY_SATISFIED,
+    Label.UNKNOWN: Label.UNKNOWN,
+    Label.WEAKLY_SATISFIED: Label.WEAKLY_DENIED,
+    Label.SATISFIED: Label.DENIED,
+}
+
+_WEAKENED = {
+    Label.DENIED: Label.WEAKLY_DENIED,
+    Label.WEAKLY_DENIED: Label.WEAKLY_DENIED,
+    Label.UNKNOWN: Label.UNKNOWN,
+    Label.WEAKLY_SATISFIED: Label.WEAKLY_SATISFIED,
+    Label.SATISFIED: Label.WEAKLY_SATISFIED,
+}
+
+
+def _as_label(value):
+    """
+    Used internally to accept True and False in place of SATISFIED and DENIED.
+    """
+    if value is True:
+        return Label.SATISFIED
+    if value is False:
+        return Label.DENIED
+    return Label(value)
+
+
+def _default(vertex: Vertex):
+    """
+    Used internally to get the label of an unrefined vertex nobody assigned: goals are
+    unknown, obstacles do not occur, and domain properties hold.
+    """
+    if isinstance(vertex, Obstacle):
+        return Label.DENIED
+    if isinstance(vertex, DomainProperty):
+        return Label.SATISFIED
+    return Label.UNKNOWN
+
+
+def dependencies(index: ModelIndex, vertex: Vertex):
+    """
+    Get the vertices whose labels the label of a vertex is computed from: the children of a
+    refinement, or the refinements of a goal or obstacle together with the obstacles
+    obstructing a goal and the goals resolving an obstacle.
+    :param ModelIndex index: The index of the model.
+    :param Vertex vertex: The vertex.
+    :return list[Vertex]: The dependencies.
+    """
+    if isinstance(vertex, Refinement):
+        return list(vertex.children)
+    result = list(refinements_of(vertex))
+    for link in index.links_of(vertex):
+        if type(link) == ObstructionLink and link.goal is vertex:
+            result.append(link.obstacle)
+        elif type(link) == ResolutionLink and link.obstacle is vertex:
+            result.append(link.goal)
+    return result
+
+
+def dependents(index: ModelIndex, vertex: Vertex):
+    """
+    Get the vertices whose labels are computed from the label of a vertex.
+    :param ModelIndex index: The index of the model.
+    :param Vertex vertex: The vertex.
+    :return list[Vertex]: The dependents.
+    """
+    if isinstance(vertex, Refinement):
+        return list(index.owners.get(vertex.node_id, []))
+    result = list(index.parent_refinements(vertex))
+    for link in index.links_of(vertex):
+        if type(link) == ObstructionLink and link.obstacle is vertex:
+            result.append(link.goal)
+        elif type(link) == ResolutionLink and link.goal is vertex:
+            result.append(link.obstacle)
+    return result
+
+
+def topological_order(index: ModelIndex):
+    """
+    Order the vertices of a model so every vertex comes after its dependencies.
+    :param ModelIndex index: The index of the model.
+    :return tuple: The ordered vertices, and the vertices on or behind a cycle, which cannot be ordered.
+    """
+    vertices = index.vertices
+    pending = {node_id: len(dependencies(index, vertex)) for node_id, vertex in vertices.items()}
+    queue = deque(vertices[node_id] for node_id, count in pending.items() if count == 0)
+    order = []
+    while queue:
+        vertex = queue.popleft()
+        order.append(vertex)
+        for dependent in dependents(index, vertex):
+            pending[dependent.node_id] -= 1
+            if pending[dependent.node_id] == 0:
+                queue.append(dependent)
+    if len(order) == len(vertices):
+        return order, []
+    ordered = {vertex.node_id for vertex in order}
+    return order, [vertex for node_id, vertex in vertices.items() if node_id not in ordered]
+
+
+class Evaluation:
+    """
+    The labels of every goal, obstacle, refinement, and domain property of a model.
+
+    A refinement takes the worst label of its children; it is weakened when the refinement is
+    not complete, since its children alone do not establish the parent. A goal or obstacle
+    takes the best label of its refinements. An obstacle that occurs denies the goals it
+    obstructs, and a goal that is satisfied prevents the obstacles it resolves. Conflict links
+    do not take part. Vertices on a refinement cycle stay unknown.
+
+    Labels are computed once over a topological order. Assigning a label afterwards
+    re-evaluates only the vertices that depend on the assigned one, in topological order, and
+    stops along every path where a label does not change.
+    """
+    def __init__(self,
+                 roots: list[Vertex],
+                 links: list = None,
+                 assignment: dict = None,
+                 index: ModelIndex = None):
+        """
+        Evaluate a model.
+        :param list[Vertex] roots: The root goals.
+        :param list links: The conflict, obstruction, and resolution links.
+        :param dict assignment: Vertices mapped to a Label, or to True or False, overriding what
+            their refinements give. Typically the leaf goals that hold and the obstacles that occur.
+        :param ModelIndex index: An index of the model, if one was already built.
+        """
+        self.index = index if index is not None else ModelIndex(roots, links)
+        # node id -> assigned label.
+        self.assignment = {}
+        for vertex, value in (assignment or {}).items():
+            self.assignment[vertex.node_id] = _as_label(value)
+        # node id -> label.
+        self.labels = {}
+        # node id -> position in the topological order.
+        self.order = {}
+        # node ids of vertices on a cycle, left unknown.
+        self.cyclic = set()
+        self._evaluate_all()
+
+    def _evaluate_all(self):
+        order, cyclic = topological_order(self.index)
+        for vertex in order:
+            self.order[vertex.node_id] = len(self.order)
+            self.labels[vertex.node_id] = self._compute(vertex)
+        for vertex in cyclic:
+            self.cyclic.add(vertex.node_id)
+            self.labels[vertex.node_id] = Label.UNKNOWN
+
+    def _compute(self, vertex: Vertex):
+        labels = self.labels
+        if isinstance(vertex, Refinement):
+            if not vertex.children:
+                return Label.UNKNOWN
+            label = min(labels.get(child.node_id, Label.UNKNOWN) for child in vertex.children)
+            return label if vertex.complete else _WEAKENED[label]
+
+        label = self.assignment.get(vertex.node_id)
+        if label is None:
+            refinements = refinements_of(vertex)
+            if refinements:
+                label = max(labels.get(r.node_id, Label.UNKNOWN) for r in refinements)
+            else:
+                label = _default(vertex)
+
+        for link in self.index.links_of(vertex):
+            if type(link) == ObstructionLink and link.goal is vertex:
+                label = min(label, _NEGATION[labels.get(link.obstacle.node_id, Label.UNKNOWN)])
+            elif type(link) == ResolutionLink and link.obstacle is vertex:
+                label = min(label, _NEGATION[labels.get(link.goal.node_id, Label.UNKNOWN)])
+        return Label(label)
+
+    def label(self, vertex: Vertex):
+        """
+        Get the label of a vertex.
+        :return Label: The label, or UNKNOWN for vertices outside the model.
+        """
+        return self.labels.get(vertex.node_id, Label.UNKNOWN)
+
+    def satisfied(self, vertex: Vertex):
+        """
+        Whether a goal is satisfied, or an obstacle occurs, without qualification.
+        """
+        return self.label(vertex) == Label.SATISFIED
+
+    def root_labels(self):
+        """
+        Get the labels of the top-level goals and obstacles.
+        :return dict: The vertices mapped to their labels.
+        """
+        return {vertex: self.label(vertex) for vertex in self.index.top_level()}
+
+    def assign(self, vertex: Vertex, value):
+        """
+        Assign a label to a vertex and re-evaluate what depends on it.
+        :param Vertex vertex: The vertex, typically a leaf goal or an obstacle.
+        :param value: A Label, or True or False, or None to remove the assignment.
+        :return list[Vertex]: The vertices whose labels changed.
+        """
+        if value is None:
+            self.assignment.pop(vertex.node_id, None)
+        else:
+            self.assignment[vertex.node_id] = _as_label(value)
+        return self._propagate(vertex)
+
+    def _propagate(self, start: Vertex):
+        if start.node_id in self.cyclic or start.node_id not in self.order:
+            return []
+        changed = []
+        order = self.order
+        heap = [(order[start.node_id], start.node_id)]
+        queued = {start.node_id}
+        vertices = self.index.vertices
+        while heap:
+            _, node_id = heapq.heappop(heap)
+            queued.discard(node_id)
+            vertex = vertices[node_id]
+            label = self._compute(vertex)
+            if label == self.labels[node_id]:
+                continue
+            self.labels[node_id] = label
+            changed.append(vertex)
+            for dependent in dependents(self.index, vertex):
+                if dependent.node_id not in queued and dependent.node_id in order:
+                    queued.add(dependent.node_id)
+                    heapq.heappush(heap, (order[dependent.node_id], dependent.node_id))
+        return changed
+
+
+def evaluate(roots: list[Vertex], links: list = None, assignment: dict = None):
+    """
+    Evaluate a model.
+    :param list[Vertex] roots: The root goals.
+    :param list links: The conflict, obstruction, and resolution links.
+    :param dict assignment: Vertices mapped to a Label, or to True or False.
+    :return Evaluation: The labels of every vertex.
+    """
+    return Evaluation(roots, links, assignment)
@@ -9,7 +9,7 @@ import argparse
 from .schema import *
 
 
-def obstacles():
+def obstacles_model():
     # three em dash: #11835;
 
     not_g1 = Obstacle("<b>not</b> G1")
@@ -30,14 +30,18 @@ def obstacles():
     g1_not_g1 = ObstructionLink(g1, not_g1)
     g2_not_g2 = ObstructionLink(g2, not_g2)
 
-    output = generate_graph([g, not_g], [g1_not_g1, g2_not_g2])
+    return [g, not_g], [g1_not_g1, g2_not_g2]
+
+
+def obstacles():
+    output = generate_graph(*obstacles_model())
 
     print(output)
     print(generate_pako_link(output))
     print()
 
 
-def conflicts():
+def conflicts_model():
     signal_promptly_set_go = SoftGoal("SignalPromptlySetGo", None, None)
     fast_run_to_next_block_if_gosignal = SoftGoal("FastRunToNextBlock <b>If</b> GoSignal", None, None)
 
@@ -91,14 +95,11 @@ def conflicts():
     conflict_signalsafelykepttostop_and_signalpromptlysetgo = ConflictLink(signalsafelykepttostop,
                                                                            signal_promptly_set_go)
 
-    output = diagram_startup()
-    output += effective_passengers_transportation.to_tree()
-    output += conflict_signalsafelykepttostop_and_signalpromptlysetgo.to_string()
-    output += diagram_teardown()
+    return [effective_passengers_transportation], [conflict_signalsafelykepttostop_and_signalpromptlysetgo]
+
 
-    output = generate_graph(
-        [effective_passengers_transportation],
-        [conflict_signalsafelykepttostop_and_signalpromptlysetgo])
+def conflicts():
+    output = generate_graph(*conflicts_model())
 
     link = generate_pako_link(output)
     print(output)
@@ -106,7 +107,7 @@ def conflicts():
     print(link)
 
 
-def actors():
+def actors_model():
     speed_sensor_agent = Agent(
         "SpeedSensor",
         AgentType.ENVIRONMENT_AGENT,
@@ -160,14 +161,18 @@ def actors():
             [moving_iff_nonzero_speed, maintain_doors_closed_while_nonzero_speed])]
     )
 
-    output = generate_graph([maintain_doors_closed_while_moving], [])
+    return [maintain_doors_closed_while_moving], []
+
+
+def actors():
+    output = generate_graph(*actors_model())
     link = generate_pako_link(output)
     print(output)
     print()
     print(link)
 
 
-def achievement():
+def achievement_model():
     achieve_copyborrowed_if_available = AchieveGoal("CopyBorrowed <b>If</b> Available", None, None)
     achieve_copyduesoonforcheckout_if_not_available = AchieveGoal(
         "CopyDueSoonForCheckOut <b>If Not</b> Available",
@@ -183,7 +188,11 @@ def achievement():
                 achieve_copyduesoonforcheckout_if_not_available]
         )])
 
-    output = generate_graph([achieve_book_request_satisfied], [])
+    return [achieve_book_request_satisfied], []
+
+
+def achievement():
+    output = generate_graph(*achievement_model())
     link = generate_pako_link(output)
 
     print(output)
@@ -191,7 +200,7 @@ def achievement():
     print(link)
 
 
-def weather_dot_com(host="https://mermaid.live"):
+def weather_dot_com_model():
     agent_user0 = Agent("User", AgentType.ENVIRONMENT_AGENT, annotation="An environment agent")
     type_windows_r = Operation("Type Windows Key + R", OperationCategory.ENVIRONMENT_OPERATION)
     achieve_keyboard_input_windows_r = AchieveGoal(
@@ -397,7 +406,11 @@ def weather_dot_com(host="https://mermaid.live"):
         ]
     )
 
-    output = generate_graph([achieve_got_todays_weather_in_celsius_for_zip_22206], [])
+    return [achieve_got_todays_weather_in_celsius_for_zip_22206], []
+
+
+def weather_dot_com(host="https://mermaid.live"):
+    output = generate_graph(*weather_dot_com_model())
     link = generate_pako_link(output, mode="edit", host=host)
 
     print(output)
@@ -406,7 +419,7 @@ def weather_dot_com(host="https://mermaid.live"):
     # done
 
 
-def pay_electric_bill(host="https://mermaid.live"):
+def pay_electric_bill_model():
 
     download_dominion_energy_application = Operation(
         name="Download Dominion Energy Application",
@@ -835,7 +848,11 @@ def pay_electric_bill(host="https://mermaid.live"):
             )]
     )
 
-    output = generate_graph([achieve_paid_my_electric_bill], [])
+    return [achieve_paid_my_electric_bill], []
+
+
+def pay_electric_bill(host="https://mermaid.live"):
+    output = generate_graph(*pay_electric_bill_model())
     link = generate_pako_link(output, mode="edit", host=host)
 
     print(output)
@@ -843,6 +860,17 @@ def pay_electric_bill(host="https://mermaid.live"):
     print(link)
 
 
+# Builders of the example models by name, each returning the root goals and the links.
+MODELS = {
+    "figure8.2": achievement_model,
+    "figure8.4": actors_model,
+    "figure8.7": conflicts_model,
+    "figure9.5": obstacles_model,
+    "weather_dot_com": weather_dot_com_model,
+    "pay_electric_bill": pay_electric_bill_model,
+}
+
+
 def main():
     parser = argparse.ArgumentParser(
         prog='examples',
@@ -0,0 +1,109 @@
+"""
+The diagram text of single goals and obstacles as reusable pieces, for caches that render many
+diagrams or many versions of a model.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+
+Goal.to_tree and Obstacle.to_tree draw a vertex, then recurse into each child in the middle of
+its text. Here the text of one vertex is split into pieces: strings, and the items whose own
+text goes between them. The pieces of a vertex depend only on the vertex, its refinements, and
+the names of its children, so they can be kept while the vertex is unchanged and put together
+with expand into the same text to_tree would draw.
+
+Items are whatever a cache keeps its vertices as, such as schema vertices or persistent nodes;
+vertex_of maps an item to the schema vertex it stands for, and children_of maps a refinement
+item to its child items.
+"""
+from .schema import Vertex, Goal, Obstacle, VertexType, annotation_diagram
+
+
+def format_pieces(vertex: Vertex, refinements, performs, vertex_of, children_of, scope: set = None):
+    """
+    Split the text drawn for one goal or obstacle into pieces.
+    :param Vertex vertex: The goal or obstacle.
+    :param refinements: Its refinement items.
+    :param performs: Its performance links, for a goal.
+    :param vertex_of: A function from an item to its schema vertex.
+    :param children_of: A function from a refinement item to its child items.
+    :param set scope: If given, only refinements and children whose node ids are in scope are drawn.
+    :return tuple: Strings, and the items to expand between them.
+    """
+    node_id = vertex.get_node_id()
+    pieces = []
+    text = []
+
+    def flush():
+        if text:
+            pieces.append("".join(text))
+            text.clear()
+
+    def push(item):
+        flush()
+        pieces.append(item)
+
+    if vertex.annotation:
+        text.append(annotation_diagram(vertex))
+    goal = isinstance(vertex, Goal)
+    node_diagram = vertex.to_string()
+    for item in refinements:
+        refinement = vertex_of(item)
+        if scope is not None and refinement.node_id not in scope:
+            continue
+        current = refinement.get_node_id()
+        filled = ":::filled" if refinement.complete else ""
+        children = children_of(item)
+        if goal:
+            # Goal.to_tree draws the annotation of a refinement, Obstacle.to_tree does not.
+            push(item)
+            obstacle = children and vertex_of(children[0]).vertex_type == VertexType.NODE_TYPE_OBSTACLE
+            text.append(f'{current}((" ")){filled} ==={"x" if obstacle else ">"} {node_id}\n')
+        else:
+            text.append(f'{current}((" ")){filled} ===> {node_diagram}\n')
+        for child_item in children:
+            child = vertex_of(child_item)
+            if scope is not None and child.node_id not in scope:
+                continue
+            bold = ":::bold" if child.leaf else ""
+            text.append(f'{child.to_string()}{bold} --- {current}\n')
+            push(child_item)
+        text.append("\n")
+    if goal:
+        for perform in performs:
+            text.append(f'{perform.agent.to_string()} --- {node_id}\n')
+            if perform.operation:
+                text.append(f'{perform.operation.to_string()} --- {perform.agent.get_node_id()}\n')
+                push(perform.agent)
+        text.append(node_diagram + "\n")
+    flush()
+    return tuple(pieces)
+
+
+def expand(start, visited: set, output: list, pieces_of, vertex_of=None):
+    """
+    Append the text of a start item and everything below it, as to_tree would draw it.
+    :param start: The item of a goal or obstacle.
+    :param set visited: Node ids already drawn, updated.
+    :param list output: The strings of the diagram, appended to.
+    :param pieces_of: A function from the item of a goal or obstacle to its pieces.
+    :param vertex_of: A function from an item to its schema vertex, or None when items are
+        schema vertices.
+    """
+    append = output.append
+    stack = [iter((start,))]
+    while stack:
+        for piece in stack[-1]:
+            if type(piece) is str:
+                append(piece)
+                continue
+            vertex = piece if vertex_of is None else vertex_of(piece)
+            if isinstance(vertex, (Goal, Obstacle)):
+                if vertex.node_id in visited:
+                    continue
+                visited.add(vertex.node_id)
+                stack.append(iter(pieces_of(piece)))
+                break
+            # A refinement, domain property, or agent only adds its annotation, once.
+            append(Vertex.to_tree(vertex, visited))
+        else:
+            stack.pop()
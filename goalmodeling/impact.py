@@ -0,0 +1,267 @@
+"""
+Which goals each obstacle and conflict can affect or deny, ranked, as a table or a highlighted diagram.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+from collections import deque
+
+from .schema import (
+    Vertex,
+    Goal,
+    Obstacle,
+    Refinement,
+    ConflictLink,
+    ObstructionLink,
+    ResolutionLink,
+    generate_graph,
+)
+from .index import ModelIndex, refinements_of
+
+
+def impact_order(index: ModelIndex):
+    """
+    Order the vertices of a model so every vertex comes after the refinements, children, and
+    obstructing obstacles it depends on. Resolution links do not take part: they do not
+    change which goals an obstacle reaches.
+    :param ModelIndex index: The index of the model.
+    :return tuple: The ordered vertices, and the vertices on or behind a cycle, in model order.
+    """
+    vertices = index.vertices
+    pending = {}
+    dependents = {}
+    for node_id, vertex in vertices.items():
+        if isinstance(vertex, Refinement):
+            below = list(vertex.children)
+        else:
+            below = list(refinements_of(vertex))
+            below += [link.obstacle for link in index.links_of(vertex)
+                      if type(link) == ObstructionLink and link.goal is vertex]
+        pending[node_id] = len(below)
+        for dependency in below:
+            dependents.setdefault(dependency.node_id, []).append(vertex)
+    queue = deque(vertex for node_id, vertex in vertices.items() if pending[node_id] == 0)
+    order = []
+    while queue:
+        vertex = queue.popleft()
+        order.append(vertex)
+        for dependent in dependents.get(vertex.node_id, ()):
+            pending[dependent.node_id] -= 1
+            if pending[dependent.node_id] == 0:
+                queue.append(dependent)
+    ordered = {vertex.node_id for vertex in order}
+    return order, [vertex for node_id, vertex in vertices.items() if node_id not in ordered]
+
+
+class Impact:
+    """
+    The goals one obstacle or conflict reaches.
+    """
+    def __init__(self, source, affected: list[Goal], denied: list[Goal], roots: list[Goal], resolved: bool):
+        """
+        :param source: The obstacle or the conflict link.
+        :param list[Goal] affected: The goals that depend on an obstructed or conflicting goal.
+        :param list[Goal] denied: The goals that fail when the obstacle occurs, or whichever
+            goal of the conflict gives way.
+        :param list[Goal] roots: The top-level goals among the denied ones.
+        :param bool resolved: Whether a resolution link addresses the obstacle; always True for conflicts.
+        """
+        self.source = source
+        self.affected = affected
+        self.denied = denied
+        self.roots = roots
+        self.resolved = resolved
+
+    def name(self):
+        """
+        Get a readable name for the source.
+        :return str: The obstacle name, or both goal names of a conflict.
+        """
+        if type(self.source) == ConflictLink:
+            return f"{self.source.goal1.name} / {self.source.goal2.name}"
+        return self.source.name
+
+
+class ImpactReport:
+    """
+    The impact of every obstacle and conflict of a model, computed in one bottom-up pass.
+
+    Every obstacle gets a bit, and every conflict one bit per goal. Going up the model, a goal
+    carries the bits of the obstacles obstructing it and of the refinements below it: any
+    refinement for affected goals, and all refinements for denied ones. An obstacle occurs
+    with one of its refinements, so it carries the bits its refinements carry in every obstacle
+    child. A conflict denies the goals denied whichever of its goals gives way.
+
+    Resolution links only mark obstacles as resolved. Vertices on an obstruction or refinement
+    cycle are revisited until their bits stop changing, which ends because bits are only added.
+    """
+    def __init__(self, roots: list[Vertex], links: list = None, index: ModelIndex = None):
+        """
+        Analyse a model.
+        :param list[Vertex] roots: The root goals.
+        :param list links: The conflict, obstruction, and resolution links.
+        :param ModelIndex index: An index of the model, if one was already built.
+        """
+        self.index = index if index is not None else ModelIndex(roots, links)
+        vertices = self.index.vertices
+
+        obstacles = [v for v in vertices.values() if isinstance(v, Obstacle)]
+        conflicts = [link for link in self.index.links if type(link) == ConflictLink]
+        bit = {o.node_id: 1 << i for i, o in enumerate(obstacles)}
+        conflict_bits = [(1 << (len(obstacles) + 2 * i), 1 << (len(obstacles) + 2 * i + 1))
+                         for i in range(len(conflicts))]
+        resolved = {link.obstacle.node_id for link in self.index.links if type(link) == ResolutionLink}
+
+        # node id -> bits of the sources a goal, obstacle, or refinement depends on (affected),
+        # and of those it fails with on their own (denied).
+        direct = {}
+        for (first, second), link in zip(conflict_bits, conflicts):
+            direct[link.goal1.node_id] = direct.get(link.goal1.node_id, 0) | first
+            direct[link.goal2.node_id] = direct.get(link.goal2.node_id, 0) | second
+        affected = {}
+        denied = {}
+
+        def visit(vertex):
+            node_id = vertex.node_id
+            if isinstance(vertex, Refinement):
+                owner = self.index.owner.get(node_id)
+                if isinstance(owner, Obstacle):
+                    # Occurs when all obstacle children occur.
+                    children = [c for c in vertex.children if isinstance(c, Obstacle)]
+                    occurs = -1 if children else 0
+                    for child in children:
+                        occurs &= denied.get(child.node_id, 0)
+                    return self._store(affected, denied, node_id, occurs, occurs)
+                else:
+                    any_bits = 0
+                    for child in vertex.children:
+                        any_bits |= affected.get(child.node_id, 0)
+                    fail_bits = 0
+                    for child in vertex.children:
+                        fail_bits |= denied.get(child.node_id, 0)
+                    return self._store(affected, denied, node_id, any_bits, fail_bits)
+
+            if isinstance(vertex, Obstacle):
+                occurs = bit[node_id]
+                for refinement in vertex.refinements:
+                    occurs |= denied.get(refinement.node_id, 0)
+                return self._store(affected, denied, node_id, occurs, occurs)
+
+            any_bits = direct.get(node_id, 0)
+            fail_bits = any_bits
+            for link in self.index.links_of(vertex):
+                if type(link) == ObstructionLink and link.goal is vertex:
+                    any_bits |= denied.get(link.obstacle.node_id, 0)
+                    fail_bits |= denied.get(link.obstacle.node_id, 0)
+            refinements = refinements_of(vertex)
+            if refinements:
+                every = -1
+                for refinement in refinements:
+                    any_bits |= affected.get(refinement.node_id, 0)
+                    every &= denied.get(refinement.node_id, 0)
+                fail_bits |= every
+            return self._store(affected, denied, node_id, any_bits, fail_bits)
+
+        order, cyclic = impact_order(self.index)
+        for vertex in order:
+            visit(vertex)
+        changed = True
+        while changed:
+            changed = False
+            for vertex in cyclic:
+                changed |= visit(vertex)
+        order += cyclic
+
+        # Invert: for every bit, the goals carrying it.
+        width = len(obstacles) + 2 * len(conflicts)
+        affected_by = [[] for _ in range(width)]
+        denied_by = [[] for _ in range(width)]
+        for vertex in order:
+            if not isinstance(vertex, Goal):
+                continue
+            for bits, target in ((affected[vertex.node_id], affected_by), (denied[vertex.node_id], denied_by)):
+                while bits:
+                    low = bits & -bits
+                    target[low.bit_length() - 1].append(vertex)
+                    bits ^= low
+
+        top = {v.node_id for v in self.index.top_level()}
+        self.impacts = []
+        for i, obstacle in enumerate(obstacles):
+            goals = denied_by[i]
+            self.impacts.append(Impact(obstacle, affected_by[i], goals,
+                                       [g for g in goals if g.node_id in top],
+                                       obstacle.node_id in resolved))
+        for i, link in enumerate(conflicts):
+            first, second = len(obstacles) + 2 * i, len(obstacles) + 2 * i + 1
+            either = {g.node_id: g for g in affected_by[first] + affected_by[second]}
+            second_denied = {g.node_id for g in denied_by[second]}
+            both = [g for g in denied_by[first] if g.node_id in second_denied]
+            self.impacts.append(Impact(link, list(either.values()), both,
+                                       [g for g in both if g.node_id in top], True))
+        self.impacts.sort(key=lambda impact: (-len(impact.roots), -len(impact.denied), -len(impact.affected)))
+
+    @staticmethod
+    def _store(affected: dict, denied: dict, node_id: int, any_bits: int, fail_bits: int):
+        """
+        Used internally to record the bits of a vertex.
+        :return bool: Whether they changed.
+        """
+        if affected.get(node_id) == any_bits and denied.get(node_id) == fail_bits:
+            return False
+        affected[node_id] = any_bits
+        denied[node_id] = fail_bits
+        return True
+
+    def unresolved(self):
+        """
+        Get the obstacles that deny at least one goal and have no resolution link.
+        :return list[Impact]: Their impacts, highest first.
+        """
+        return [impact for impact in self.impacts if not impact.resolved and impact.denied]
+
+    def table(self, limit: int = None):
+        """
+        Format the ranking as a Markdown table.
+        :param int limit: The most rows to include.
+        :return str: The table.
+        """
+        rows = ["| Rank | Source | Roots denied | Goals denied | Goals affected | Resolved |",
+                "|------|--------|--------------|--------------|----------------|----------|"]
+        for rank, impact in enumerate(self.impacts[:limit], 1):
+            rows.append(f"| {rank} | {impact.name()} | {len(impact.roots)} | {len(impact.denied)} "
+                        f"| {len(impact.affected)} | {'yes' if impact.resolved else '**no**'} |")
+        return "\n".join(rows) + "\n"
+
+    def generate_graph(self, roots: list[Goal], links: list = None, impact: Impact = None):
+        """
+        Generate the Mermaid diagram of the model with the goals reached by one source highlighted.
+        :param list[Goal] roots: The root goals.
+        :param list links: The conflict, obstruction, and resolution links.
+        :param Impact impact: The impact to highlight, by default the highest ranked.
+        :return str: The Mermaid diagram definition.
+        """
+        if impact is None and self.impacts:
+            impact = self.impacts[0]
+        output = generate_graph(roots, links)
+        if impact is None:
+            return output
+        denied = {g.node_id for g in impact.denied}
+        affected = [g.get_node_id() for g in impact.affected if g.node_id not in denied]
+        output += "classDef denied fill:#f88,stroke:#900\n"
+        output += "classDef affected fill:#fd8,stroke:#960\n"
+        if denied:
+            output += f"class {','.join(g.get_node_id() for g in impact.denied)} denied\n"
+        if affected:
+            output += f"class {','.join(affected)} affected\n"
+        return output
+
+
+def impact_report(roots: list[Vertex], links: list = None):
+    """
+    Analyse the impact of every obstacle and conflict of a model.
+    :param list[Vertex] roots: The root goals.
+    :param list links: The conflict, obstruction, and resolution links.
+    :return ImpactReport: The report.
+    """
+    return ImpactReport(roots, links)
@@ -0,0 +1,187 @@
+"""
+Reverse indexes over a refinement graph: parents, refinement owners, and links by vertex.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+from .schema import (
+    Vertex,
+    Goal,
+    Obstacle,
+    Refinement,
+    ConflictLink,
+)
+
+
+def refinements_of(vertex: Vertex):
+    """
+    Get the refinements of a goal or an obstacle.
+    :param Vertex vertex: The vertex.
+    :return list[Refinement]: The refinements, or an empty list for other vertices.
+    """
+    if isinstance(vertex, Goal):
+        return vertex.disjunctions
+    if isinstance(vertex, Obstacle):
+        return vertex.refinements
+    return []
+
+
+def link_endpoints(link):
+    """
+    Get the two vertices a conflict, obstruction, or resolution link connects.
+    :return tuple: The goals of a conflict link, or the goal and the obstacle of the others.
+    """
+    if type(link) == ConflictLink:
+        return link.goal1, link.goal2
+    return link.goal, link.obstacle
+
+
+class ModelIndex:
+    """
+    Indexes a refinement graph once so parents and links of any vertex are found without a walk.
+
+    Vertices are keyed by node id. The refinement structure is indexed at two levels: a
+    refinement is owned by the goal or obstacle it refines, and a goal, obstacle, or domain
+    property is contained in the refinements that list it as a child.
+    """
+    def __init__(self, roots: list[Vertex], links: list = None):
+        """
+        Index everything reachable from the roots and the links.
+        :param list[Vertex] roots: The root vertices.
+        :param list links: The conflict, obstruction, and resolution links.
+        """
+        self.roots = list(roots)
+        self.links = []
+        # node id -> vertex, in depth-first discovery order.
+        self.vertices = {}
+        # The vertices in the order they were indexed, only ever appended to, so incremental
+        # consumers read what is new from the position they reached.
+        self.added = []
+        # refinement node id -> the goal or obstacle it refines, and the goals and obstacles
+        # listing it, once per listing, for refinements shared between several.
+        self.owner = {}
+        self.owners = {}
+        # node id -> the refinements listing the vertex as a child.
+        self.containing = {}
+        # node id -> the links touching the vertex.
+        self.links_by_vertex = {}
+        # id of a link -> its position in links.
+        self.link_position = {}
+
+        for root in self.roots:
+            self._walk(root)
+        for link in links or []:
+            self.add_link(link)
+
+    def _walk(self, start: Vertex):
+        if start.node_id in self.vertices:
+            return
+        stack = [start]
+        while stack:
+            vertex = stack.pop()
+            if vertex.node_id in self.vertices:
+                continue
+            self.vertices[vertex.node_id] = vertex
+            self.added.append(vertex)
+            if isinstance(vertex, Refinement):
+                for child in vertex.children:
+                    self.containing.setdefault(child.node_id, []).append(vertex)
+                stack.extend(reversed(vertex.children))
+            else:
+                refinements = refinements_of(vertex)
+                for refinement in refinements:
+                    self._own(refinement, vertex)
+                stack.extend(reversed(refinements))
+
+    def _own(self, refinement: Refinement, parent: Vertex):
+        self.owner[refinement.node_id] = parent
+        self.owners.setdefault(refinement.node_id, []).append(parent)
+
+    def __contains__(self, vertex: Vertex):
+        return vertex.node_id in self.vertices
+
+    def __len__(self):
+        return len(self.vertices)
+
+    def add_link(self, link):
+        """
+        Index a conflict, obstruction, or resolution link, and any vertices it brings in.
+        """
+        self.link_position[id(link)] = len(self.links)
+        self.links.append(link)
+        for endpoint in link_endpoints(link):
+            self._walk(endpoint)
+            self.links_by_vertex.setdefault(endpoint.node_id, []).append(link)
+
+    def add_refinement(self, parent: Vertex, refinement: Refinement):
+        """
+        Append a refinement to a goal or obstacle and index it.
+        :param Vertex parent: The refined goal or obstacle.
+        :param Refinement refinement: The new refinement.
+        """
+        refinements_of(parent).append(refinement)
+        self._own(refinement, parent)
+        if refinement.node_id not in self.vertices:
+            self.vertices[refinement.node_id] = refinement
+            self.added.append(refinement)
+            for child in refinement.children:
+                self.containing.setdefault(child.node_id, []).append(refinement)
+                self._walk(child)
+
+    def add_child(self, refinement: Refinement, child: Vertex):
+        """
+        Append a child to a refinement and index it.
+        :param Refinement refinement: The refinement.
+        :param Vertex child: The new child.
+        """
+        refinement.children.append(child)
+        self.containing.setdefault(child.node_id, []).append(refinement)
+        self._walk(child)
+
+    def parent_refinements(self, vertex: Vertex):
+        """
+        Get the refinements listing the vertex as a child.
+        :return list[Refinement]: The refinements.
+        """
+        return self.containing.get(vertex.node_id, [])
+
+    def parents(self, vertex: Vertex):
+        """
+        Get the goals and obstacles that the vertex contributes to directly.
+        :return list[Vertex]: The parents, without duplicates.
+        """
+        if isinstance(vertex, Refinement):
+            return list({owner.node_id: owner for owner in self.owners.get(vertex.node_id, [])}.values())
+        parents = {}
+        for refinement in self.containing.get(vertex.node_id, []):
+            for owner in self.owners.get(refinement.node_id, []):
+                parents[owner.node_id] = owner
+        return list(parents.values())
+
+    def children(self, vertex: Vertex):
+        """
+        Get the children of all refinements of a goal or obstacle, or of a refinement.
+        :return list[Vertex]: The children, without duplicates.
+        """
+        if isinstance(vertex, Refinement):
+            return list(vertex.children)
+        children = {}
+        for refinement in refinements_of(vertex):
+            for child in refinement.children:
+                children[child.node_id] = child
+        return list(children.values())
+
+    def links_of(self, vertex: Vertex):
+        """
+        Get the conflict, obstruction, and resolution links touching a vertex.
+        :return list: The links.
+        """
+        return self.links_by_vertex.get(vertex.node_id, [])
+
+    def top_level(self):
+        """
+        Get the goals and obstacles that are not a child of any refinement, in discovery order.
+        :return list[Vertex]: The top-level vertices.
+        """
+        return [v for v in self.vertices.values()
+                if isinstance(v, (Goal, Obstacle)) and v.node_id not in self.containing]
@@ -0,0 +1,486 @@
+"""
+Lazy proxy vertices that read their children from a backing store on first access.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+
+A LazyModel hands out proxies that are instances of the ordinary schema classes, so
+to_tree, generate_graph, and the analyses work on them unchanged. A proxy holds only its own
+fields; its refinements, children, and performance links are read from the source the first
+time they are used. Under a budget, the least recently resolved proxies drop their children
+again and read them back when next needed. Assigning to any field of a proxy pins it: it stays
+in memory with its children and is no longer read back from the source.
+"""
+import json
+import weakref
+from collections import OrderedDict
+
+from . import schema
+from .schema import (
+    Vertex,
+    Goal,
+    AchieveGoal,
+    CeaseGoal,
+    MaintainGoal,
+    AvoidGoal,
+    SoftGoal,
+    Obstacle,
+    Refinement,
+    Agent,
+    Operation,
+    DomainProperty,
+    PerformanceLink,
+    VertexType,
+    GoalType,
+    AgentType,
+    OperationCategory,
+    GoalCategory,
+    RefinementType,
+    EdgeType,
+)
+from .serialization import KINDS, KIND_NAMES, LINK_CLASSES, FORMAT_NAME, FORMAT_VERSION, ModelTable, decode
+
+
+class TableSource:
+    """
+    Serves vertices from a ModelTable, for example one decoded from a binary model file.
+    Keys are table positions.
+    """
+    def __init__(self, table: ModelTable):
+        self.table = table
+        self._performs = None
+
+    @classmethod
+    def from_file(cls, path: str):
+        """
+        Read a model file in either serialization format.
+        :param str path: The file.
+        :return TableSource: The source.
+        """
+        with open(path, "rb") as f:
+            return cls(decode(f.read()))
+
+    def roots(self):
+        return list(self.table.roots)
+
+    def record(self, key: int):
+        t = self.table
+        return t.kind[key], t.name[key], t.annotation[key], t.leaf[key], t.attr[key]
+
+    def children(self, key: int):
+        return self.table.children(key)
+
+    def categories(self, key: int):
+        return self.table.categories.get(key, [])
+
+    def performs(self, key: int):
+        if self._performs is None:
+            self._performs = {}
+            for goal, agent, operation in self.table.performs:
+                self._performs.setdefault(goal, []).append((agent, operation if operation != -1 else None))
+        return self._performs.get(key, [])
+
+    def links(self):
+        return list(self.table.links)
+
+    def size(self):
+        return len(self.table.kind)
+
+
+class SQLiteSource:
+    """
+    Serves vertices of one model in a SQLiteStore. Keys are vertex ids.
+    """
+    def __init__(self, store, model: str):
+        """
+        :param SQLiteStore store: The store.
+        :param str model: The model name.
+        """
+        self.store = store
+        self.model = model
+        self._model_id = store._model_id(model)
+        self._kind_codes = {name: code for code, name in enumerate(KIND_NAMES)}
+
+    def roots(self):
+        return self.store.roots(self.model)
+
+    def record(self, key: int):
+        row = self.store.connection.execute(
+            "SELECT kind, name, annotation, leaf, attr FROM vertices WHERE model_id = ? AND vertex_id = ?",
+            (self._model_id, key)).fetchone()
+        if row is None:
+            raise KeyError(f"Model {self.model!r} has no vertex {key}")
+        return (self._kind_codes[row[0]],) + tuple(row[1:])
+
+    def children(self, key: int):
+        return [child for (child,) in self.store.connection.execute(
+            "SELECT child FROM edges WHERE model_id = ? AND parent = ? ORDER BY position",
+            (self._model_id, key))]
+
+    def performs(self, key: int):
+        return list(self.store.connection.execute(
+            "SELECT agent, operation FROM performs WHERE model_id = ? AND goal = ? ORDER BY position",
+            (self._model_id, key)))
+
+    def categories(self, key: int):
+        return [category for (category,) in self.store.connection.execute(
+            "SELECT category FROM categories WHERE model_id = ? AND goal = ? ORDER BY position",
+            (self._model_id, key))]
+
+    def links(self):
+        return [(EdgeType(t), a, b) for t, a, b in self.store.connection.execute(
+            "SELECT edge_type, first, second FROM links WHERE model_id = ? ORDER BY position",
+            (self._model_id,))]
+
+    def size(self):
+        return self.store.connection.execute(
+            "SELECT COALESCE(MAX(vertex_id) + 1, 0) FROM vertices WHERE model_id = ?",
+            (self._model_id,)).fetchone()[0]
+
+
+class JSONLinesSource:
+    """
+    Serves vertices from a JSON Lines model written by serialization.write_jsonl.
+    Only the byte offset of each line is kept in memory; lines are parsed on demand.
+    """
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        header = json.loads(self._file.readline())
+        if header.get("format") != FORMAT_NAME or header.get("version") != FORMAT_VERSION:
+            raise ValueError("Not a goalmodeling JSON Lines model")
+        self._roots = header["roots"]
+        self._links = [(EdgeType(t), a, b) for t, a, b in header["links"]]
+        self._offsets = []
+        offset = self._file.tell()
+        for line in self._file:
+            self._offsets.append(offset)
+            offset += len(line)
+        self._kind_codes = {name: code for code, name in enumerate(KIND_NAMES)}
+        # The last line parsed, as a goal's record and categories are read one after the other.
+        self._last = (None, None)
+
+    def close(self):
+        self._file.close()
+
+    def _line(self, key: int):
+        if self._last[0] == key:
+            return self._last[1]
+        self._file.seek(self._offsets[key])
+        data = json.loads(self._file.readline())
+        self._last = (key, data)
+        return data
+
+    def roots(self):
+        return list(self._roots)
+
+    def record(self, key: int):
+        data = self._line(key)
+        return self._kind_codes[data["kind"]], data["name"], data["annotation"], data["leaf"], data["attr"]
+
+    def children(self, key: int):
+        return self._line(key)["children"]
+
+    def categories(self, key: int):
+        return self._line(key).get("categories", [])
+
+    def performs(self, key: int):
+        return [(agent, operation if operation != -1 else None)
+                for agent, operation in self._line(key)["performs"]]
+
+    def links(self):
+        return list(self._links)
+
+
+class _LazyVertex:
+    def __setattr__(self, name, value):
+        # Private attributes are caches; anything else is an edit the source does not have.
+        if name[0] != "_":
+            model = self.__dict__.get("_lazy_model")
+            if model is not None:
+                model._pin(self)
+        super().__setattr__(name, value)
+
+
+class _LazyGoal(_LazyVertex):
+    @property
+    def disjunctions(self):
+        value = self._lazy_disjunctions
+        if value is None:
+            return self._lazy_model._resolve(self)._lazy_disjunctions
+        self._lazy_model._touch(self)
+        return value
+
+    @disjunctions.setter
+    def disjunctions(self, value):
+        self._lazy_disjunctions = value
+
+    @property
+    def performs(self):
+        value = self._lazy_performs
+        if value is None:
+            return self._lazy_model._resolve_performs(self)
+        return value
+
+    @performs.setter
+    def performs(self, value):
+        self._lazy_performs = value
+
+
+class _LazyObstacle(_LazyVertex):
+    @property
+    def refinements(self):
+        value = self._lazy_refinements
+        if value is None:
+            return self._lazy_model._resolve(self)._lazy_refinements
+        self._lazy_model._touch(self)
+        return value
+
+    @refinements.setter
+    def refinements(self, value):
+        self._lazy_refinements = value
+
+
+class _LazyRefinement(_LazyVertex):
+    @property
+    def children(self):
+        value = self._lazy_children
+        if value is None:
+            return self._lazy_model._resolve(self)._lazy_children
+        self._lazy_model._touch(self)
+        return value
+
+    @children.setter
+    def children(self, value):
+        self._lazy_children = value
+
+
+# The attribute holding the resolved children of each kind of proxy.
+_CHILD_ATTRIBUTES = {
+    _LazyGoal: "_lazy_disjunctions",
+    _LazyObstacle: "_lazy_refinements",
+    _LazyRefinement: "_lazy_children",
+}
+
+_proxy_classes = {}
+
+
+def _proxy_class(cls):
+    proxy = _proxy_classes.get(cls)
+    if proxy is None:
+        if issubclass(cls, Goal):
+            mixin = _LazyGoal
+        elif issubclass(cls, Obstacle):
+            mixin = _LazyObstacle
+        elif issubclass(cls, Refinement):
+            mixin = _LazyRefinement
+        else:
+            mixin = _LazyVertex
+        proxy = type(f"Lazy{cls.__name__}", (mixin, cls), {"_lazy_mixin": mixin})
+        _proxy_classes[cls] = proxy
+    return proxy
+
+
+def is_proxy(vertex: Vertex):
+    """
+    Check whether a vertex is a lazy proxy.
+    :param Vertex vertex: The vertex.
+    :return bool: True for proxies made by a LazyModel.
+    """
+    return hasattr(vertex, "_lazy_model")
+
+
+class LazyModel:
+    """
+    Opens a model from a source and materializes vertices only as they are used.
+
+    A source provides roots(), record(key) returning (kind code, name, annotation, leaf, attr),
+    children(key), performs(key) returning (agent key, operation key or None) pairs,
+    categories(key) returning the goal category values of a goal, and links(). Keys are integers;
+    a source may also provide size(), one more than its largest key, so node ids are taken from a
+    block set aside up front instead of being remembered per key.
+    TableSource, SQLiteSource, and JSONLinesSource are provided.
+    """
+    def __init__(self, source, budget: int = None, max_depth: int = None):
+        """
+        Open the model.
+        :param source: The backing source.
+        :param int budget: The number of proxies allowed to hold resolved children; unlimited when None.
+        :param int max_depth: Treat vertices this many refinement levels below the vertices
+         opened with roots or vertex as leaves, so rendering never reads past that depth.
+        """
+        if budget is not None and budget < 1:
+            raise ValueError("budget must be at least 1")
+        self.source = source
+        self.budget = budget
+        self.max_depth = max_depth
+        self.resolved_count = 0
+        self.evicted_count = 0
+        self.loaded_count = 0
+        # Proxies live as long as something refers to them, or while pinned by an edit;
+        # node ids stay stable across reloads.
+        self._proxies = weakref.WeakValueDictionary()
+        size = source.size() if hasattr(source, "size") else 0
+        self._size = size
+        self._first_node_id = schema._reserve_node_ids(size)
+        self._node_ids = {}
+        self._lru = OrderedDict()
+        self._pinned = {}
+
+    def roots(self):
+        """
+        Get the root vertices of the model.
+        :return list[Vertex]: Proxies for the roots.
+        """
+        return [self.vertex(key) for key in self.source.roots()]
+
+    def vertex(self, key):
+        """
+        Get the proxy for a vertex of the source; with max_depth, depth is counted from here.
+        :param key: The key of the vertex in the source.
+        :return Vertex: The proxy.
+        """
+        return self._proxy(key, 0)
+
+    def links(self):
+        """
+        Get the conflict, obstruction, and resolution links of the model between proxies.
+        :return list: The links.
+        """
+        return [LINK_CLASSES[t](self.vertex(a), self.vertex(b)) for t, a, b in self.source.links()]
+
+    def key(self, vertex: Vertex):
+        """
+        Get the source key of a proxy.
+        """
+        return vertex._lazy_key
+
+    def stats(self):
+        """
+        Get counters of the work done so far.
+        :return dict: Vertices read, proxies resolved and evicted, and proxies currently resolved.
+        """
+        return {
+            "loaded": self.loaded_count,
+            "resolved": self.resolved_count,
+            "evicted": self.evicted_count,
+            "live_resolved": len(self._lru),
+            "pinned": len(self._pinned),
+        }
+
+    def _proxy(self, key, depth):
+        proxy = self._proxies.get(key)
+        if proxy is not None:
+            if self.max_depth is not None and depth < proxy._lazy_depth:
+                # Reached by a shorter path; read past the previous cut-off next time.
+                proxy._lazy_depth = depth
+                self._unresolve(proxy)
+            return proxy
+
+        code, name, annotation, leaf, attr = self.source.record(key)
+        self.loaded_count += 1
+        cls = KINDS[code]
+        proxy_cls = _proxy_class(cls)
+        proxy = proxy_cls.__new__(proxy_cls)
+        if 0 <= key < self._size:
+            node_id = self._first_node_id + key
+        else:
+            node_id = self._node_ids.get(key)
+            if node_id is None:
+                node_id = schema._get_new_node_id()
+                self._node_ids[key] = node_id
+        proxy.node_id = node_id
+        proxy.leaf = bool(leaf)
+        proxy.annotation = annotation
+        proxy._lazy_depth = depth
+        if isinstance(proxy, Refinement):
+            proxy.vertex_type = VertexType.NODE_TYPE_REFINEMENT
+            proxy.refinement_type = RefinementType.AND_REFINEMENT
+            proxy.complete = bool(attr)
+        else:
+            proxy.name = name
+            if isinstance(proxy, Goal):
+                proxy.vertex_type = VertexType.NODE_TYPE_GOAL
+                proxy.goal_type = GoalType(attr) if cls is Goal else _goal_type(cls)
+                proxy.categories = [GoalCategory(c) for c in self.source.categories(key)]
+            elif isinstance(proxy, Obstacle):
+                proxy.vertex_type = VertexType.NODE_TYPE_OBSTACLE
+            elif isinstance(proxy, Agent):
+                proxy.vertex_type = VertexType.NODE_TYPE_AGENT
+                proxy.type = AgentType(attr)
+            elif isinstance(proxy, Operation):
+                proxy.vertex_type = VertexType.NODE_TYPE_OPERATION
+                proxy.category = OperationCategory(attr)
+            elif isinstance(proxy, DomainProperty):
+                proxy.vertex_type = VertexType.NODE_TYPE_DOMAIN_PROPERTY
+
+        mixin = proxy._lazy_mixin
+        if mixin is not _LazyVertex:
+            setattr(proxy, _CHILD_ATTRIBUTES[mixin], None)
+            if mixin is _LazyGoal:
+                proxy._lazy_performs = None
+        proxy._lazy_key = key
+        proxy._lazy_model = self
+        self._proxies[key] = proxy
+        return proxy
+
+    def _resolve(self, proxy):
+        key = proxy._lazy_key
+        depth = proxy._lazy_depth
+        # A goal or obstacle and its refinements are on the same level.
+        child_depth = depth if proxy._lazy_mixin is not _LazyRefinement else depth + 1
+        if self.max_depth is not None and proxy._lazy_mixin is not _LazyRefinement and depth >= self.max_depth:
+            children = []
+        else:
+            children = [self._proxy(child, child_depth) for child in self.source.children(key)]
+        setattr(proxy, _CHILD_ATTRIBUTES[proxy._lazy_mixin], children)
+        self.resolved_count += 1
+        self._touch(proxy)
+        self._evict()
+        return proxy
+
+    def _resolve_performs(self, proxy):
+        performs = []
+        for agent, operation in self.source.performs(proxy._lazy_key):
+            performs.append(PerformanceLink(
+                self._proxy(agent, 0),
+                self._proxy(operation, 0) if operation is not None else None))
+        proxy._lazy_performs = performs
+        return performs
+
+    def _touch(self, proxy):
+        key = proxy._lazy_key
+        if key in self._lru:
+            self._lru.move_to_end(key)
+        elif key not in self._pinned:
+            self._lru[key] = proxy
+
+    def _pin(self, proxy):
+        # Edited proxies are kept with their children; they are no longer backed by the source.
+        key = proxy._lazy_key
+        self._lru.pop(key, None)
+        self._pinned[key] = proxy
+
+    def _unresolve(self, proxy):
+        mixin = proxy._lazy_mixin
+        if mixin is not _LazyVertex and proxy._lazy_key not in self._pinned:
+            setattr(proxy, _CHILD_ATTRIBUTES[mixin], None)
+            self._lru.pop(proxy._lazy_key, None)
+
+    def _evict(self):
+        if self.budget is None:
+            return
+        while len(self._lru) > self.budget:
+            key, proxy = self._lru.popitem(last=False)
+            setattr(proxy, _CHILD_ATTRIBUTES[proxy._lazy_mixin], None)
+            if proxy._lazy_mixin is _LazyGoal:
+                proxy._lazy_performs = None
+            self.evicted_count += 1
+
+
+def _goal_type(cls):
+    # The behavioral goal subclasses record their own class as the goal type.
+    if cls in (AchieveGoal, CeaseGoal, MaintainGoal, AvoidGoal):
+        return cls
+    if issubclass(cls, SoftGoal):
+        return GoalType.SOFT_GOAL
+    return GoalType.BEHAVIORAL_GOAL
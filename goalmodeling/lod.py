@@ -0,0 +1,254 @@
+"""
+Level-of-detail rendering: collapse deep or large subtrees of a refinement graph into summary nodes.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+from collections import deque
+
+from .schema import (
+    Vertex,
+    Goal,
+    Obstacle,
+    Refinement,
+    ObstructionLink,
+    ResolutionLink,
+)
+from .index import refinements_of
+
+
+class SubtreeSummary:
+    """
+    Counts of what lies below a vertex in the refinement graph, not counting the vertex itself.
+
+    A vertex shared by several refinements is counted once per refinement listing it, so the
+    counts match what a full render would draw beneath the vertex if nothing were shared.
+    """
+    def __init__(self,
+                 goals: int = 0,
+                 obstacles: int = 0,
+                 leaves: int = 0,
+                 refinements: int = 0,
+                 complete: int = 0):
+        """
+        :param int goals: The number of goals below the vertex.
+        :param int obstacles: The number of obstacles below the vertex.
+        :param int leaves: The number of leaf goals, obstacles, and domain properties below the vertex.
+        :param int refinements: The number of refinements below the vertex.
+        :param int complete: How many of those refinements are complete.
+        """
+        self.goals = goals
+        self.obstacles = obstacles
+        self.leaves = leaves
+        self.refinements = refinements
+        self.complete = complete
+
+    @property
+    def all_complete(self):
+        """
+        Whether every refinement below the vertex is complete.
+        """
+        return self.complete == self.refinements
+
+    def label(self):
+        """
+        Get the text of the summary node.
+        :return str: The counts and the completeness of the subtree.
+        """
+        text = f"+{self.goals} goals, {self.obstacles} obstacles, {self.leaves} leaves"
+        if self.refinements:
+            if self.all_complete:
+                text += "<br>all refinements complete"
+            else:
+                text += f"<br>{self.refinements - self.complete} of {self.refinements} refinements incomplete"
+        return text
+
+    def __eq__(self, other):
+        return (isinstance(other, SubtreeSummary)
+                and self.goals == other.goals
+                and self.obstacles == other.obstacles
+                and self.leaves == other.leaves
+                and self.refinements == other.refinements
+                and self.complete == other.complete)
+
+    def __repr__(self):
+        return (f"SubtreeSummary(goals={self.goals}, obstacles={self.obstacles}, leaves={self.leaves},"
+                f" refinements={self.refinements}, complete={self.complete})")
+
+
+def _below(vertex: Vertex):
+    """
+    Used internally to get the vertices one level below a vertex.
+    """
+    if isinstance(vertex, Refinement):
+        return vertex.children
+    return refinements_of(vertex)
+
+
+class SummaryCache:
+    """
+    Subtree summaries of a refinement graph, keyed by node id.
+
+    Summaries are filled in by one bottom-up pass the first time they are needed and kept
+    until invalidated, so rendering the same model at different levels of detail reuses them.
+    """
+    def __init__(self):
+        self.summaries = {}
+
+    def get(self, vertex: Vertex):
+        """
+        Get the summary of the subtree below a vertex, computing any missing summaries.
+        :param Vertex vertex: The vertex.
+        :return SubtreeSummary: The summary.
+        """
+        summary = self.summaries.get(vertex.node_id)
+        if summary is None:
+            self._compute(vertex)
+            summary = self.summaries[vertex.node_id]
+        return summary
+
+    def _compute(self, start: Vertex):
+        # Iterative post-order walk: a vertex is summarized once everything below it is. A
+        # vertex reached again while still on the walk path closes a cycle and adds nothing.
+        summaries = self.summaries
+        on_path = set()
+        stack = [(start, False)]
+        while stack:
+            vertex, expanded = stack.pop()
+            if vertex.node_id in summaries:
+                continue
+            below = _below(vertex)
+            if not expanded:
+                if vertex.node_id in on_path:
+                    continue
+                on_path.add(vertex.node_id)
+                stack.append((vertex, True))
+                for child in below:
+                    if child.node_id not in summaries and child.node_id not in on_path:
+                        stack.append((child, False))
+                continue
+
+            summary = SubtreeSummary()
+            if isinstance(vertex, Refinement):
+                for child in vertex.children:
+                    if isinstance(child, Goal):
+                        summary.goals += 1
+                    elif isinstance(child, Obstacle):
+                        summary.obstacles += 1
+                    if child.leaf:
+                        summary.leaves += 1
+                    _add(summary, summaries.get(child.node_id))
+            else:
+                for refinement in below:
+                    summary.refinements += 1
+                    if refinement.complete:
+                        summary.complete += 1
+                    _add(summary, summaries.get(refinement.node_id))
+            summaries[vertex.node_id] = summary
+            on_path.discard(vertex.node_id)
+
+    def invalidate(self, vertex: Vertex = None, index=None):
+        """
+        Drop cached summaries after the model changed.
+        :param Vertex vertex: The changed vertex, or None to drop every summary.
+        :param ModelIndex index: An index of the model, used to also drop the summaries of
+            every ancestor of the vertex. Without it, every summary is dropped.
+        """
+        if vertex is None or index is None:
+            self.summaries.clear()
+            return
+        stack = [vertex]
+        seen = set()
+        while stack:
+            current = stack.pop()
+            if current.node_id in seen:
+                continue
+            seen.add(current.node_id)
+            self.summaries.pop(current.node_id, None)
+            if isinstance(current, Refinement):
+                owner = index.owner.get(current.node_id)
+                if owner is not None:
+                    stack.append(owner)
+            else:
+                stack.extend(index.parent_refinements(current))
+
+
+def _add(summary: SubtreeSummary, other: SubtreeSummary):
+    """
+    Used internally to add the counts of one summary to another.
+    """
+    if other is None:
+        return
+    summary.goals += other.goals
+    summary.obstacles += other.obstacles
+    summary.leaves += other.leaves
+    summary.refinements += other.refinements
+    summary.complete += other.complete
+
+
+class LevelOfDetail:
+    """
+    Decides which goals and obstacles are drawn with their refinements and which are collapsed.
+
+    The graph is expanded breadth first from the roots. A goal or obstacle is collapsed when it
+    sits max_depth levels below a root, or when expanding it would draw more than max_vertices
+    goals, obstacles, and domain properties.
+    """
+    def __init__(self, max_depth: int = None, max_vertices: int = None, summaries: SummaryCache = None):
+        """
+        :param int max_depth: The deepest level drawn with its refinements, roots being level 0.
+        :param int max_vertices: The most goals, obstacles, and domain properties drawn.
+        :param SummaryCache summaries: The summaries to reuse across renders of the same model.
+        """
+        self.max_depth = max_depth
+        self.max_vertices = max_vertices
+        self.summaries = summaries if summaries is not None else SummaryCache()
+
+    def plan(self, roots: list[Vertex], links: list = None):
+        """
+        Decide what to draw.
+        :param list[Vertex] roots: The root goals.
+        :param list links: The conflict, obstruction, and resolution links.
+        :return tuple: The collapsed node ids mapped to their summary text, and the node ids drawn.
+        """
+        starts = list(roots)
+        for link in links or []:
+            if type(link) == ObstructionLink:
+                starts.append(link.obstacle)
+            elif type(link) == ResolutionLink:
+                starts.append(link.goal)
+
+        collapsed = {}
+        visible = set()
+        queue = deque()
+        for start in starts:
+            if start.node_id not in visible:
+                visible.add(start.node_id)
+                queue.append((start, 0))
+        shown = len(visible)
+
+        while queue:
+            vertex, depth = queue.popleft()
+            refinements = refinements_of(vertex)
+            if not refinements:
+                continue
+
+            new = {}
+            for refinement in refinements:
+                for child in refinement.children:
+                    if child.node_id not in visible:
+                        new[child.node_id] = child
+
+            if ((self.max_depth is not None and depth >= self.max_depth)
+                    or (self.max_vertices is not None and shown + len(new) > self.max_vertices)):
+                collapsed[vertex.node_id] = self.summaries.get(vertex).label()
+                continue
+
+            for refinement in refinements:
+                visible.add(refinement.node_id)
+            for child in new.values():
+                visible.add(child.node_id)
+                queue.append((child, depth + 1))
+            shown += len(new)
+
+        return collapsed, visible
@@ -0,0 +1,636 @@
+"""
+A persistent goal model: immutable versions that share unchanged subtrees, with undo history and
+rendering that reuses the diagram text of shared subtrees.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+
+A Version is made of Node objects, each holding a detached copy of a schema vertex (name,
+annotation, leaf flag, class, node id) and a tuple of child nodes: the refinements of a goal or
+obstacle, or the children of a refinement. Nodes never change. An edit copies the nodes on the
+path from a start vertex to the edited vertex and shares everything else, so it costs O(depth),
+and keeping a version as a snapshot costs nothing.
+
+A vertex shared by several parents is one Node, and a version never holds two nodes with the
+same node id. Editing a shared vertex through any path changes it under every parent, as
+changing the shared schema vertex would, so the diagram and thaw see one vertex. Such an edit,
+or one below a shared vertex, rebuilds the version in one walk, O(size); the others stay
+O(depth).
+"""
+import copy
+from collections import OrderedDict
+
+from .schema import (
+    Vertex,
+    Goal,
+    Obstacle,
+    Refinement,
+    PerformanceLink,
+    ObstructionLink,
+    ResolutionLink,
+    VertexType,
+    diagram_startup,
+    diagram_teardown,
+)
+from .fragments import format_pieces, expand
+
+# Attributes holding structure, kept in Node.children and Node.performs instead of the vertex.
+_STRUCTURE = ("disjunctions", "refinements", "children", "performs")
+
+
+def _detach(vertex: Vertex):
+    """
+    Used internally to copy a vertex without its structure.
+    """
+    detached = copy.copy(vertex)
+    for name in _STRUCTURE:
+        if name in detached.__dict__:
+            setattr(detached, name, [])
+    return detached
+
+
+def _structure(vertex: Vertex):
+    """
+    Used internally to get the children of a mutable vertex as a Node would hold them.
+    """
+    if isinstance(vertex, Goal):
+        return vertex.disjunctions
+    if isinstance(vertex, Obstacle):
+        return vertex.refinements
+    if isinstance(vertex, Refinement):
+        return vertex.children
+    return []
+
+
+def _vertex_of(item):
+    return item.vertex if isinstance(item, Node) else item
+
+
+def _children_of(node):
+    return node.children
+
+
+def _shared_ids(roots: tuple, links: tuple, carried: tuple):
+    """
+    Used internally to find the node ids referenced from more than one place: several parents,
+    or a parent and a start position.
+    """
+    references = {}
+    for node in roots:
+        references[node.node_id] = references.get(node.node_id, 0) + 1
+    for position in carried:
+        cls, first, second = links[position]
+        node = second if cls is ObstructionLink else first
+        references[node.node_id] = references.get(node.node_id, 0) + 1
+    seen = set()
+    stack = list(roots) + [node for _, first, second in links for node in (first, second)]
+    while stack:
+        node = stack.pop()
+        if node.node_id in seen:
+            continue
+        seen.add(node.node_id)
+        for child in node.children:
+            references[child.node_id] = references.get(child.node_id, 0) + 1
+            stack.append(child)
+    return frozenset(node_id for node_id, count in references.items() if count > 1), max(seen, default=-1)
+
+
+class Node:
+    """
+    An immutable vertex of a persistent model.
+    """
+    __slots__ = ("vertex", "children", "performs")
+
+    def __init__(self, vertex: Vertex, children: tuple = (), performs: tuple = ()):
+        """
+        :param Vertex vertex: A vertex without structure, owned by this node and never changed.
+        :param tuple children: The refinements of a goal or obstacle, or the children of a refinement.
+        :param tuple performs: The performance links of a goal; their agents and operations are
+            shared between versions and must not be changed.
+        """
+        object.__setattr__(self, "vertex", vertex)
+        object.__setattr__(self, "children", tuple(children))
+        object.__setattr__(self, "performs", tuple(performs))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Node is immutable; edit through a Version")
+
+    @property
+    def node_id(self):
+        return self.vertex.node_id
+
+    @property
+    def name(self):
+        return getattr(self.vertex, "name", None)
+
+    def replace(self, vertex: Vertex = None, children: tuple = None, performs: tuple = None):
+        """
+        Get a node like this one with some parts replaced.
+        :return Node: The new node.
+        """
+        return Node(self.vertex if vertex is None else vertex,
+                    self.children if children is None else children,
+                    self.performs if performs is None else performs)
+
+    def thaw(self, memo: dict = None):
+        """
+        Build the mutable schema objects of the subtree under this node, keeping node ids.
+        :param dict memo: Nodes already built, mapped to their vertices, so shared nodes stay shared.
+        :return Vertex: The vertex.
+        """
+        memo = {} if memo is None else memo
+        result = memo.get(self)
+        if result is not None:
+            return result
+        # Iterative post-order, so deep models do not hit the recursion limit.
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if node in memo:
+                continue
+            if not expanded:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.children if child not in memo)
+                continue
+            vertex = copy.copy(node.vertex)
+            children = [memo[child] for child in node.children]
+            if isinstance(vertex, Goal):
+                vertex.disjunctions = children
+                vertex.performs = [PerformanceLink(p.agent, p.operation) for p in node.performs]
+            elif isinstance(vertex, Obstacle):
+                vertex.refinements = children
+            elif isinstance(vertex, Refinement):
+                vertex.children = children
+            memo[node] = vertex
+        return memo[self]
+
+
+def freeze(roots: list[Vertex], links: list = None):
+    """
+    Make the first version of a persistent model from schema objects. The objects are copied,
+    so later changes to them do not affect the version.
+    :param list[Vertex] roots: The root goals.
+    :param list links: The conflict, obstruction, and resolution links.
+    :return Version: The version.
+    """
+    memo = {}
+
+    def node(start: Vertex):
+        stack = [(start, False)]
+        while stack:
+            vertex, expanded = stack.pop()
+            if vertex.node_id in memo:
+                continue
+            children = _structure(vertex)
+            if not expanded:
+                stack.append((vertex, True))
+                stack.extend((child, False) for child in children if child.node_id not in memo)
+                continue
+            performs = vertex.performs if isinstance(vertex, Goal) else ()
+            memo[vertex.node_id] = Node(_detach(vertex), tuple(memo[c.node_id] for c in children),
+                                        tuple(PerformanceLink(p.agent, p.operation) for p in performs))
+        return memo[start.node_id]
+
+    frozen_roots = tuple(node(root) for root in roots)
+    frozen_links = []
+    for link in links or []:
+        if type(link) in (ObstructionLink, ResolutionLink):
+            frozen_links.append((type(link), node(link.goal), node(link.obstacle)))
+        else:
+            frozen_links.append((type(link), node(link.goal1), node(link.goal2)))
+    return Version(frozen_roots, tuple(frozen_links))
+
+
+class Version:
+    """
+    One immutable version of a persistent model.
+
+    Vertices are addressed by paths: a tuple whose first element is the position of a start
+    vertex in starts(), the root goals followed by the obstacles of obstruction links and the
+    goals of resolution links, and whose other elements are child positions. For a goal or an
+    obstacle, the children are its refinements; for a refinement, they are the refined vertices.
+    Every edit returns a new version and leaves this one unchanged.
+    """
+    __slots__ = ("roots", "links", "_linked", "_carried", "_multiple", "_top")
+
+    def __init__(self, roots: tuple, links: tuple = (), _shared: tuple = None):
+        """
+        :param tuple roots: The root goal nodes.
+        :param tuple links: The links, as tuples of the link class and its two nodes in the order
+            the link class takes them.
+        """
+        object.__setattr__(self, "roots", tuple(roots))
+        object.__setattr__(self, "links", tuple(links))
+        # The node ids of link ends, the positions of the links carrying a start, the node ids
+        # that may be referenced from more than one place, and the largest node id in the
+        # version. The first two only change with the links and the others only grow with edits,
+        # so versions made by edits share them.
+        if _shared is None:
+            linked = frozenset(node.node_id for _, first, second in self.links for node in (first, second))
+            carried = tuple(i for i, (cls, _, _) in enumerate(self.links) if cls in (ObstructionLink, ResolutionLink))
+            _shared = (linked, carried) + _shared_ids(self.roots, self.links, carried)
+        object.__setattr__(self, "_linked", _shared[0])
+        object.__setattr__(self, "_carried", _shared[1])
+        object.__setattr__(self, "_multiple", _shared[2])
+        object.__setattr__(self, "_top", _shared[3])
+
+    def _entering(self, starts: list):
+        """
+        Used internally for subtrees about to join this version: the node ids in them that may
+        then be referenced from more than one place, and their largest node id. Node ids are
+        allocated in increasing order, so an id above the largest of the version is new to it;
+        the others may already be in it.
+        """
+        references = {}
+        multiple = set()
+        top = -1
+        seen = set()
+        stack = list(starts)
+        while stack:
+            node = stack.pop()
+            if node.node_id in seen:
+                continue
+            seen.add(node.node_id)
+            top = max(top, node.node_id)
+            if node.node_id <= self._top:
+                multiple.add(node.node_id)
+            for child in node.children:
+                references[child.node_id] = references.get(child.node_id, 0) + 1
+                stack.append(child)
+        multiple.update(node_id for node_id, count in references.items() if count > 1)
+        return frozenset(multiple), top
+
+    def _state(self, added: tuple = None, linked: frozenset = None, carried: tuple = None):
+        """
+        Used internally for what a version made by an edit shares with this one.
+        :param tuple added: What _entering found for a subtree the edit brings in, if any.
+        """
+        multiple, top = self._multiple, self._top
+        if added is not None:
+            multiple, top = multiple | added[0], max(top, added[1])
+        if linked is None:
+            return self._linked, self._carried, multiple, top
+        return linked, carried, multiple, top
+
+    def _with(self, roots: tuple, links: tuple, added: tuple = None):
+        """
+        Used internally to make a version after an edit, keeping what it shares with this one.
+        """
+        if links is not self.links:
+            linked = frozenset(node.node_id for _, first, second in links for node in (first, second))
+            carried = tuple(i for i, (cls, _, _) in enumerate(links) if cls in (ObstructionLink, ResolutionLink))
+            # A link end carrying a start is referenced from the link as well as its parents.
+            starts = frozenset((first if cls is ResolutionLink else second).node_id
+                               for cls, first, second in (links[i] for i in carried))
+            state = self._state(added, linked, carried)
+            return Version(roots, links, (linked, carried, state[2] | starts, state[3]))
+        return Version(roots, links, self._state(added))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Version is immutable; edits return a new version")
+
+    def starts(self):
+        """
+        Get the vertices paths start from, in the order generate_graph draws them.
+        :return list[Node]: The root goals, then the obstacle of every obstruction link and the
+            goal of every resolution link.
+        """
+        return list(self.roots) + [self._start(i) for i in range(len(self.roots), len(self.roots) + len(self._carried))]
+
+    def _start(self, position: int):
+        if position < len(self.roots):
+            return self.roots[position]
+        cls, first, second = self.links[self._carried[position - len(self.roots)]]
+        return second if cls is ObstructionLink else first
+
+    def get(self, path: tuple):
+        """
+        Get the node at a path.
+        :return Node: The node.
+        """
+        return self._walk(path)[-1]
+
+    def _walk(self, path: tuple):
+        if not path:
+            raise ValueError("A path needs at least a start position")
+        nodes = [self._start(path[0])]
+        for position in path[1:]:
+            nodes.append(nodes[-1].children[position])
+        return nodes
+
+    def locate(self, node_id: int):
+        """
+        Find a path to a vertex by a breadth-first search, in time linear in the model size.
+        :param int node_id: The node id.
+        :return tuple: The first path found, or None.
+        """
+        seen = set()
+        level = [((i,), start) for i, start in enumerate(self.starts())]
+        while level:
+            following = []
+            for path, node in level:
+                if node.node_id == node_id:
+                    return path
+                if node in seen:
+                    continue
+                seen.add(node)
+                following.extend((path + (i,), child) for i, child in enumerate(node.children))
+            level = following
+        return None
+
+    def replace(self, path: tuple, node: Node):
+        """
+        Replace the node at a path, copying its ancestors. When the node or one of its ancestors
+        on the path is shared, every place the node appears is replaced.
+        :param tuple path: The path.
+        :param Node node: The new node, which should keep the node id of the one it replaces.
+        :return Version: The new version.
+        """
+        nodes = self._walk(path)
+        # Only the children the old node did not have bring anything in.
+        old = nodes[-1]
+        added = None
+        if node.node_id != old.node_id:
+            added = self._entering([node])
+        elif node.children is not old.children:
+            kept = {id(child) for child in old.children}
+            fresh = [child for child in node.children if id(child) not in kept]
+            if fresh:
+                added = self._entering(fresh)
+        if any(ancestor.node_id in self._multiple for ancestor in nodes):
+            return self._substitute(old, node, added)
+        replaced = {}
+        new = node
+        for depth in range(len(path) - 1, 0, -1):
+            replaced[nodes[depth]] = new
+            parent = nodes[depth - 1]
+            position = path[depth]
+            new = parent.replace(children=parent.children[:position] + (new,) + parent.children[position + 1:])
+        replaced[nodes[0]] = new
+        roots = tuple(replaced.get(root, root) for root in self.roots)
+        links = self.links
+        if any(old.node_id in self._linked for old in replaced):
+            links = tuple((cls, replaced.get(first, first), replaced.get(second, second))
+                          for cls, first, second in links)
+            # The link ends changed but not which vertices they are.
+            return Version(roots, links, self._state(added))
+        return self._with(roots, links, added)
+
+    def _substitute(self, old: Node, new: Node, added: tuple = None):
+        """
+        Used internally to replace every node with the node id of old by new, rebuilding the
+        nodes above them, in one walk of the version.
+        """
+        node_id = old.node_id
+        # id of a node -> its replacement.
+        memo = {}
+
+        def rebuild(start: Node):
+            stack = [(start, False)]
+            while stack:
+                node, expanded = stack.pop()
+                key = id(node)
+                if key in memo:
+                    continue
+                if node.node_id == node_id:
+                    memo[key] = new
+                    continue
+                if not expanded:
+                    stack.append((node, True))
+                    stack.extend((child, False) for child in node.children if id(child) not in memo)
+                    continue
+                children = tuple(memo.get(id(child), child) for child in node.children)
+                changed = any(a is not b for a, b in zip(children, node.children))
+                memo[key] = node.replace(children=children) if changed else node
+            return memo[id(start)]
+
+        roots = tuple(rebuild(root) for root in self.roots)
+        links = tuple((cls, rebuild(first), rebuild(second)) for cls, first, second in self.links)
+        return Version(roots, links, self._state(added))
+
+    def update(self, path: tuple, **fields):
+        """
+        Change attributes of the vertex at a path, such as name, annotation, leaf, or complete.
+        :return Version: The new version.
+        """
+        node = self.get(path)
+        vertex = copy.copy(node.vertex)
+        for name, value in fields.items():
+            if name in _STRUCTURE or name == "node_id" or not hasattr(vertex, name):
+                raise ValueError(f"Cannot update {name} of {type(vertex).__name__}")
+            setattr(vertex, name, value)
+        return self.replace(path, node.replace(vertex=vertex))
+
+    def insert(self, path: tuple, child, position: int = None):
+        """
+        Insert a child under the vertex at a path: a refinement under a goal or obstacle, or a
+        goal, obstacle, or domain property under a refinement.
+        :param tuple path: The path of the parent.
+        :param child: A Node, or a schema vertex, which is frozen with its subtree.
+        :param int position: The position among the children, by default the end.
+        :return Version: The new version.
+        """
+        node = self.get(path)
+        if not isinstance(node.vertex, (Goal, Obstacle, Refinement)):
+            raise ValueError(f"{type(node.vertex).__name__} has no children")
+        if isinstance(child, Vertex):
+            child = freeze([child]).roots[0]
+        if isinstance(node.vertex, Refinement) == (child.vertex.vertex_type == VertexType.NODE_TYPE_REFINEMENT):
+            raise ValueError("Goals and obstacles take refinements, and refinements take the other vertices")
+        children = node.children
+        position = len(children) if position is None else position
+        return self.replace(path, node.replace(children=children[:position] + (child,) + children[position:]))
+
+    def remove(self, path: tuple):
+        """
+        Remove the vertex at a path from its parent.
+        :param tuple path: The path, at least one position below a start.
+        :return Version: The new version.
+        """
+        if len(path) < 2:
+            raise ValueError("Remove a start with without_root or without_link instead")
+        parent = self.get(path[:-1])
+        position = path[-1]
+        return self.replace(path[:-1], parent.replace(children=parent.children[:position] + parent.children[position + 1:]))
+
+    def add_perform(self, path: tuple, agent, operation=None):
+        """
+        Add a performance link to the goal at a path.
+        :return Version: The new version.
+        """
+        node = self.get(path)
+        if not isinstance(node.vertex, Goal):
+            raise ValueError("Only goals are performed by agents")
+        return self.replace(path, node.replace(performs=node.performs + (PerformanceLink(agent, operation),)))
+
+    def add_root(self, root):
+        """
+        Add a root goal, a Node or a schema vertex frozen with its subtree.
+        :return Version: The new version.
+        """
+        if isinstance(root, Vertex):
+            root = freeze([root]).roots[0]
+        return self._with(self.roots + (root,), self.links, self._entering([root]))
+
+    def without_root(self, position: int):
+        """
+        Remove a root goal.
+        :return Version: The new version.
+        """
+        return self._with(self.roots[:position] + self.roots[position + 1:], self.links)
+
+    def add_link(self, cls: type, first: tuple, second: tuple):
+        """
+        Add a link between the vertices at two paths.
+        :param type cls: ConflictLink, ObstructionLink, or ResolutionLink.
+        :param tuple first: The path of the first vertex the link class takes.
+        :param tuple second: The path of the second vertex.
+        :return Version: The new version.
+        """
+        return self._with(self.roots, self.links + ((cls, self.get(first), self.get(second)),))
+
+    def without_link(self, position: int):
+        """
+        Remove a link.
+        :return Version: The new version.
+        """
+        return self._with(self.roots, self.links[:position] + self.links[position + 1:])
+
+    def thaw(self):
+        """
+        Build mutable schema objects for this version, keeping node ids.
+        :return tuple: The root goals and the list of links.
+        """
+        memo = {}
+        roots = [root.thaw(memo) for root in self.roots]
+        links = [cls(first.thaw(memo), second.thaw(memo)) for cls, first, second in self.links]
+        return roots, links
+
+
+class History:
+    """
+    The versions of an edited model, with undo and redo.
+    """
+    def __init__(self, version: Version, limit: int = None):
+        """
+        :param Version version: The first version.
+        :param int limit: The most versions kept, or None for all.
+        """
+        self.versions = [version]
+        self.position = 0
+        self.limit = limit
+
+    @property
+    def current(self):
+        return self.versions[self.position]
+
+    def commit(self, version: Version):
+        """
+        Make a version current, dropping the versions that were undone.
+        :return Version: The version.
+        """
+        del self.versions[self.position + 1:]
+        self.versions.append(version)
+        if self.limit is not None and len(self.versions) > self.limit:
+            del self.versions[:len(self.versions) - self.limit]
+        self.position = len(self.versions) - 1
+        return version
+
+    def can_undo(self):
+        return self.position > 0
+
+    def can_redo(self):
+        return self.position < len(self.versions) - 1
+
+    def undo(self):
+        """
+        Go back one version.
+        :return Version: The current version.
+        """
+        if self.can_undo():
+            self.position -= 1
+        return self.current
+
+    def redo(self):
+        """
+        Go forward one version.
+        :return Version: The current version.
+        """
+        if self.can_redo():
+            self.position += 1
+        return self.current
+
+
+class FragmentCache:
+    """
+    Renders versions, keeping the diagram text each node contributes.
+
+    A node's text is stored as pieces: strings, and the nodes, refinements, and agents whose text
+    goes between them, which are expanded when the diagram is put together. As nodes never
+    change, the pieces of a node stay valid for every version sharing it, so rendering a version
+    after an edit only formats the nodes on the edited path. The result is the same text
+    generate_graph makes for the thawed version.
+    """
+    def __init__(self, capacity: int = None):
+        """
+        :param int capacity: The most nodes kept, least recently used dropped first; None for no limit.
+        """
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def pieces(self, node: Node):
+        """
+        Get the pieces of a goal or obstacle node.
+        :return tuple: Strings, and the nodes or agents to expand between them.
+        """
+        entry = self._entries.get(node)
+        if entry is not None:
+            self.hits += 1
+            if self.capacity is not None:
+                self._entries.move_to_end(node)
+            return entry
+        self.misses += 1
+        entry = self._format(node)
+        self._entries[node] = entry
+        if self.capacity is not None and len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+        return entry
+
+    @staticmethod
+    def _format(node: Node):
+        return format_pieces(node.vertex, node.children, node.performs, _vertex_of, _children_of)
+
+    def _expand(self, start: Node, visited: set, output: list):
+        expand(start, visited, output, self.pieces, _vertex_of)
+
+    def render(self, version: Version):
+        """
+        Generate the Mermaid js diagram of a version.
+        :param Version version: The version.
+        :return str: The diagram definition.
+        """
+        output = [diagram_startup()]
+        visited = set()
+        for root in version.roots:
+            self._expand(root, visited, output)
+        for cls, first, second in version.links:
+            if cls is ObstructionLink:
+                self._expand(second, visited, output)
+            elif cls is ResolutionLink:
+                self._expand(first, visited, output)
+            output.append(cls(first.vertex, second.vertex).to_string())
+            output.append("\n")
+        output.append(diagram_teardown())
+        return "".join(output)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        """
+        Get the cache counters.
+        :return dict: The number of nodes kept, hits, and misses.
+        """
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,362 @@
+"""
+A reachability index over the refinement graph for ancestor, descendant, and common-ancestor queries.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+from bisect import bisect_right
+
+from .schema import (
+    Vertex,
+    Refinement,
+    ObstructionLink,
+)
+from .index import ModelIndex, link_endpoints
+
+# Distance between consecutive labels, leaving room to label new leaves without relabelling.
+GAP = 1 << 16
+
+
+class ReachabilityIndex:
+    """
+    Answers whether one goal, obstacle, or domain property lies below another.
+
+    A vertex lies below another when it is a child of one of its refinements, or an obstacle
+    obstructing it, or lies below one of those. Refinements themselves are not indexed.
+
+    A depth-first spanning forest gives every vertex an interval containing the intervals of
+    its tree descendants. The vertices reached by an edge outside the forest are shared. Every
+    vertex that reaches a shared vertex outside its own interval keeps the intervals of what it
+    reaches there, sorted, with nested and overlapping intervals merged (reach). Then u reaches
+    w when the interval of u, or one interval in the reach of u, contains the label of w.
+
+    Vertices of tree-shaped parts of a model keep nothing besides their own interval. A vertex
+    keeps at most one interval per shared vertex it reaches, and fewer when those lie inside
+    one another, so memory is O(V + total reach) and reaches takes O(log k) for a reach of k
+    intervals.
+
+    Labels are spaced GAP apart, so adding a new leaf only takes an unused sub-interval of its
+    parent, which every interval containing the parent already covers. Adding an edge to an
+    existing vertex merges its intervals into the reach of the vertices above it. Other edits,
+    or a parent whose gap is used up, relabel everything.
+    """
+    def __init__(self, roots: list[Vertex], links: list = None, index: ModelIndex = None):
+        """
+        Index a model.
+        :param list[Vertex] roots: The root goals.
+        :param list links: The conflict, obstruction, and resolution links.
+        :param ModelIndex index: An index of the model, if one was already built.
+        """
+        self.index = index if index is not None else ModelIndex(roots, links)
+        self.rebuild()
+
+    def rebuild(self):
+        """
+        Relabel every vertex from the current model.
+        """
+        index = self.index
+        # node id -> vertex, and the edges between them as node ids.
+        self.vertices = {}
+        self.children = {}
+        self.parents = {}
+        for node_id, vertex in index.vertices.items():
+            if not isinstance(vertex, Refinement):
+                self.vertices[node_id] = vertex
+                self.children[node_id] = []
+                self.parents[node_id] = []
+        for node_id in self.vertices:
+            for child in self._below(self.vertices[node_id]):
+                self._connect(node_id, child.node_id)
+
+        self.pre = {}
+        self.post = {}
+        # node id -> tree parent, tree depth, binary-lifting table of tree ancestors.
+        self.tree_parent = {}
+        self.depth = {}
+        self.up = {}
+        # node id -> the largest post label among the tree children.
+        self.last = {}
+        self.shared = set()
+        # node id -> sorted, disjoint (first, last) label intervals outside its own interval.
+        self.reach = {}
+        # The vertices at or below a shared vertex, which may have ancestors off the tree.
+        self.below_shared = set()
+        # node id -> None for the vertices without parents, in model order, kept up to date as
+        # edges are added.
+        self.tops = {n: None for n in self.vertices if not self.parents[n]}
+
+        postorder = []
+        back_edge = False
+        label = 0
+        for start in list(self.tops) + list(self.vertices):
+            if start in self.pre:
+                continue
+            label += GAP
+            self._place(start, None, label)
+            on_path = {start}
+            stack = [(start, iter(self.children[start]))]
+            while stack:
+                node_id, successors = stack[-1]
+                for child in successors:
+                    if child not in self.pre:
+                        label += GAP
+                        self._place(child, node_id, label)
+                        on_path.add(child)
+                        stack.append((child, iter(self.children[child])))
+                        break
+                    if child in on_path:
+                        back_edge = True
+                    self._share(child)
+                else:
+                    label += GAP
+                    self.post[node_id] = label
+                    parent = self.tree_parent[node_id]
+                    if parent is not None:
+                        self.last[parent] = label
+                    on_path.discard(node_id)
+                    postorder.append(node_id)
+                    stack.pop()
+
+        while True:
+            changed = False
+            for node_id in postorder:
+                intervals = []
+                for child in self.children[node_id]:
+                    if self.tree_parent[child] != node_id:
+                        intervals.append((self.pre[child], self.post[child]))
+                    intervals += self.reach.get(child, ())
+                changed |= self._set_reach(node_id, intervals)
+            # Without a cycle one pass reaches the closure.
+            if not back_edge or not changed:
+                break
+        for node_id in reversed(postorder):
+            parent = self.tree_parent[node_id]
+            if node_id in self.shared or (parent is not None and parent in self.below_shared):
+                self.below_shared.add(node_id)
+
+    def _below(self, vertex: Vertex):
+        below = {}
+        for child in self.index.children(vertex):
+            below[child.node_id] = child
+        for link in self.index.links_of(vertex):
+            if type(link) == ObstructionLink and link.goal is vertex:
+                below[link.obstacle.node_id] = link.obstacle
+        return list(below.values())
+
+    def _connect(self, parent: int, child: int):
+        if child not in self.children[parent]:
+            self.children[parent].append(child)
+            self.parents[child].append(parent)
+
+    def _place(self, node_id: int, parent: int or None, label: int):
+        self.pre[node_id] = label
+        self.last[node_id] = label
+        self.tree_parent[node_id] = parent
+        if parent is None:
+            self.depth[node_id] = 0
+            self.up[node_id] = []
+            return
+        self.depth[node_id] = self.depth[parent] + 1
+        up = [parent]
+        while len(self.up[up[-1]]) >= len(up):
+            up.append(self.up[up[-1]][len(up) - 1])
+        self.up[node_id] = up
+
+    def _share(self, node_id: int):
+        self.shared.add(node_id)
+
+    def _set_reach(self, node_id: int, intervals: list):
+        """
+        Used internally to merge intervals into the reach of a vertex.
+        :return bool: Whether the reach changed.
+        """
+        first, last = self.pre[node_id], self.post[node_id]
+        current = self.reach.get(node_id, [])
+        merged = []
+        for start, end in sorted(current + [i for i in intervals if not (first <= i[0] and i[1] <= last)]):
+            if merged and start <= merged[-1][1]:
+                if end > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+        if merged == current:
+            return False
+        self.reach[node_id] = merged
+        return True
+
+    def __contains__(self, vertex: Vertex):
+        return vertex.node_id in self.vertices
+
+    def reaches(self, ancestor: Vertex, descendant: Vertex):
+        """
+        Whether a vertex lies below another, or is the same vertex.
+        :param Vertex ancestor: The upper vertex.
+        :param Vertex descendant: The lower vertex.
+        :return bool: True if there is a path from the ancestor down to the descendant.
+        """
+        u, w = ancestor.node_id, descendant.node_id
+        if u not in self.pre or w not in self.pre:
+            return False
+        label = self.pre[w]
+        if self.pre[u] <= label <= self.post[u]:
+            return True
+        reach = self.reach.get(u)
+        if not reach:
+            return False
+        i = bisect_right(reach, (label, float("inf"))) - 1
+        return i >= 0 and reach[i][1] >= label
+
+    def ancestors(self, vertex: Vertex):
+        """
+        Get every vertex the given one lies below.
+        :return list[Vertex]: The ancestors, nearest first.
+        """
+        seen = {vertex.node_id}
+        frontier = [vertex.node_id]
+        result = []
+        while frontier:
+            following = []
+            for node_id in frontier:
+                for parent in self.parents.get(node_id, []):
+                    if parent not in seen:
+                        seen.add(parent)
+                        result.append(self.vertices[parent])
+                        following.append(parent)
+            frontier = following
+        return result
+
+    def roots_of(self, vertex: Vertex):
+        """
+        Get the top-level goals and obstacles that the vertex lies below, such as the root goals
+        an obstacle can ultimately obstruct.
+        :return list[Vertex]: The roots.
+        """
+        w = vertex.node_id
+        if w not in self.pre:
+            return []
+        if w not in self.below_shared:
+            # No shared vertex is above: the ancestors are the tree path to the tree root.
+            u = w
+            while self.up[u]:
+                u = self.up[u][-1]
+            return [self.vertices[u]] if u in self.tops else []
+        return [self.vertices[n] for n in self.tops if self.reaches(self.vertices[n], vertex)]
+
+    def _tree_lca(self, u: int, v: int):
+        if self.depth[u] < self.depth[v]:
+            u, v = v, u
+        difference = self.depth[u] - self.depth[v]
+        k = 0
+        while difference:
+            if difference & 1:
+                u = self.up[u][k]
+            difference >>= 1
+            k += 1
+        if u == v:
+            return u
+        for k in range(len(self.up[u]) - 1, -1, -1):
+            if k < len(self.up[u]) and k < len(self.up[v]) and self.up[u][k] != self.up[v][k]:
+                u, v = self.up[u][k], self.up[v][k]
+        parent = self.tree_parent[u]
+        return parent if parent is not None and parent == self.tree_parent[v] else None
+
+    def lowest_common_ancestors(self, first: Vertex, second: Vertex):
+        """
+        Get the common ancestors of two vertices that have no common ancestor below them.
+
+        When neither vertex lies below a shared vertex, all their ancestors are on the
+        spanning tree and the answer is found by binary lifting in logarithmic time. Otherwise
+        the ancestors of the first vertex are filtered with reachability tests.
+        :return list[Vertex]: The lowest common ancestors; a vertex counts as its own ancestor.
+        """
+        u, v = first.node_id, second.node_id
+        if u not in self.pre or v not in self.pre:
+            return []
+        if u not in self.below_shared and v not in self.below_shared:
+            lca = self._tree_lca(u, v)
+            return [self.vertices[lca]] if lca is not None else []
+        common = [a for a in [first] + self.ancestors(first) if self.reaches(a, second)]
+        return [a for a in common
+                if not any(b is not a and self.reaches(a, b) for b in common)]
+
+    def add_refinement(self, parent: Vertex, refinement: Refinement):
+        """
+        Append a refinement to a goal or obstacle and update the index.
+        :param Vertex parent: The refined goal or obstacle.
+        :param Refinement refinement: The new refinement.
+        """
+        self.index.add_refinement(parent, refinement)
+        for child in refinement.children:
+            self._add_edge(parent, child)
+
+    def add_child(self, refinement: Refinement, child: Vertex):
+        """
+        Append a child to a refinement and update the index.
+        :param Refinement refinement: The refinement.
+        :param Vertex child: The new child.
+        """
+        self.index.add_child(refinement, child)
+        owner = self.index.owner.get(refinement.node_id)
+        if owner is None:
+            self.rebuild()
+        else:
+            self._add_edge(owner, child)
+
+    def add_link(self, link):
+        """
+        Index a conflict, obstruction, or resolution link and update the index.
+        """
+        self.index.add_link(link)
+        if type(link) == ObstructionLink:
+            self._add_edge(link.goal, link.obstacle)
+        elif any(end.node_id not in self.vertices for end in link_endpoints(link)):
+            self.rebuild()
+
+    def _add_edge(self, parent: Vertex, child: Vertex):
+        p, c = parent.node_id, child.node_id
+        if p not in self.vertices:
+            self.rebuild()
+            return
+        if c in self.vertices and c in self.children[p]:
+            return
+        if c not in self.vertices:
+            if self._below(child) or not self._place_leaf(p, c):
+                self.rebuild()
+                return
+            self.vertices[c] = child
+            self.children[c] = []
+            self.parents[c] = []
+            self._connect(p, c)
+            if p in self.below_shared:
+                self.below_shared.add(c)
+            return
+
+        # An edge to a vertex already in the index: the vertex becomes shared, every vertex
+        # above the new edge now reaches what it reaches, and every vertex below it may now
+        # have ancestors off the tree.
+        self._connect(p, c)
+        self.tops.pop(c, None)
+        self._share(c)
+        gained = [(self.pre[c], self.post[c])] + self.reach.get(c, [])
+        stack = [p]
+        while stack:
+            node_id = stack.pop()
+            if self._set_reach(node_id, gained):
+                stack.extend(self.parents[node_id])
+        stack = [c]
+        while stack:
+            node_id = stack.pop()
+            if node_id not in self.below_shared:
+                self.below_shared.add(node_id)
+                stack.extend(self.children[node_id])
+
+    def _place_leaf(self, parent: int, node_id: int):
+        low, high = self.last[parent], self.post[parent]
+        if high - low < 3:
+            return False
+        start = low + (high - low) // 3
+        end = low + 2 * (high - low) // 3
+        self._place(node_id, parent, start)
+        self.post[node_id] = end
+        self.last[parent] = end
+        return True
@@ -0,0 +1,256 @@
+"""
+Tracking the vertices of live models with weak references, for long-running services.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+
+A registry never keeps a model alive: it holds weak references to every vertex of a registered
+model and learns through a finalizer on each root when the model is collected. State kept for
+rendering a model, such as a FragmentCache or SummaryCache, can be attached to it and is
+released at that point, so a service that builds, renders, and drops models keeps a flat memory
+profile as long as it drops its own references.
+"""
+import sys
+import threading
+import weakref
+
+from .schema import Vertex, Goal, Obstacle, Refinement, ConflictLink
+
+
+def _below(vertex: Vertex):
+    """
+    Used internally to list what a vertex holds: refinements, children, agents, and operations.
+    """
+    if isinstance(vertex, Goal):
+        below = list(vertex.disjunctions)
+        for perform in vertex.performs:
+            below.append(perform.agent)
+            if perform.operation is not None:
+                below.append(perform.operation)
+        return below
+    if isinstance(vertex, Obstacle):
+        return vertex.refinements
+    if isinstance(vertex, Refinement):
+        return vertex.children
+    return ()
+
+
+def vertex_size(vertex: Vertex):
+    """
+    Estimate the memory held by one vertex: the object, its attributes, its structure lists, and
+    its strings, including cached labels. Objects it shares with other vertices, such as the
+    vertices it lists, are not counted.
+    :param Vertex vertex: The vertex.
+    :return int: The size in bytes.
+    """
+    size = sys.getsizeof(vertex) + sys.getsizeof(vertex.__dict__)
+    for value in vertex.__dict__.values():
+        if isinstance(value, (str, list)):
+            size += sys.getsizeof(value)
+        elif isinstance(value, tuple):
+            # A cached label: the key, shape, and node id are shared; the drawing is not.
+            size += sys.getsizeof(value) + sys.getsizeof(value[-1])
+    return size
+
+
+class _Model:
+    """
+    Used internally for the registry entry of one model.
+    """
+    def __init__(self, model_id: int, name: str):
+        self.model_id = model_id
+        self.name = name
+        # Weak references to the vertices, each calling collected when its vertex goes.
+        self.refs = []
+        self.dead = 0
+        self.roots_alive = 0
+        self.state = []
+        self._lock = threading.Lock()
+
+    def collected(self, ref):
+        with self._lock:
+            self.dead += 1
+
+    def live(self):
+        return len(self.refs) - self.dead
+
+    def vertices(self):
+        return [vertex for vertex in (ref() for ref in self.refs) if vertex is not None]
+
+
+class ModelRegistry:
+    """
+    Tracks registered models by weak references to their vertices.
+
+    A model counts as collected once all of its roots are; vertices it shared with other models
+    may live on and are still counted as live for those. Counts and sizes only include vertices
+    reachable from the roots and links when the model was registered. The registry is safe to
+    use from several threads.
+    """
+    def __init__(self):
+        # model id -> _Model, for models whose roots are not all collected.
+        self._models = {}
+        self._next_id = 0
+        # Finalizers may run during any allocation, on any thread, including one holding the lock.
+        self._lock = threading.RLock()
+        self.registered = 0
+        self.released = 0
+
+    def register(self, roots: list[Vertex], links: list = None, name: str = None):
+        """
+        Start tracking a model.
+        :param list[Vertex] roots: The root vertices.
+        :param list links: The conflict, obstruction, and resolution links, whose ends are
+            tracked too.
+        :param str name: A name reported with the model, by default its id.
+        :return int: The model id.
+        """
+        with self._lock:
+            model_id = self._next_id
+            self._next_id += 1
+            model = _Model(model_id, name if name is not None else str(model_id))
+            self._models[model_id] = model
+            self.registered += 1
+
+        starts = list(roots)
+        for link in links or []:
+            if type(link) == ConflictLink:
+                starts += [link.goal1, link.goal2]
+            else:
+                starts += [link.goal, link.obstacle]
+        refs = model.refs
+        collected = model.collected
+        seen = set()
+        stack = starts
+        while stack:
+            vertex = stack.pop()
+            if id(vertex) in seen:
+                continue
+            seen.add(id(vertex))
+            refs.append(weakref.ref(vertex, collected))
+            stack.extend(_below(vertex))
+
+        unique = {id(root): root for root in roots}
+        model.roots_alive = len(unique)
+        for root in unique.values():
+            weakref.finalize(root, self._root_collected, model_id)
+        if not unique:
+            self._release(model_id)
+        return model_id
+
+    def attach(self, model_id: int, state, release=None):
+        """
+        Keep render state with a model until the model is collected or unregistered. The state
+        must not refer to the vertices of the model, or the model is never collected.
+        :param int model_id: The model id.
+        :param state: The state, such as a FragmentCache, SummaryCache, or dictionary.
+        :param release: A function called with the state when it is released; by default its
+            clear method is called, or its invalidate method without arguments, if it has one.
+        """
+        with self._lock:
+            model = self._models.get(model_id)
+            if model is not None:
+                model.state.append((state, release))
+                return
+        # The model is already gone: release at once.
+        self._release_state([(state, release)])
+
+    def _root_collected(self, model_id: int):
+        with self._lock:
+            model = self._models.get(model_id)
+            if model is None:
+                return
+            model.roots_alive -= 1
+            if model.roots_alive > 0:
+                return
+        self._release(model_id)
+
+    def _release(self, model_id: int):
+        with self._lock:
+            model = self._models.pop(model_id, None)
+            if model is None:
+                return
+            self.released += 1
+            state, model.state = model.state, []
+            # The references hold the entry through their callback; drop them to free it now.
+            model.refs = []
+        self._release_state(state)
+
+    @staticmethod
+    def _release_state(state: list):
+        for item, release in state:
+            if release is not None:
+                release(item)
+            elif hasattr(item, "clear"):
+                item.clear()
+            elif hasattr(item, "invalidate"):
+                item.invalidate()
+
+    def unregister(self, model_id: int):
+        """
+        Stop tracking a model and release its state now.
+        :param int model_id: The model id.
+        """
+        self._release(model_id)
+
+    def is_alive(self, model_id: int):
+        """
+        Whether some root of a model has not been collected.
+        """
+        with self._lock:
+            return model_id in self._models
+
+    def live(self, model_id: int):
+        """
+        Get the number of live vertices of a model.
+        :param int model_id: The model id.
+        :return int: The vertices not yet collected, 0 once the model is collected.
+        """
+        with self._lock:
+            model = self._models.get(model_id)
+            return model.live() if model is not None else 0
+
+    def memory(self, model_id: int):
+        """
+        Estimate the memory held by the live vertices of a model, walking all of them.
+        :param int model_id: The model id.
+        :return int: The size in bytes, 0 once the model is collected.
+        """
+        with self._lock:
+            model = self._models.get(model_id)
+            vertices = model.vertices() if model is not None else []
+        return sum(vertex_size(vertex) for vertex in vertices)
+
+    def models(self):
+        """
+        Get the ids of the models not yet collected.
+        :return list[int]: The model ids, in registration order.
+        """
+        with self._lock:
+            return list(self._models)
+
+    def stats(self, memory: bool = False):
+        """
+        Report the tracked models.
+        :param bool memory: Also estimate the bytes held by each model, which walks every live
+            vertex.
+        :return dict: The number of models registered, released, and live, the live vertices in
+            total, and for each live model its name, registered and live vertices, attached
+            state, and bytes if asked for.
+        """
+        with self._lock:
+            entries = [(m.model_id, m.name, len(m.refs), m.live(), len(m.state))
+                       for m in self._models.values()]
+            result = {
+                "registered": self.registered,
+                "released": self.released,
+                "live_models": len(entries),
+                "live_vertices": sum(entry[3] for entry in entries),
+                "models": {},
+            }
+        for model_id, name, registered, live, state in entries:
+            report = {"name": name, "registered": registered, "live": live, "state": state}
+            if memory:
+                report["bytes"] = self.memory(model_id)
+            result["models"][model_id] = report
+        return result
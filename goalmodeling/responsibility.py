@@ -0,0 +1,195 @@
+"""
+Indexing which agents are responsible for which goals, which leaf goals nobody covers, and agent load.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+from .schema import (
+    Vertex,
+    Goal,
+    Agent,
+    AgentType,
+    Operation,
+    Refinement,
+    PerformanceLink,
+)
+from .index import ModelIndex
+
+
+def agent_key(agent: Agent):
+    """
+    Get what identifies an agent across the Agent objects standing for it.
+    :return tuple: The name and type of the agent.
+    """
+    return agent.name, agent.type
+
+
+class ResponsibilityIndex:
+    """
+    Indexes the performance links of a model by goal and by agent.
+
+    Diagrams repeat an agent as a separate Agent object wherever it performs a goal, so agents
+    are identified by name and type; queries accept any of the objects.
+
+    A leaf goal is a goal without refinements. It is covered when at least one agent performs
+    it. The load of an agent is the number of goals it performs; loads are kept per agent and
+    per agent type, and updated by every edit made through the index.
+    """
+    def __init__(self, roots: list[Vertex], links: list = None, index: ModelIndex = None):
+        """
+        Index a model.
+        :param list[Vertex] roots: The root goals.
+        :param list links: The conflict, obstruction, and resolution links.
+        :param ModelIndex index: An index of the model, if one was already built.
+        """
+        self.index = index if index is not None else ModelIndex(roots, links)
+        # agent key -> first agent object seen; agent key -> node id -> goals it performs;
+        # goal node id -> its agents.
+        self.agents = {}
+        self.goals_by_agent = {}
+        self.agents_by_goal = {}
+        # agent key -> operations it performs, without duplicates.
+        self.operations_by_agent = {}
+        # node id -> leaf goal, and node id -> leaf goal nobody performs, in discovery order.
+        self.leaves = {}
+        self.uncovered_leaves = {}
+        self.load_by_type = {agent_type: 0 for agent_type in AgentType}
+        self._seen = 0
+        self._index_new()
+
+    def _index_new(self):
+        # The model index logs vertices as it adds them, so everything past the last position
+        # seen is new.
+        added = self.index.added
+        for position in range(self._seen, len(added)):
+            vertex = added[position]
+            if not isinstance(vertex, Goal):
+                continue
+            if not vertex.disjunctions:
+                self.leaves[vertex.node_id] = vertex
+                if not vertex.performs:
+                    self.uncovered_leaves[vertex.node_id] = vertex
+            for perform in vertex.performs:
+                self._record(vertex, perform)
+        self._seen = len(added)
+
+    def _record(self, goal: Goal, perform: PerformanceLink):
+        key = agent_key(perform.agent)
+        if key not in self.agents:
+            self.agents[key] = perform.agent
+            self.goals_by_agent[key] = {}
+            self.operations_by_agent[key] = {}
+        agent = self.agents[key]
+        goals = self.goals_by_agent[key]
+        if goal.node_id not in goals:
+            goals[goal.node_id] = goal
+            self.load_by_type[agent.type] += 1
+        agents = self.agents_by_goal.setdefault(goal.node_id, [])
+        if agent not in agents:
+            agents.append(agent)
+        if perform.operation is not None:
+            self.operations_by_agent[key][perform.operation.node_id] = perform.operation
+        self.uncovered_leaves.pop(goal.node_id, None)
+
+    def goals_of(self, agent: Agent):
+        """
+        Get the goals an agent performs.
+        :return list[Goal]: The goals, in the order they were indexed.
+        """
+        return list(self.goals_by_agent.get(agent_key(agent), {}).values())
+
+    def agents_of(self, goal: Goal):
+        """
+        Get the agents performing a goal.
+        :return list[Agent]: The agents, one object per name and type.
+        """
+        return self.agents_by_goal.get(goal.node_id, [])
+
+    def operations_of(self, agent: Agent):
+        """
+        Get the operations an agent performs.
+        :return list[Operation]: The operations.
+        """
+        return list(self.operations_by_agent.get(agent_key(agent), {}).values())
+
+    def load(self, agent: Agent):
+        """
+        Get the number of goals an agent performs.
+        """
+        return len(self.goals_by_agent.get(agent_key(agent), {}))
+
+    def loads(self):
+        """
+        Get the load of every agent.
+        :return dict: The agents mapped to the number of goals they perform.
+        """
+        return {agent: len(self.goals_by_agent[key]) for key, agent in self.agents.items()}
+
+    def uncovered(self):
+        """
+        Get the leaf goals that no agent performs.
+        :return list[Goal]: The goals, in discovery order.
+        """
+        return list(self.uncovered_leaves.values())
+
+    def is_covered(self, goal: Goal):
+        """
+        Whether at least one agent performs a goal.
+        """
+        return goal.node_id in self.agents_by_goal
+
+    def coverage(self):
+        """
+        Get the share of leaf goals that some agent performs.
+        :return float: A number between 0 and 1; 1 for a model without leaf goals.
+        """
+        if not self.leaves:
+            return 1.0
+        return 1 - len(self.uncovered_leaves) / len(self.leaves)
+
+    def add_perform(self, goal: Goal, agent: Agent, operation: Operation or None = None):
+        """
+        Add a performance link to a goal and index it.
+        :param Goal goal: The goal.
+        :param Agent agent: The agent performing it.
+        :param Operation operation: The operation, if any.
+        :return PerformanceLink: The new link.
+        """
+        perform = PerformanceLink(agent, operation)
+        goal.performs.append(perform)
+        self._record(goal, perform)
+        return perform
+
+    def add_refinement(self, parent: Vertex, refinement: Refinement):
+        """
+        Append a refinement to a goal or obstacle and index the goals it brings in.
+        :param Vertex parent: The refined goal or obstacle.
+        :param Refinement refinement: The new refinement.
+        """
+        self.index.add_refinement(parent, refinement)
+        self.leaves.pop(parent.node_id, None)
+        self.uncovered_leaves.pop(parent.node_id, None)
+        self._index_new()
+
+    def add_child(self, refinement: Refinement, child: Vertex):
+        """
+        Append a child to a refinement and index the goals it brings in.
+        :param Refinement refinement: The refinement.
+        :param Vertex child: The new child.
+        """
+        self.index.add_child(refinement, child)
+        self._index_new()
+
+    def summary(self):
+        """
+        Summarize coverage and load.
+        :return dict: The numbers of leaf goals, uncovered leaf goals, agents, and goals
+            performed by each agent type.
+        """
+        return {
+            "leaf_goals": len(self.leaves),
+            "uncovered": len(self.uncovered_leaves),
+            "agents": len(self.agents),
+            "software_load": self.load_by_type[AgentType.SOFTWARE_AGENT],
+            "environment_load": self.load_by_type[AgentType.ENVIRONMENT_AGENT],
+        }
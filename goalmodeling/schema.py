@@ -5,6 +5,7 @@ Author(s): ateeq@cmu.edu
 2024-09-02: Minor cleanup; AS
 2024-08-03: Initial version; AS.
 """
+import re
 from enum import IntEnum
 
 NODE_COUNT = 0
@@ -21,6 +22,86 @@ def _get_new_node_id():
     return current_val
 
 
+def _reserve_node_ids(count: int):
+    """
+    Used internally to set aside a block of consecutive node ids.
+    :param int count: The number of ids.
+    :return int: The first id of the block.
+    """
+    global NODE_COUNT
+    first = NODE_COUNT
+    NODE_COUNT += count
+    return first
+
+
+# Mermaid entity codes for the characters that end or break a label. HTML and markdown in names
+# are left alone, as they are how labels are styled. A label between double quotes only needs
+# the quote and line breaks escaped; a bare label, like that of an agent, also ends at brackets,
+# parentheses, and braces. In both, a # starting something like an entity code, such as "#1;",
+# is escaped itself so Mermaid shows it as written.
+_ESCAPES = {'"': "#quot;", "\r\n": "<br>", "\n": "<br>", "\r": "<br>", "#": "#35;",
+            "[": "#91;", "]": "#93;", "(": "#40;", ")": "#41;", "{": "#123;", "}": "#125;"}
+_QUOTED_UNSAFE = re.compile(r'"|\r\n|[\r\n]|#(?=\w+;)')
+_BARE_UNSAFE = re.compile(r'"|\r\n|[\r\n\[\](){}]|#(?=\w+;)')
+
+
+def _escape(match):
+    return _ESCAPES[match.group()]
+
+
+def escape_label(text: str, quoted: bool = True):
+    """
+    Escape the characters of a label that Mermaid would read as the end of the label or line.
+    :param str text: The label text.
+    :param bool quoted: True for a label between double quotes, False for a bare label.
+    :return str: The text with those characters replaced by Mermaid entity codes.
+    """
+    unsafe = _QUOTED_UNSAFE if quoted else _BARE_UNSAFE
+    if unsafe.search(text) is None:
+        return text
+    return unsafe.sub(_escape, text)
+
+
+def _label(vertex, shape: str, text: str, quoted: bool = True):
+    """
+    Used internally to draw a vertex as its node id followed by a shape holding an escaped label.
+    The result is kept on the vertex and reused until its node id, shape, or text changes.
+    :param str shape: The shape, with {} where the label goes.
+    :return str: The Mermaid js definition of the vertex.
+    """
+    cached = vertex._label
+    if cached is not None and cached[0] is text and cached[1] is shape and cached[2] == vertex.node_id:
+        return cached[3]
+    escaped = text
+    if not quoted or '"' in text or "\n" in text or "\r" in text or "#" in text:
+        escaped = escape_label(text, quoted)
+    diagram = f"node{vertex.node_id}" + shape.format(escaped)
+    vertex._label = (text, shape, vertex.node_id, diagram)
+    return diagram
+
+
+def annotation_diagram(vertex):
+    """
+    Get the dashed note drawn next to a vertex with an annotation, kept on the vertex and reused
+    until its node id or annotation changes.
+    :param Vertex vertex: The vertex.
+    :return str: The Mermaid js definition of the note and its link, or "" without an annotation.
+    """
+    annotation = vertex.annotation
+    if not annotation:
+        return ""
+    cached = vertex._annotation_label
+    if cached is not None and cached[0] is annotation and cached[1] == vertex.node_id:
+        return cached[2]
+    node_id = f"node{vertex.node_id}"
+    text = annotation
+    if '"' in text or "\n" in text or "\r" in text or "#" in text:
+        text = escape_label(text)
+    diagram = f'annotation{node_id}["{text}"]:::stroke -.- {node_id}\n'
+    vertex._annotation_label = (annotation, vertex.node_id, diagram)
+    return diagram
+
+
 class VertexType(IntEnum):
     """
     The different types of vertices that may exist in a refinement graph.
@@ -117,11 +198,18 @@ class Vertex:
     """
     The base class for vertices in a refinement graph.
     """
+    # The last Mermaid definitions drawn for the vertex and its annotation, with what they were
+    # drawn from; see _label and annotation_diagram.
+    _label = None
+    _annotation_label = None
+
     def __init__(self, vertex_type: VertexType, leaf=False, annotation: str = ""):
         self.vertex_type = vertex_type
         self.node_id = _get_new_node_id()
         self.leaf = leaf
         self.annotation = annotation
+        self._label = None
+        self._annotation_label = None
 
     def get_node_id(self):
         """
@@ -131,21 +219,25 @@ class Vertex:
         """
         return f"node{self.node_id}"
 
-    def to_tree(self, visited=set()):
+    def to_tree(self, visited=set(), scope: set = None, collapsed: dict = None, check=None):
         if self.node_id in visited:
             return ""
         else:
             visited.add(self.node_id)
 
-        if self.annotation:
-            return (f'annotation{self.get_node_id()}["{self.annotation}"]:::stroke'
-                    f' -.- {self.get_node_id()}\n')
-        return ""
+        return annotation_diagram(self)
 
     def to_string(self):
         pass
 
 
+def _summary_diagram(vertex: Vertex, summary: str):
+    """
+    Used internally to draw a collapsed subtree as a dashed box refining the vertex.
+    """
+    return f'summary{vertex.get_node_id()}["{escape_label(summary)}"]:::stroke -.-> {vertex.to_string()}\n'
+
+
 class Edge:
     """
     The base class for edges in a refinement graph.
@@ -173,7 +265,7 @@ class Operation(Vertex):
         self.category = category
 
     def to_string(self):
-        return f'{self.get_node_id()}(["{self.name}"])'
+        return _label(self, '(["{}"])', self.name)
 
 
 class Agent(Vertex):
@@ -200,8 +292,8 @@ class Agent(Vertex):
         Return the agent represented as a person icon in Mermaid.
         :return str: The Mermaid js diagram definition for the agent returned as a hexagon.
         """
-        figure = "fa:fa-person " if self.type == AgentType.ENVIRONMENT_AGENT else ""
-        return f'{self.get_node_id()}' + "{{" + f'{figure}{self.name}' + "}}"
+        shape = "{{{{fa:fa-person {}}}}}" if self.type == AgentType.ENVIRONMENT_AGENT else "{{{{{}}}}}"
+        return _label(self, shape, self.name, quoted=False)
 
 
 class PerformanceLink(Edge):
@@ -253,7 +345,7 @@ class DomainProperty(Vertex):
         Return the domain property represented as a trapezoid in Mermaid.
         :return str: The Mermaid js diagram definition for the domain property as a trapezoid.
         """
-        return f'{self.get_node_id()}[/"{self.name}"\\]'
+        return _label(self, '[/"{}"\\]', self.name)
 
 
 class Goal(Vertex):
@@ -266,32 +358,47 @@ class Goal(Vertex):
                  performs: list[PerformanceLink] or None = None,
                  refinements: list[Refinement] or None = None,
                  leaf: bool = False,
-                 annotation: str = ""):
+                 annotation: str = "",
+                 categories: list[GoalCategory] or None = None):
         super().__init__(VertexType.NODE_TYPE_GOAL, leaf, annotation)
         self.name = name
         self.goal_type = goal_type
         self.performs = performs if performs else []
         self.disjunctions = refinements if refinements else []
+        self.categories = list(categories) if categories else []
 
     def to_string(self):
         """
         Return the goal represented as a right-leaning parallelogram in Mermaid.
         :return str: The Mermaid js diagram definition for the goal.
         """
-        return f'{self.get_node_id()}[/"{self.name}"/]'  # [/"name"/]
+        return _label(self, '[/"{}"/]', self.name)  # [/"name"/]
 
-    def to_tree(self, visited=set()):
+    def to_tree(self, visited=set(), scope: set = None, collapsed: dict = None, check=None):
         """
         Generate the Mermaid js diagram definition for the refinement graph with this goal as root.
+        :param set visited: Node ids already in the diagram.
+        :param set scope: If given, only refinements and children whose node ids are in scope are included.
+        :param dict collapsed: Node ids whose refinements are drawn as one summary node, mapped to the summary text.
+        :param check: If given, called without arguments before each goal and obstacle is drawn; it may raise to stop.
         :return str: The Mermaid diagram definition.
         """
         if self.node_id in visited:
             return ""
+        if check is not None:
+            check()
 
         node_diagram = self.to_string()
         result = super().to_tree(visited)
 
-        for disjunction in self.disjunctions:
+        disjunctions = self.disjunctions
+        if collapsed is not None and self.node_id in collapsed:
+            result += _summary_diagram(self, collapsed[self.node_id])
+            disjunctions = []
+
+        for disjunction in disjunctions:
+            if scope is not None and disjunction.node_id not in scope:
+                continue
             current_disjunction = disjunction.get_node_id()
             current_disjunction_diagram = f'{current_disjunction}((" "))'
             filled = ":::filled" if disjunction.complete else ""
@@ -308,13 +415,15 @@ class Goal(Vertex):
             result += "\n"
 
             for child in disjunction.children:
+                if scope is not None and child.node_id not in scope:
+                    continue
                 child_diagram = child.to_string()
                 bold = ":::bold" if child.leaf else ""
                 link_to_refinement = f'{child_diagram}{bold} --- {current_disjunction}'
                 result += link_to_refinement
                 result += "\n"
 
-                result += child.to_tree(visited)
+                result += child.to_tree(visited, scope, collapsed, check)
 
             result += "\n"
 
@@ -357,20 +466,33 @@ class Obstacle(Vertex):
         Return the obstacle represented as a left-leaning parallelogram in Mermaid.
         :return str: The Mermaid js diagram definition for the obstacle.
         """
-        return f'{self.get_node_id()}[\\"{self.name}"\\]'
+        return _label(self, '[\\"{}"\\]', self.name)
 
-    def to_tree(self, visited=set()):
+    def to_tree(self, visited=set(), scope: set = None, collapsed: dict = None, check=None):
         """
         Generate the Mermaid js diagram definition for the refinement graph with this obstacle as root.
+        :param set visited: Node ids already in the diagram.
+        :param set scope: If given, only refinements and children whose node ids are in scope are included.
+        :param dict collapsed: Node ids whose refinements are drawn as one summary node, mapped to the summary text.
+        :param check: If given, called without arguments before each goal and obstacle is drawn; it may raise to stop.
         :return str: The Mermaid diagram definition.
         """
         if self.node_id in visited:
             return ""
+        if check is not None:
+            check()
 
         node_diagram = self.to_string()
         result = super().to_tree(visited)
 
-        for disjunction in self.refinements:
+        disjunctions = self.refinements
+        if collapsed is not None and self.node_id in collapsed:
+            result += _summary_diagram(self, collapsed[self.node_id])
+            disjunctions = []
+
+        for disjunction in disjunctions:
+            if scope is not None and disjunction.node_id not in scope:
+                continue
             current_disjunction = disjunction.get_node_id()
             current_disjunction_diagram = f'{current_disjunction}((" "))'
             filled = ":::filled" if disjunction.complete else ""
@@ -380,13 +502,15 @@ class Obstacle(Vertex):
             result += "\n"
 
             for child in disjunction.children:
+                if scope is not None and child.node_id not in scope:
+                    continue
                 child_diagram = child.to_string()
                 bold = ":::bold" if child.leaf else ""
                 link_to_refinement = f'{child_diagram}{bold} --- {current_disjunction}'
                 result += link_to_refinement
                 result += "\n"
 
-                result += child.to_tree(visited)
+                result += child.to_tree(visited, scope, collapsed, check)
 
             result += "\n"
 
@@ -470,8 +594,9 @@ class BehavioralGoal(Goal):
                  performs: list[PerformanceLink] or None = None,
                  refinements: list[Refinement] or None = None,
                  leaf: bool = False,
-                 annotation: str = ""):
-        super().__init__(name, GoalType.BEHAVIORAL_GOAL, performs, refinements, leaf, annotation)
+                 annotation: str = "",
+                 categories: list[GoalCategory] or None = None):
+        super().__init__(name, GoalType.BEHAVIORAL_GOAL, performs, refinements, leaf, annotation, categories)
 
 
 class AchieveGoal(BehavioralGoal):
@@ -483,7 +608,8 @@ class AchieveGoal(BehavioralGoal):
                  performs: list[PerformanceLink] or None = None,
                  refinements: list[Refinement] or None = None,
                  leaf: bool = False,
-                 annotation: str = ""):
+                 annotation: str = "",
+                 categories: list[GoalCategory] or None = None):
         """
         Initialize the achievement goal.
         :param str name: The name of the goal.
@@ -491,15 +617,16 @@ class AchieveGoal(BehavioralGoal):
         :param list[Refinement] refinements: A list of refinements of the goal.
         :param bool leaf: True will result the goal's border being bold in the graph.
         :param str annotation: An optional annotation.
+        :param list[GoalCategory] categories: The categories the goal belongs to.
         """
-        super().__init__(name, performs, refinements, leaf, annotation)
+        super().__init__(name, performs, refinements, leaf, annotation, categories)
         self.goal_type = AchieveGoal
 
     def to_string(self):
         """
         Return the achievement goal represented as a right-leaning parallelogram in Mermaid.
         """
-        return f'{self.get_node_id()}[/"Achieve[{self.name}]"/]'  # [/Achieve[name]/]
+        return _label(self, '[/"Achieve[{}]"/]', self.name)  # [/Achieve[name]/]
 
 
 class CeaseGoal(AchieveGoal):
@@ -511,7 +638,8 @@ class CeaseGoal(AchieveGoal):
                  performs: list[PerformanceLink] or None = None,
                  refinements: list[Refinement] or None = None,
                  leaf: bool = False,
-                 annotation: str = ""):
+                 annotation: str = "",
+                 categories: list[GoalCategory] or None = None):
         """
         Initialize the cease goal.
         :param str name: The name of the goal.
@@ -519,15 +647,16 @@ class CeaseGoal(AchieveGoal):
         :param list[Refinement] refinements: A list of refinements of the goal.
         :param bool leaf: True will result the goal's border being bold in the graph.
         :param str annotation: An optional annotation.
+        :param list[GoalCategory] categories: The categories the goal belongs to.
         """
-        super().__init__(name, performs, refinements, leaf, annotation)
+        super().__init__(name, performs, refinements, leaf, annotation, categories)
         self.goal_type = CeaseGoal
 
     def to_string(self):
         """
         Return the cease goal represented as a right-leaning parallelogram in Mermaid.
         """
-        return f'{self.get_node_id()}[/"Cease[{self.name}]"/]'  # [/Cease[name]/]
+        return _label(self, '[/"Cease[{}]"/]', self.name)  # [/Cease[name]/]
 
 
 class MaintainGoal(BehavioralGoal):
@@ -539,7 +668,8 @@ class MaintainGoal(BehavioralGoal):
                  performs: list[PerformanceLink] or None = None,
                  refinements: list[Refinement] or None = None,
                  leaf: bool = False,
-                 annotation: str = ""):
+                 annotation: str = "",
+                 categories: list[GoalCategory] or None = None):
         """
         Initialize the maintenance goal.
         :param str name: The name of the goal.
@@ -547,15 +677,16 @@ class MaintainGoal(BehavioralGoal):
         :param list[Refinement] refinements: A list of refinements of the goal.
         :param bool leaf: True will result the goal's border being bold in the graph.
         :param str annotation: An optional annotation.
+        :param list[GoalCategory] categories: The categories the goal belongs to.
         """
-        super().__init__(name, performs, refinements, leaf, annotation)
+        super().__init__(name, performs, refinements, leaf, annotation, categories)
         self.goal_type = MaintainGoal
 
     def to_string(self):
         """
         Return the maintenance goal represented as a right-leaning parallelogram in Mermaid.
         """
-        return f'{self.get_node_id()}[/"Maintain[{self.name}]"/]'  # [/Maintain[name]/]
+        return _label(self, '[/"Maintain[{}]"/]', self.name)  # [/Maintain[name]/]
 
 
 class AvoidGoal(MaintainGoal):
@@ -567,7 +698,8 @@ class AvoidGoal(MaintainGoal):
                  performs: list[PerformanceLink] or None = None,
                  refinements: list[Refinement] or None = None,
                  leaf: bool = False,
-                 annotation: str = ""):
+                 annotation: str = "",
+                 categories: list[GoalCategory] or None = None):
         """
         Initialize the avoid goal.
         :param str name: The name of the goal.
@@ -575,15 +707,16 @@ class AvoidGoal(MaintainGoal):
         :param list[Refinement] refinements: A list of refinements of the goal.
         :param bool leaf: True will result the goal's border being bold in the graph.
         :param str annotation: An optional annotation.
+        :param list[GoalCategory] categories: The categories the goal belongs to.
         """
-        super().__init__(name, performs, refinements, leaf, annotation)
+        super().__init__(name, performs, refinements, leaf, annotation, categories)
         self.goal_type = AvoidGoal
 
     def to_string(self):
         """
         Return the avoid goal represented as a right-leaning parallelogram in Mermaid.
         """
-        return f'{self.get_node_id()}[/"Avoid[{self.name}]"/]'  # [/Avoid[name]/]
+        return _label(self, '[/"Avoid[{}]"/]', self.name)  # [/Avoid[name]/]
 
 
 class SoftGoal(Goal):
@@ -595,7 +728,8 @@ class SoftGoal(Goal):
                  performs: list[PerformanceLink] or None = None,
                  refinements: list[Refinement] or None = None,
                  leaf: bool = False,
-                 annotation: str = ""):
+                 annotation: str = "",
+                 categories: list[GoalCategory] or None = None):
         """
         Initialize the soft goal.
         :param str name: The name of the goal.
@@ -603,8 +737,9 @@ class SoftGoal(Goal):
         :param list[Refinement] refinements: A list of refinements of the goal.
         :param bool leaf: True will result the goal's border being bold in the graph.
         :param str annotation: An optional annotation.
+        :param list[GoalCategory] categories: The categories the goal belongs to.
         """
-        super().__init__(name, GoalType.SOFT_GOAL, performs, refinements, leaf, annotation)
+        super().__init__(name, GoalType.SOFT_GOAL, performs, refinements, leaf, annotation, categories)
 
 
 def diagram_startup():
@@ -628,11 +763,17 @@ classDef stroke stroke-dasharray: 5 5,fill-opacity:0.0,text-align:left\n
     """
 
 
+# Size of each piece of the serialized graph handed to zlib between calls to check.
+COMPRESS_CHUNK_SIZE = 64 * 1024
+
+
 def generate_pako_link(
         text: str,
         mode: str = "view",
         host: str = "https://mermaid.live",
-        config: dict = {"theme": "neutral"}):
+        config: dict = {"theme": "neutral"},
+        profile=None,
+        check=None):
     """
     Generate a Mermaid pako link for the given graph represented as text.
     :param str text:
@@ -641,48 +782,149 @@ def generate_pako_link(
     :param dict config: Additional configuration. The field theme can be
      "default", "neutral", "forest", "dark", etc.
     The default is neutral and may be best for refinement graphs.
+    :param RenderProfile profile: If given, the encoding, compression, and base64 phases are timed
+     and the sizes counted into it.
+    :param check: If given, called without arguments between chunks of the compression; it may
+     raise to stop the work, e.g. when the caller was cancelled.
     :return str: pako link
     """
     import base64
     import json
     import zlib
 
+    if profile is not None:
+        profile.start("encode")
     graph = {"code": text, "mermaid": config}
     output = json.dumps(graph)
+    payload = output.encode('utf-8')
+    if profile is not None:
+        profile.start("compress")
     compress = zlib.compressobj(9, zlib.DEFLATED, 15, 8, zlib.Z_DEFAULT_STRATEGY)
-    compressed = compress.compress(output.encode('utf-8')) + compress.flush()
+    if check is None:
+        compressed = compress.compress(payload) + compress.flush()
+    else:
+        pieces = []
+        for start in range(0, len(payload), COMPRESS_CHUNK_SIZE):
+            check()
+            pieces.append(compress.compress(payload[start:start + COMPRESS_CHUNK_SIZE]))
+        pieces.append(compress.flush())
+        compressed = b"".join(pieces)
+    if profile is not None:
+        profile.start("base64")
     pako = base64.b64encode(compressed, b"-_").decode("utf-8")
     url = f"{host}/{mode}#pako:{pako}"
+    if profile is not None:
+        profile.stop()
+        profile.count("pako_links")
+        profile.count("payload_bytes", len(payload))
+        profile.count("compressed_bytes", len(compressed))
+        profile.count("link_bytes", len(url))
     return url
 
 
-def generate_graph(goals: list[Goal], links: list[ObstructionLink or ConflictLink or ResolutionLink] = None):
+def _link_in_scope(link, scope: set):
     """
-    Generate a Mermaid js diagram for the given goals and obstructions.
-    :param list[Goal] goals: The goals in the graph.
-    :param list[ObstructionLink or ConflictLink or ResolutionLink] links: The conflicts, obstructions, and resolutions in the graph.
+    Used internally to check whether both ends of a link are in scope.
     """
-    output = diagram_startup()
+    if type(link) == ConflictLink:
+        return link.goal1.node_id in scope and link.goal2.node_id in scope
+    return link.goal.node_id in scope and link.obstacle.node_id in scope
 
-    v = set()
 
+def draw_roots(goals: list[Goal], v: set, scope: set = None, collapsed: dict = None, check=None):
+    """
+    Draw the trees of root goals, one root at a time, without the diagram startup and teardown.
+    :param list[Goal] goals: The root goals.
+    :param set v: The vertices already drawn, updated with those drawn here.
+    :param set scope: If given, only vertices whose node ids are in scope are included.
+    :param dict collapsed: The collapsed subtrees, as planned by LevelOfDetail.plan.
+    :param check: If given, called without arguments before each goal and obstacle; it may raise to stop.
+    :return str: The diagram text.
+    """
+    output = ""
     for goal in goals:
-        output += goal.to_tree(v)
+        if check is not None:
+            check()
+        output += goal.to_tree(v, scope, collapsed, check)
+    return output
 
-    if links is None:
-        links = []
 
+def draw_links(links: list, v: set, scope: set = None, collapsed: dict = None, check=None):
+    """
+    Draw links, with the trees of the obstacles and goals they start from, one link at a time.
+    :param list links: The conflicts, obstructions, and resolutions.
+    :param set v: The vertices already drawn, updated with those drawn here.
+    :param set scope: If given, only links with both ends in scope are included.
+    :param dict collapsed: The collapsed subtrees, as planned by LevelOfDetail.plan.
+    :param check: If given, called without arguments before each link, goal, and obstacle; it may raise to stop.
+    :return tuple: The diagram text and the number of links drawn.
+    """
+    output = ""
+    drawn = len(links)
     for link in links:
+        if check is not None:
+            check()
+        if scope is not None and not _link_in_scope(link, scope):
+            drawn -= 1
+            continue
         if type(link) == ObstructionLink:
-            output += link.obstacle.to_tree(v)
+            output += link.obstacle.to_tree(v, scope, collapsed, check)
         elif type(link) == ResolutionLink:
-            output += link.goal.to_tree(v)
+            output += link.goal.to_tree(v, scope, collapsed, check)
 
         output += link.to_string()
         output += "\n"
+    return output, drawn
+
+
+def generate_graph(goals: list[Goal],
+                   links: list[ObstructionLink or ConflictLink or ResolutionLink] = None,
+                   scope: set = None,
+                   lod=None,
+                   profile=None,
+                   check=None):
+    """
+    Generate a Mermaid js diagram for the given goals and obstructions.
+    :param list[Goal] goals: The goals in the graph.
+    :param list[ObstructionLink or ConflictLink or ResolutionLink] links: The conflicts, obstructions, and resolutions in the graph.
+    :param set scope: If given, only vertices whose node ids are in scope, and links between them, are included.
+    :param LevelOfDetail lod: If given, subtrees beyond its depth or size limits are collapsed into summary nodes.
+    :param RenderProfile profile: If given, the phases of the render are timed and its counters recorded into it.
+    :param check: If given, called without arguments before each goal, obstacle, and link; it may raise to
+     stop the render, e.g. when the caller was cancelled.
+    """
+    output = diagram_startup()
+
+    if profile is None:
+        v = set()
+    else:
+        v = profile.visited_set()
+        profile.start("plan")
+
+    if links is None:
+        links = []
+
+    collapsed = None
+    if lod is not None:
+        collapsed, visible = lod.plan(goals, links)
+        scope = visible if scope is None else scope & visible
+
+    if profile is not None:
+        profile.start("tree")
+
+    output += draw_roots(goals, v, scope, collapsed, check)
+
+    if profile is not None:
+        profile.start("links")
+
+    drawn_links, drawn = draw_links(links, v, scope, collapsed, check)
+    output += drawn_links
 
     output += diagram_teardown()
 
+    if profile is not None:
+        profile.finish_render(v, output, drawn)
+
     return output
 
 
@@ -0,0 +1,245 @@
+"""
+An inverted index for finding vertices by name, annotation, kind, category, leaf flag, and agent type.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+import heapq
+import re
+from bisect import bisect_left
+
+from .schema import (
+    Vertex,
+    Goal,
+    Obstacle,
+    Refinement,
+    Agent,
+    AgentType,
+    GoalCategory,
+    PerformanceLink,
+)
+from .index import ModelIndex, refinements_of
+
+_TAG = re.compile(r"<[^>]*>")
+_WORD = re.compile(r"[0-9A-Za-z]+")
+_CAMEL = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+
+
+def tokenize(text: str):
+    """
+    Split text into lowercase tokens, dropping HTML tags. A CamelCase word gives both the whole
+    word and its parts.
+    :param str text: The text.
+    :return list[str]: The tokens, without duplicates.
+    """
+    if not text:
+        return []
+    tokens = {}
+    for word in _WORD.findall(_TAG.sub(" ", text)):
+        tokens[word.lower()] = None
+        parts = _CAMEL.split(word)
+        if len(parts) > 1:
+            for part in parts:
+                tokens[part.lower()] = None
+    return list(tokens)
+
+
+class SearchIndex:
+    """
+    Finds goals, obstacles, and domain properties without scanning the model.
+
+    Every token of a name or annotation has a posting set of node ids, and a sorted list of the
+    distinct tokens answers prefix queries by bisection. Kinds, goal categories, leaf flags,
+    whether goals and obstacles are refined, and the types of the agents performing a goal are
+    kept as filter sets. A query intersects its
+    sets smallest first, so its cost follows the most selective condition, not the model size.
+    """
+    FIELDS = ("name", "annotation")
+
+    def __init__(self, roots: list[Vertex], links: list = None, index: ModelIndex = None):
+        """
+        Index a model.
+        :param list[Vertex] roots: The root goals.
+        :param list links: The conflict, obstruction, and resolution links.
+        :param ModelIndex index: An index of the model, if one was already built.
+        """
+        self.index = index if index is not None else ModelIndex(roots, links)
+        # field -> token -> node ids, field -> sorted distinct tokens, and field -> tokens
+        # added since the last prefix query, merged into the sorted list when one comes.
+        self.postings = {field: {} for field in self.FIELDS}
+        self.tokens = {field: [] for field in self.FIELDS}
+        self.pending = {field: [] for field in self.FIELDS}
+        # kind name -> node ids; category -> node ids; leaf flag -> node ids; whether a goal or
+        # obstacle has no refinements -> node ids; agent type -> node ids.
+        self.kinds = {}
+        self.categories = {}
+        self.leaves = {True: set(), False: set()}
+        self.unrefined = {True: set(), False: set()}
+        self.agent_types = {}
+        # node id -> indexed vertex.
+        self.vertices = {}
+        self._seen = 0
+        self.update()
+
+    def update(self):
+        """
+        Index the vertices added to the model index since the last update.
+        :return int: The number of vertices indexed.
+        """
+        added = self.index.added
+        count = 0
+        for position in range(self._seen, len(added)):
+            if self.add(added[position]):
+                count += 1
+        self._seen = len(added)
+        return count
+
+    def add(self, vertex: Vertex):
+        """
+        Index one goal, obstacle, or domain property.
+        :return bool: False when the vertex is not searchable or already indexed.
+        """
+        if isinstance(vertex, Refinement) or not hasattr(vertex, "name") or vertex.node_id in self.vertices:
+            return False
+        node_id = vertex.node_id
+        self.vertices[node_id] = vertex
+        self._add_text("name", vertex.name, node_id)
+        self._add_text("annotation", vertex.annotation, node_id)
+        for cls in type(vertex).__mro__:
+            if cls is Vertex:
+                break
+            self.kinds.setdefault(cls.__name__, set()).add(node_id)
+        self.leaves[bool(vertex.leaf)].add(node_id)
+        if isinstance(vertex, (Goal, Obstacle)):
+            self.unrefined[not refinements_of(vertex)].add(node_id)
+        if isinstance(vertex, Goal):
+            for category in vertex.categories:
+                self.categories.setdefault(category, set()).add(node_id)
+            for perform in vertex.performs:
+                self.agent_types.setdefault(perform.agent.type, set()).add(node_id)
+        return True
+
+    def _add_text(self, field: str, text: str, node_id: int):
+        postings = self.postings[field]
+        for token in tokenize(text):
+            ids = postings.get(token)
+            if ids is None:
+                postings[token] = ids = set()
+                self.pending[field].append(token)
+            ids.add(node_id)
+
+    def add_perform(self, goal: Goal, agent: Agent, operation=None):
+        """
+        Add a performance link to a goal and index the agent type.
+        :return PerformanceLink: The new link.
+        """
+        perform = PerformanceLink(agent, operation)
+        goal.performs.append(perform)
+        self.agent_types.setdefault(agent.type, set()).add(goal.node_id)
+        return perform
+
+    def add_refinement(self, parent: Vertex, refinement: Refinement):
+        """
+        Append a refinement to a goal or obstacle and index the vertices it brings in.
+        :param Vertex parent: The refined goal or obstacle.
+        :param Refinement refinement: The new refinement.
+        """
+        self.index.add_refinement(parent, refinement)
+        if parent.node_id in self.vertices:
+            self.unrefined[True].discard(parent.node_id)
+            self.unrefined[False].add(parent.node_id)
+        self.update()
+
+    def add_child(self, refinement: Refinement, child: Vertex):
+        """
+        Append a child to a refinement and index the vertices it brings in.
+        :param Refinement refinement: The refinement.
+        :param Vertex child: The new child.
+        """
+        self.index.add_child(refinement, child)
+        self.update()
+
+    def _token_ids(self, token: str, fields):
+        found = [self.postings[field].get(token) for field in fields]
+        found = [ids for ids in found if ids]
+        if len(found) == 1:
+            return found[0]
+        return set().union(*found)
+
+    def _prefix_ids(self, prefix: str, fields):
+        result = set()
+        for field in fields:
+            tokens = self.tokens[field]
+            if self.pending[field]:
+                tokens.extend(self.pending[field])
+                tokens.sort()
+                self.pending[field].clear()
+            position = bisect_left(tokens, prefix)
+            postings = self.postings[field]
+            while position < len(tokens) and tokens[position].startswith(prefix):
+                result |= postings[tokens[position]]
+                position += 1
+        return result
+
+    def search(self,
+               text: str = None,
+               prefix: str = None,
+               kind: type or str = None,
+               category: GoalCategory = None,
+               leaf: bool = None,
+               unrefined: bool = None,
+               agent_type: AgentType = None,
+               field: str = None,
+               limit: int = None):
+        """
+        Find the vertices meeting every condition given.
+        :param str text: Words that must all appear.
+        :param str prefix: A word that must start some token.
+        :param kind: A vertex class, or its name, such as AchieveGoal or "Obstacle"; subclasses match.
+        :param GoalCategory category: A category the goal belongs to.
+        :param bool leaf: Whether the vertex is marked leaf.
+        :param bool unrefined: Whether the vertex is a goal or obstacle without refinements; the
+            other vertices match neither value.
+        :param AgentType agent_type: The type of an agent performing the goal.
+        :param str field: "name" or "annotation" to search only that text, or None for both.
+        :param int limit: The most vertices returned.
+        :return list[Vertex]: The vertices, in node id order.
+        """
+        fields = self.FIELDS if field is None else (field,)
+        sets = []
+        for token in tokenize(text):
+            sets.append(self._token_ids(token, fields))
+        if prefix:
+            for token in tokenize(prefix):
+                sets.append(self._prefix_ids(token, fields))
+        if kind is not None:
+            sets.append(self.kinds.get(kind if isinstance(kind, str) else kind.__name__, set()))
+        if category is not None:
+            sets.append(self.categories.get(category, set()))
+        if leaf is not None:
+            sets.append(self.leaves[bool(leaf)])
+        if unrefined is not None:
+            sets.append(self.unrefined[bool(unrefined)])
+        if agent_type is not None:
+            sets.append(self.agent_types.get(agent_type, set()))
+
+        if not sets:
+            ids = self.vertices.keys()
+        else:
+            sets.sort(key=len)
+            ids = sets[0]
+            for other in sets[1:]:
+                if not ids:
+                    break
+                ids = ids & other
+        if limit is not None:
+            ordered = heapq.nsmallest(limit, ids)
+        else:
+            ordered = sorted(ids)
+        return [self.vertices[node_id] for node_id in ordered]
+
+    def count(self, **conditions):
+        """
+        Count the vertices a search with the same conditions would return.
+        """
+        return len(self.search(**conditions))
@@ -0,0 +1,664 @@
+"""
+Flat, columnar representation of refinement graphs with JSON and binary encodings.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+import gc
+import json
+import struct
+import sys
+from array import array
+from itertools import accumulate
+
+from . import schema
+from .schema import (
+    Vertex,
+    Goal,
+    BehavioralGoal,
+    AchieveGoal,
+    CeaseGoal,
+    MaintainGoal,
+    AvoidGoal,
+    SoftGoal,
+    Obstacle,
+    Refinement,
+    Agent,
+    Operation,
+    DomainProperty,
+    PerformanceLink,
+    ConflictLink,
+    ObstructionLink,
+    ResolutionLink,
+    EdgeType,
+    GoalType,
+    AgentType,
+    OperationCategory,
+    GoalCategory,
+)
+
+FORMAT_NAME = "goalmodeling"
+FORMAT_VERSION = 1
+BINARY_MAGIC = b"GMDL"
+# Version 2 of the binary format adds the goal categories section; version 1 is still read.
+BINARY_VERSION = 2
+BINARY_SECTIONS = {1: 11, 2: 12}
+
+# The position of a class in KINDS is its kind code in a ModelTable.
+KINDS = (
+    Goal,
+    BehavioralGoal,
+    AchieveGoal,
+    CeaseGoal,
+    MaintainGoal,
+    AvoidGoal,
+    SoftGoal,
+    Obstacle,
+    Refinement,
+    Agent,
+    Operation,
+    DomainProperty,
+)
+KIND_CODES = {cls: code for code, cls in enumerate(KINDS)}
+KIND_NAMES = tuple(cls.__name__ for cls in KINDS)
+# Kind codes by role: goals, what a goal or obstacle lists (refinements), and what a refinement
+# lists (goals, obstacles, and domain properties).
+GOAL_CODES = frozenset(code for code, cls in enumerate(KINDS) if issubclass(cls, Goal))
+REFINED_CODES = GOAL_CODES | {KIND_CODES[Obstacle]}
+PART_CODES = REFINED_CODES | {KIND_CODES[DomainProperty]}
+
+LINK_CLASSES = {
+    EdgeType.CONFLICT: ConflictLink,
+    EdgeType.OBSTRUCTION: ObstructionLink,
+    EdgeType.RESOLUTION: ResolutionLink,
+}
+
+
+def kind_code(vertex: Vertex):
+    """
+    Get the kind code of a vertex, using the nearest known base class for subclasses.
+    :param Vertex vertex: The vertex.
+    :return int: The index of the vertex class in KINDS.
+    """
+    cls = type(vertex)
+    code = KIND_CODES.get(cls)
+    if code is not None:
+        return code
+    for base in cls.__mro__:
+        if base in KIND_CODES:
+            return KIND_CODES[base]
+    raise TypeError(f"Cannot serialize vertex of type {cls.__name__}")
+
+
+def _link_endpoints(link):
+    if link.edge_type == EdgeType.CONFLICT:
+        return link.goal1, link.goal2
+    return link.goal, link.obstacle
+
+
+class _Template:
+    """
+    Used internally by ModelTable.build: the attributes of a vertex kind, taken from one vertex
+    made by its constructor, and which of them are lists or come from the attr column.
+    """
+    # Kind -> the attribute holding the attr column and how to convert it.
+    ATTRIBUTES = {
+        Refinement: ("complete", bool),
+        Agent: ("type", AgentType),
+        Operation: ("category", OperationCategory),
+        Goal: ("goal_type", GoalType),
+    }
+
+    def __init__(self, cls):
+        # The sample must not use up a node id.
+        count = schema.NODE_COUNT
+        if cls is Refinement:
+            sample = Refinement(True, [])
+        elif cls is Agent:
+            sample = Agent("", AgentType(0))
+        elif cls is Operation:
+            sample = Operation("", OperationCategory(0))
+        elif cls is DomainProperty:
+            sample = DomainProperty("", False)
+        elif cls is Obstacle:
+            sample = Obstacle("")
+        elif cls is Goal:
+            sample = Goal("", GoalType(0))
+        else:
+            sample = cls("")
+        schema.NODE_COUNT = count
+        self.cls = cls
+        self.fields = vars(sample)
+        self.lists = [key for key, value in self.fields.items() if type(value) is list]
+        self.named = "name" in self.fields
+        self.attribute, convert = self.ATTRIBUTES.get(cls, (None, None))
+        self.convert = None
+        if convert is not None:
+            values = {}
+
+            def cached(value):
+                result = values.get(value)
+                if result is None:
+                    result = values[value] = convert(value)
+                return result
+            self.convert = cached
+
+
+class ModelTable:
+    """
+    A refinement graph stored as parallel columns indexed by vertex position.
+
+    Children are stored in compressed sparse row form: the children of vertex i are
+    child_index[child_offsets[i]:child_offsets[i + 1]]. For a goal these are its refinements,
+    for an obstacle its refinements, and for a refinement the refined children.
+    """
+    def __init__(self):
+        self.kind = []
+        self.name = []
+        self.annotation = []
+        self.leaf = []
+        # Refinement: complete; Agent: AgentType; Operation: OperationCategory; Goal: GoalType.
+        self.attr = []
+        self.node_id = []
+        self.child_offsets = [0]
+        self.child_index = []
+        # Triples of (goal, agent, operation or -1).
+        self.performs = []
+        # Triples of (EdgeType, first, second) in constructor argument order.
+        self.links = []
+        self.roots = []
+        # Goal position -> GoalCategory values, only for goals that have categories.
+        self.categories = {}
+
+    def __len__(self):
+        return len(self.kind)
+
+    def children(self, index: int):
+        """
+        Get the positions of the children of a vertex.
+        :param int index: The vertex position.
+        :return list[int]: The children positions.
+        """
+        return self.child_index[self.child_offsets[index]:self.child_offsets[index + 1]]
+
+    def add_vertex(self, kind: int, name: str = "", annotation: str = "", leaf: bool = False,
+                   attr: int = 0, node_id: int = -1):
+        """
+        Append a vertex without children. Children are added with end_children.
+        :return int: The position of the new vertex.
+        """
+        self.kind.append(kind)
+        self.name.append(name)
+        self.annotation.append(annotation)
+        self.leaf.append(1 if leaf else 0)
+        self.attr.append(int(attr))
+        self.node_id.append(node_id)
+        return len(self.kind) - 1
+
+    def end_children(self, children: list[int]):
+        """
+        Record the children of the next vertex in position order.
+        :param list[int] children: The children positions.
+        """
+        self.child_index.extend(children)
+        self.child_offsets.append(len(self.child_index))
+
+    def to_dict(self):
+        data = {
+            "format": FORMAT_NAME,
+            "version": FORMAT_VERSION,
+            "kind": [KIND_NAMES[k] for k in self.kind],
+            "name": self.name,
+            "annotation": self.annotation,
+            "leaf": self.leaf,
+            "attr": self.attr,
+            "node_id": self.node_id,
+            "child_offsets": self.child_offsets,
+            "child_index": self.child_index,
+            "performs": [list(p) for p in self.performs],
+            "links": [[int(t), a, b] for t, a, b in self.links],
+            "roots": self.roots,
+        }
+        if self.categories:
+            data["categories"] = {str(p): [int(c) for c in v] for p, v in self.categories.items()}
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        if not isinstance(data, dict):
+            raise ValueError("Not a goalmodeling model: expected a JSON object")
+        if data.get("format") != FORMAT_NAME:
+            raise ValueError("Not a goalmodeling model")
+        if data.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported model version {data.get('version')}")
+        codes = {name: code for code, name in enumerate(KIND_NAMES)}
+        table = cls()
+        try:
+            table.kind = [codes[k] for k in data["kind"]]
+        except KeyError as e:
+            raise ValueError(f"Unknown vertex kind {e.args[0]}") from None
+        count = len(table.kind)
+        table.name = list(data.get("name") or [""] * count)
+        table.annotation = list(data.get("annotation") or [""] * count)
+        table.leaf = list(data.get("leaf") or [0] * count)
+        table.attr = list(data.get("attr") or [0] * count)
+        table.node_id = list(data.get("node_id") or [-1] * count)
+        table.child_offsets = list(data.get("child_offsets") or [0] * (count + 1))
+        table.child_index = list(data.get("child_index") or [])
+        table.performs = [tuple(p) for p in data.get("performs") or []]
+        table.links = [(EdgeType(t), a, b) for t, a, b in data.get("links") or []]
+        table.roots = list(data.get("roots") or [])
+        table.categories = {int(p): list(v) for p, v in (data.get("categories") or {}).items()}
+        table.check()
+        return table
+
+    def check(self):
+        """
+        Check that the columns agree in length, that every position is in range, and that every
+        position holds a vertex of the kind its place needs.
+        :raises ValueError: If the table is malformed.
+        """
+        count = len(self.kind)
+        for column in (self.name, self.annotation, self.leaf, self.attr, self.node_id):
+            if len(column) != count:
+                raise ValueError("Model columns differ in length")
+        if len(self.child_offsets) != count + 1 or self.child_offsets[-1] != len(self.child_index):
+            raise ValueError("Model child offsets are inconsistent")
+        positions = list(self.child_index) + list(self.roots)
+        positions += [p for triple in self.performs for p in triple if p != -1]
+        positions += [p for _, a, b in self.links for p in (a, b)]
+        positions += list(self.categories)
+        if positions and (min(positions) < 0 or max(positions) >= count):
+            raise ValueError("Model refers to a vertex that does not exist")
+        self._check_kinds()
+
+    def _check_kinds(self):
+        kind = self.kind
+        offsets = self.child_offsets
+        child_index = self.child_index
+        refinement = KIND_CODES[Refinement]
+        for i, code in enumerate(kind):
+            start, end = offsets[i], offsets[i + 1]
+            if start > end:
+                raise ValueError("Model child offsets are inconsistent")
+            if start == end:
+                continue
+            if code == refinement:
+                allowed = PART_CODES
+            elif code in REFINED_CODES:
+                allowed = (refinement,)
+            else:
+                raise ValueError(f"{KIND_NAMES[code]} at position {i} cannot have children")
+            for child in child_index[start:end]:
+                if kind[child] not in allowed:
+                    raise ValueError(f"{KIND_NAMES[kind[child]]} at position {child} cannot be "
+                                     f"a child of {KIND_NAMES[code]} at position {i}")
+        agent, operation = KIND_CODES[Agent], KIND_CODES[Operation]
+        for goal_position, agent_position, operation_position in self.performs:
+            if kind[goal_position] not in GOAL_CODES or kind[agent_position] != agent \
+                    or (operation_position != -1 and kind[operation_position] != operation):
+                raise ValueError("Model performance link does not join a goal, an agent, and an operation")
+        obstacle = KIND_CODES[Obstacle]
+        for edge_type, first, second in self.links:
+            if edge_type not in LINK_CLASSES:
+                raise ValueError(f"Model link type {int(edge_type)} is not a conflict, obstruction, or resolution")
+            if kind[first] not in GOAL_CODES or (kind[second] not in GOAL_CODES
+                                                 if edge_type == EdgeType.CONFLICT
+                                                 else kind[second] != obstacle):
+                raise ValueError(f"Model {LINK_CLASSES[edge_type].__name__} joins the wrong kinds of vertices")
+        if any(kind[position] not in GOAL_CODES for position in self.categories):
+            raise ValueError("Model gives categories to a vertex that is not a goal")
+
+    def build(self, preserve_ids: bool = False):
+        """
+        Construct the schema objects described by this table.
+
+        Each vertex is made by copying the attributes of a vertex of its kind built once through
+        its constructor, and the collector is paused meanwhile, since none of the new objects can
+        be garbage yet.
+        :param bool preserve_ids: Keep the stored node ids instead of allocating new ones.
+        :return tuple: The root vertices and the list of links.
+        """
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            return self._build(preserve_ids)
+        finally:
+            if collecting:
+                gc.enable()
+
+    def _build(self, preserve_ids: bool):
+        objects = [None] * len(self.kind)
+        templates = {}
+        node_ids = self.node_id if preserve_ids else None
+        for i, code in enumerate(self.kind):
+            template = templates.get(code)
+            if template is None:
+                template = templates[code] = _Template(KINDS[code])
+            fields = template.fields.copy()
+            for key in template.lists:
+                fields[key] = []
+            node_id = node_ids[i] if node_ids is not None else -1
+            fields["node_id"] = node_id if node_id >= 0 else schema._get_new_node_id()
+            fields["leaf"] = bool(self.leaf[i])
+            fields["annotation"] = self.annotation[i]
+            if template.named:
+                fields["name"] = self.name[i]
+            if template.attribute is not None:
+                fields[template.attribute] = template.convert(self.attr[i])
+            obj = template.cls.__new__(template.cls)
+            obj.__dict__ = fields
+            objects[i] = obj
+
+        offsets = self.child_offsets
+        child_index = self.child_index
+        for i, obj in enumerate(objects):
+            start, end = offsets[i], offsets[i + 1]
+            if start == end:
+                continue
+            children = [objects[c] for c in child_index[start:end]]
+            if isinstance(obj, Refinement):
+                obj.children = children
+            elif isinstance(obj, Goal):
+                obj.disjunctions = children
+            elif isinstance(obj, Obstacle):
+                obj.refinements = children
+
+        for goal, agent, operation in self.performs:
+            objects[goal].performs.append(
+                PerformanceLink(objects[agent], objects[operation] if operation != -1 else None))
+
+        links = [LINK_CLASSES[t](objects[a], objects[b]) for t, a, b in self.links]
+
+        for position, values in self.categories.items():
+            objects[position].categories = [GoalCategory(v) for v in values]
+
+        if preserve_ids:
+            schema.NODE_COUNT = max(schema.NODE_COUNT, max(self.node_id, default=-1) + 1)
+
+        return [objects[r] for r in self.roots], links
+
+
+def flatten(roots: list[Vertex], links: list = None):
+    """
+    Flatten the refinement graph reachable from the roots and links into a ModelTable.
+    Shared vertices are stored once. The traversal is iterative, so deep models are fine.
+    :param list[Vertex] roots: The root vertices.
+    :param list links: The conflict, obstruction, and resolution links.
+    :return ModelTable: The flattened model.
+    """
+    if links is None:
+        links = []
+
+    table = ModelTable()
+    position = {}
+    order = []
+
+    def visit(start):
+        if id(start) in position:
+            return
+        stack = [start]
+        while stack:
+            vertex = stack.pop()
+            if id(vertex) in position:
+                continue
+            position[id(vertex)] = len(order)
+            order.append(vertex)
+            if isinstance(vertex, Refinement):
+                stack.extend(reversed(vertex.children))
+            elif isinstance(vertex, Goal):
+                stack.extend(reversed(vertex.disjunctions))
+                for perform in reversed(vertex.performs):
+                    if perform.operation:
+                        stack.append(perform.operation)
+                    stack.append(perform.agent)
+            elif isinstance(vertex, Obstacle):
+                stack.extend(reversed(vertex.refinements))
+
+    for root in roots:
+        visit(root)
+    for link in links:
+        for endpoint in _link_endpoints(link):
+            visit(endpoint)
+
+    for vertex in order:
+        code = kind_code(vertex)
+        attr = 0
+        children = ()
+        if isinstance(vertex, Refinement):
+            attr = vertex.complete
+            children = vertex.children
+        elif isinstance(vertex, Goal):
+            if KINDS[code] is Goal:
+                attr = vertex.goal_type
+            children = vertex.disjunctions
+        elif isinstance(vertex, Obstacle):
+            children = vertex.refinements
+        elif isinstance(vertex, Agent):
+            attr = vertex.type
+        elif isinstance(vertex, Operation):
+            attr = vertex.category
+        table.add_vertex(code, getattr(vertex, "name", ""), vertex.annotation, vertex.leaf, attr,
+                         vertex.node_id)
+        table.end_children([position[id(child)] for child in children])
+        if isinstance(vertex, Goal):
+            if vertex.categories:
+                table.categories[position[id(vertex)]] = [int(c) for c in vertex.categories]
+            for perform in vertex.performs:
+                table.performs.append((
+                    position[id(vertex)],
+                    position[id(perform.agent)],
+                    position[id(perform.operation)] if perform.operation else -1))
+
+    for link in links:
+        first, second = _link_endpoints(link)
+        table.links.append((EdgeType(link.edge_type), position[id(first)], position[id(second)]))
+
+    table.roots = [position[id(root)] for root in roots]
+    return table
+
+
+def to_json(table: ModelTable):
+    """
+    Encode a ModelTable as JSON text.
+    :param ModelTable table: The model.
+    :return str: The JSON document.
+    """
+    return json.dumps(table.to_dict(), separators=(",", ":"))
+
+
+def from_json(text: str or bytes):
+    """
+    Decode a ModelTable from JSON text.
+    :param str text: The JSON document.
+    :return ModelTable: The model.
+    """
+    return ModelTable.from_dict(json.loads(text))
+
+
+def write_jsonl(table: ModelTable, fp):
+    """
+    Write a ModelTable as JSON Lines: a header line with the roots and links, then one line per vertex.
+    Vertex keys are positions, so vertex i is on line i + 2 and can be read without parsing the rest.
+    :param ModelTable table: The model.
+    :param fp: A text file object.
+    """
+    performs = {}
+    for goal, agent, operation in table.performs:
+        performs.setdefault(goal, []).append([agent, operation])
+    fp.write(json.dumps({
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "count": len(table),
+        "roots": table.roots,
+        "links": [[int(t), a, b] for t, a, b in table.links],
+    }, separators=(",", ":")))
+    fp.write("\n")
+    for i in range(len(table)):
+        line = {
+            "kind": KIND_NAMES[table.kind[i]],
+            "name": table.name[i],
+            "annotation": table.annotation[i],
+            "leaf": table.leaf[i],
+            "attr": table.attr[i],
+            "children": table.children(i),
+            "performs": performs.get(i, []),
+        }
+        if i in table.categories:
+            line["categories"] = [int(c) for c in table.categories[i]]
+        fp.write(json.dumps(line, separators=(",", ":")))
+        fp.write("\n")
+
+
+def _pack_ints(values, typecode="i"):
+    packed = array(typecode, values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack_ints(data, typecode="i"):
+    unpacked = array(typecode)
+    unpacked.frombytes(data)
+    if sys.byteorder == "big":
+        unpacked.byteswap()
+    return unpacked.tolist()
+
+
+def _pack_strings(values):
+    encoded = [value.encode("utf-8") for value in values]
+    return _pack_ints([len(e) for e in encoded]) + b"".join(encoded)
+
+
+def to_bytes(table: ModelTable):
+    """
+    Encode a ModelTable in the compact binary format.
+
+    The layout is the magic, a little-endian header of section lengths, then each column as
+    packed 32-bit integers or length-prefixed UTF-8 strings. Goal categories are packed as the
+    position of each goal that has any, their number, and their values.
+    :param ModelTable table: The model.
+    :return bytes: The encoded model.
+    """
+    categories = []
+    for position in sorted(table.categories):
+        values = table.categories[position]
+        categories.append(position)
+        categories.append(len(values))
+        categories.extend(int(v) for v in values)
+    sections = [
+        _pack_ints(table.kind, "b"),
+        _pack_ints(table.leaf, "b"),
+        _pack_ints(table.attr),
+        _pack_ints(table.node_id),
+        _pack_ints(table.child_offsets),
+        _pack_ints(table.child_index),
+        _pack_ints([v for triple in table.performs for v in triple]),
+        _pack_ints([int(v) for triple in table.links for v in triple]),
+        _pack_ints(table.roots),
+        _pack_strings(table.name),
+        _pack_strings(table.annotation),
+        _pack_ints(categories),
+    ]
+    header = struct.pack(f"<4sHQ{len(sections)}Q", BINARY_MAGIC, BINARY_VERSION, len(table.kind),
+                         *[len(s) for s in sections])
+    return header + b"".join(sections)
+
+
+def from_bytes(data: bytes):
+    """
+    Decode a ModelTable from the compact binary format.
+    :param bytes data: The encoded model.
+    :return ModelTable: The model.
+    """
+    prefix = struct.Struct("<4sH")
+    if len(data) < prefix.size:
+        raise ValueError("Truncated model")
+    magic, version = prefix.unpack_from(data)
+    if magic != BINARY_MAGIC:
+        raise ValueError("Not a goalmodeling model")
+    if version not in BINARY_SECTIONS:
+        raise ValueError(f"Unsupported model version {version}")
+    header = struct.Struct(f"<4sHQ{BINARY_SECTIONS[version]}Q")
+    if len(data) < header.size:
+        raise ValueError("Truncated model")
+    _, _, count, *lengths = header.unpack_from(data)
+    if header.size + sum(lengths) != len(data):
+        raise ValueError("Truncated model")
+
+    sections = []
+    offset = header.size
+    for length in lengths:
+        sections.append(data[offset:offset + length])
+        offset += length
+
+    def strings(section):
+        lengths = _unpack_ints(section[:4 * count])
+        ends = list(accumulate(lengths))
+        text = section[4 * count:]
+        if text.isascii():
+            # One character per byte: decode once and slice the text.
+            text = text.decode("ascii")
+            return [text[end - length:end] for length, end in zip(lengths, ends)]
+        return [text[end - length:end].decode("utf-8") for length, end in zip(lengths, ends)]
+
+    table = ModelTable()
+    table.kind = _unpack_ints(sections[0], "b")
+    table.leaf = _unpack_ints(sections[1], "b")
+    table.attr = _unpack_ints(sections[2])
+    table.node_id = _unpack_ints(sections[3])
+    table.child_offsets = _unpack_ints(sections[4])
+    table.child_index = _unpack_ints(sections[5])
+    performs = _unpack_ints(sections[6])
+    table.performs = [tuple(performs[i:i + 3]) for i in range(0, len(performs), 3)]
+    links = _unpack_ints(sections[7])
+    table.links = [(EdgeType(links[i]), links[i + 1], links[i + 2]) for i in range(0, len(links), 3)]
+    table.roots = _unpack_ints(sections[8])
+    table.name = strings(sections[9])
+    table.annotation = strings(sections[10])
+    if version >= 2:
+        categories = _unpack_ints(sections[11])
+        i = 0
+        while i < len(categories):
+            end = i + 2 + (categories[i + 1] if i + 1 < len(categories) else -1)
+            if end < i + 2 or end > len(categories):
+                raise ValueError("Model categories are inconsistent")
+            table.categories[categories[i]] = categories[i + 2:end]
+            i = end
+    if table.kind and (min(table.kind) < 0 or max(table.kind) >= len(KINDS)):
+        raise ValueError("Unknown vertex kind")
+    table.check()
+    return table
+
+
+def dumps(roots: list[Vertex], links: list = None, binary: bool = False):
+    """
+    Serialize a model.
+    :param list[Vertex] roots: The root vertices.
+    :param list links: The conflict, obstruction, and resolution links.
+    :param bool binary: Use the binary format instead of JSON.
+    :return str or bytes: The encoded model.
+    """
+    table = flatten(roots, links)
+    return to_bytes(table) if binary else to_json(table)
+
+
+def loads(data: str or bytes, preserve_ids: bool = False):
+    """
+    Deserialize a model from either format.
+    :param str or bytes data: The encoded model, JSON or binary.
+    :param bool preserve_ids: Keep the stored node ids instead of allocating new ones.
+    :return tuple: The root vertices and the list of links.
+    """
+    return decode(data).build(preserve_ids)
+
+
+def decode(data: str or bytes):
+    """
+    Decode a ModelTable, detecting the format from the leading bytes.
+    :param str or bytes data: The encoded model, JSON or binary.
+    :return ModelTable: The model.
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)) and bytes(data[:4]) == BINARY_MAGIC:
+        return from_bytes(bytes(data))
+    return from_json(data)
@@ -0,0 +1,352 @@
+"""
+A small local HTTP service that renders models to Mermaid diagram definitions or pako links.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+import argparse
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from .schema import generate_graph, generate_pako_link, Refinement
+from .serialization import decode, KIND_CODES
+from .registry import ModelRegistry
+from .validation import ensure_valid
+
+OUTPUTS = ("mermaid", "link")
+MODES = ("view", "edit")
+# The largest request body accepted by default, in bytes.
+MAX_BODY = 16 * 1024 * 1024
+# The most goal and obstacle levels accepted by default. The renderer recurses once per level,
+# so this stays well below Python's default recursion limit of 1000.
+MAX_DEPTH = 500
+
+
+def _levels(table):
+    """
+    Used internally to count the goal and obstacle levels on the longest path of a model table,
+    without recursion. A child reached again on the current path is a cycle and is not followed.
+    """
+    refinement = KIND_CODES[Refinement]
+    offsets, child_index = table.child_offsets, table.child_index
+    levels = [-1] * len(table.kind)
+    for start in range(len(table.kind)):
+        if levels[start] >= 0:
+            continue
+        levels[start] = 0
+        stack = [(start, offsets[start])]
+        while stack:
+            vertex, position = stack[-1]
+            if position < offsets[vertex + 1]:
+                stack[-1] = (vertex, position + 1)
+                child = child_index[position]
+                if levels[child] < 0:
+                    levels[child] = 0
+                    stack.append((child, offsets[child]))
+                continue
+            stack.pop()
+            below = max((levels[c] for c in child_index[offsets[vertex]:offsets[vertex + 1]]), default=0)
+            levels[vertex] = below + (table.kind[vertex] != refinement)
+    return max(levels, default=0)
+
+
+class RenderCache:
+    """
+    A thread-safe LRU cache of rendered results that coalesces concurrent identical requests.
+
+    When several threads ask for the same key at once, the first one renders and the others
+    wait for its result instead of rendering again.
+    """
+    def __init__(self, capacity: int = 256):
+        """
+        Initialize the cache.
+        :param int capacity: The maximum number of results kept.
+        """
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key, render):
+        """
+        Get a cached result or compute it with render, sharing one computation between concurrent callers.
+        :param key: The cache key.
+        :param render: A function without arguments computing the result.
+        :return: The result.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = _Pending()
+                self._pending[key] = pending
+                self.misses += 1
+                owner = True
+            else:
+                self.coalesced += 1
+                owner = False
+
+        if not owner:
+            return pending.wait()
+
+        try:
+            result = render()
+        except BaseException as e:
+            with self._lock:
+                del self._pending[key]
+            pending.fail(e)
+            raise
+
+        with self._lock:
+            del self._pending[key]
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+        pending.set(result)
+        return result
+
+    def stats(self):
+        """
+        Get cache counters.
+        :return dict: The number of entries, hits, misses, and coalesced requests.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+            }
+
+
+class _Pending:
+    """
+    The result of a render that other threads are waiting on.
+    """
+    def __init__(self):
+        self._done = threading.Event()
+        self._result = None
+        self._error = None
+
+    def set(self, result):
+        self._result = result
+        self._done.set()
+
+    def fail(self, error):
+        self._error = error
+        self._done.set()
+
+    def wait(self):
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+class RenderService:
+    """
+    Renders encoded models, keyed by a hash of the model bytes and the requested output.
+    """
+    def __init__(self, cache_size: int = 256, mermaid_host: str = "https://mermaid.live",
+                 registry: ModelRegistry = None, max_depth: int = MAX_DEPTH):
+        """
+        Initialize the service.
+        :param int cache_size: The number of rendered results to keep.
+        :param str mermaid_host: The host used in generated pako links.
+        :param ModelRegistry registry: If given, every model built is registered with it, to
+            see when models are freed.
+        :param int max_depth: The most goal and obstacle levels a model may have.
+        """
+        self.cache = RenderCache(cache_size)
+        self.mermaid_host = mermaid_host
+        self.registry = registry
+        self.max_depth = max_depth
+
+    def render(self, body: bytes, output: str = "mermaid", mode: str = "view"):
+        """
+        Render an encoded model.
+        :param bytes body: The model in JSON or binary format.
+        :param str output: "mermaid" for the diagram definition or "link" for a pako link.
+        :param str mode: "view" or "edit", used for links.
+        :return str: The diagram definition or the link.
+        :raises ValueError: If the request or the model is malformed, including models with
+            validation errors and models deeper than max_depth.
+        """
+        if output not in OUTPUTS:
+            raise ValueError(f"output must be one of {', '.join(OUTPUTS)}")
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {', '.join(MODES)}")
+
+        digest = hashlib.sha256(body).hexdigest()
+        key = (digest, output, mode if output == "link" else None)
+
+        def render():
+            # Links reuse the cached diagram definition of the same model.
+            if output == "link":
+                text = self.render(body, "mermaid")
+                return generate_pako_link(text, mode=mode, host=self.mermaid_host)
+            table = decode(body)
+            if _levels(table) > self.max_depth:
+                raise ValueError(f"Model deeper than {self.max_depth} levels")
+            roots, links = table.build()
+            ensure_valid(roots, links)
+            if self.registry is not None:
+                self.registry.register(roots, links, digest[:12])
+            return generate_graph(roots, links)
+
+        return self.cache.get_or_render(key, render)
+
+    def stats(self):
+        """
+        Get the cache counters, and the model counters when models are tracked.
+        :return dict: The counters.
+        """
+        result = self.cache.stats()
+        if self.registry is not None:
+            models = self.registry.stats()
+            result["models"] = {name: models[name] for name in
+                                ("registered", "released", "live_models", "live_vertices")}
+        return result
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """
+    POST /render?output=mermaid|link&mode=view|edit with a model body; GET /stats for cache counters.
+
+    Malformed requests and models, including models deeper than the service's max_depth, get 400,
+    bodies above max_body get 413, and any other failure while rendering gets 500, so a client
+    always receives a status.
+    """
+    service = None
+    max_body = MAX_BODY
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/render":
+            self._reply(404, "Not found\n")
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            self._reply(400, "Invalid Content-Length\n")
+            return
+        if length > self.max_body:
+            # The body is not read, so the connection cannot be reused.
+            self.close_connection = True
+            self._reply(413, f"Model larger than {self.max_body} bytes\n")
+            return
+        body = self.rfile.read(length)
+        query = parse_qs(url.query)
+        output = query.get("output", ["mermaid"])[0]
+        mode = query.get("mode", ["view"])[0]
+
+        try:
+            result = self.service.render(body, output, mode)
+        except (ValueError, KeyError, TypeError, UnicodeDecodeError) as e:
+            self._reply(400, f"Invalid request: {e}\n")
+            return
+        except Exception as e:
+            if self.server.verbose:
+                self.log_error("render failed: %r", e)
+            self._reply(500, f"Render failed: {type(e).__name__}\n")
+            return
+        self._reply(200, result)
+
+    def do_GET(self):
+        if urlparse(self.path).path == "/stats":
+            self._reply(200, json.dumps(self.service.stats()), "application/json")
+        else:
+            self._reply(404, "Not found\n")
+
+    def _reply(self, status: int, text: str, content_type: str = "text/plain; charset=utf-8"):
+        data = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(host: str = "127.0.0.1", port: int = 8765, cache_size: int = 256,
+                mermaid_host: str = "https://mermaid.live", verbose: bool = False,
+                track_models: bool = False, max_body: int = MAX_BODY, max_depth: int = MAX_DEPTH):
+    """
+    Create the render server without starting it.
+    :param str host: The address to bind, local only by default.
+    :param int port: The port to bind, 0 for any free port.
+    :param int cache_size: The number of rendered results to keep.
+    :param str mermaid_host: The host used in generated pako links.
+    :param bool verbose: Log each request to stderr.
+    :param bool track_models: Track built models with a ModelRegistry and report them in /stats.
+    :param int max_body: The largest request body accepted, in bytes.
+    :param int max_depth: The most goal and obstacle levels a model may have.
+    :return ThreadingHTTPServer: The server; call serve_forever to start it.
+    """
+    handler = type("BoundRenderRequestHandler", (RenderRequestHandler,),
+                   {"service": RenderService(cache_size, mermaid_host,
+                                             ModelRegistry() if track_models else None,
+                                             max_depth),
+                    "max_body": max_body})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.verbose = verbose
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="server",
+        description="Serve Mermaid renderings of goal models locally.",
+        epilog="For example, python3 -m goalmodeling.server --port 8765"
+    )
+
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Address to bind")
+    parser.add_argument("--port", type=int, default=8765, help="Port to bind")
+    parser.add_argument("--cache-size", type=int, default=256, help="Number of rendered results to keep")
+    parser.add_argument("--mermaid-host", type=str, default="https://mermaid.live",
+                        help="Host used in generated pako links")
+    parser.add_argument("--verbose", action="store_true", default=False, help="Log each request")
+    parser.add_argument("--track-models", action="store_true", default=False,
+                        help="Report live models and vertices in /stats")
+    parser.add_argument("--max-body", type=int, default=MAX_BODY,
+                        help="Largest request body accepted, in bytes")
+    parser.add_argument("--max-depth", type=int, default=MAX_DEPTH,
+                        help="Most goal and obstacle levels accepted in a model")
+
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.cache_size, args.mermaid_host, args.verbose,
+                         args.track_models, args.max_body, args.max_depth)
+    print(f"Serving on http://{server.server_address[0]}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
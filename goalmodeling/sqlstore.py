@@ -0,0 +1,408 @@
+"""
+Persistent storage of many goal models in SQLite with indexed queries across them.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+import sqlite3
+from itertools import islice
+
+from .schema import AgentType, EdgeType, Vertex
+from .serialization import KIND_NAMES, ModelTable, flatten
+
+# Number of rows sent to executemany at a time, and of ids in one IN (...) clause.
+BATCH_SIZE = 10000
+IN_BATCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS models (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+-- One row per vertex. kind is the class name; attr holds complete for a Refinement, the
+-- AgentType of an Agent, the OperationCategory of an Operation, and the GoalType of a Goal.
+CREATE TABLE IF NOT EXISTS vertices (
+    model_id INTEGER NOT NULL REFERENCES models(id) ON DELETE CASCADE,
+    vertex_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    annotation TEXT NOT NULL,
+    leaf INTEGER NOT NULL,
+    attr INTEGER NOT NULL,
+    root INTEGER NOT NULL,
+    PRIMARY KEY (model_id, vertex_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS vertices_kind ON vertices (kind, model_id);
+CREATE INDEX IF NOT EXISTS vertices_name ON vertices (name);
+-- Refinement edges: a goal or obstacle to each refinement, and a refinement to each child.
+CREATE TABLE IF NOT EXISTS edges (
+    model_id INTEGER NOT NULL REFERENCES models(id) ON DELETE CASCADE,
+    parent INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    child INTEGER NOT NULL,
+    PRIMARY KEY (model_id, parent, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS edges_child ON edges (model_id, child);
+CREATE TABLE IF NOT EXISTS performs (
+    model_id INTEGER NOT NULL REFERENCES models(id) ON DELETE CASCADE,
+    goal INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    agent INTEGER NOT NULL,
+    operation INTEGER,
+    PRIMARY KEY (model_id, goal, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS performs_agent ON performs (model_id, agent);
+-- The GoalCategory values of each goal that has any, in order.
+CREATE TABLE IF NOT EXISTS categories (
+    model_id INTEGER NOT NULL REFERENCES models(id) ON DELETE CASCADE,
+    goal INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    category INTEGER NOT NULL,
+    PRIMARY KEY (model_id, goal, position)
+) WITHOUT ROWID;
+-- Conflict, obstruction, and resolution links; first and second follow the constructor order.
+CREATE TABLE IF NOT EXISTS links (
+    model_id INTEGER NOT NULL REFERENCES models(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    edge_type INTEGER NOT NULL,
+    first INTEGER NOT NULL,
+    second INTEGER NOT NULL,
+    PRIMARY KEY (model_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS links_first ON links (model_id, first, edge_type);
+CREATE INDEX IF NOT EXISTS links_second ON links (model_id, second, edge_type);
+"""
+
+
+class StoredVertex:
+    """
+    A vertex row returned by a query, identified by its model and its position in the model.
+    """
+    def __init__(self, model: str, vertex_id: int, kind: str, name: str):
+        self.model = model
+        self.vertex_id = vertex_id
+        self.kind = kind
+        self.name = name
+
+    def __repr__(self):
+        return f"StoredVertex({self.model!r}, {self.vertex_id}, {self.kind!r}, {self.name!r})"
+
+    def __eq__(self, other):
+        return (isinstance(other, StoredVertex)
+                and (self.model, self.vertex_id) == (other.model, other.vertex_id))
+
+    def __hash__(self):
+        return hash((self.model, self.vertex_id))
+
+
+def _batches(values, size):
+    values = iter(values)
+    while batch := list(islice(values, size)):
+        yield batch
+
+
+class SQLiteStore:
+    """
+    Stores models by name in an SQLite database and loads them back fully or in part.
+    """
+    def __init__(self, path: str = ":memory:"):
+        """
+        Open or create the store.
+        :param str path: The database file, or ":memory:" for a temporary store.
+        """
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def models(self):
+        """
+        List the stored models.
+        :return list[str]: The model names.
+        """
+        return [name for (name,) in self.connection.execute("SELECT name FROM models ORDER BY name")]
+
+    def _model_id(self, model: str):
+        row = self.connection.execute("SELECT id FROM models WHERE name = ?", (model,)).fetchone()
+        if row is None:
+            raise KeyError(f"No model named {model!r}")
+        return row[0]
+
+    def save(self, model: str, roots: list[Vertex], links: list = None):
+        """
+        Store a model, replacing any model with the same name.
+        :param str model: The model name.
+        :param list[Vertex] roots: The root vertices.
+        :param list links: The conflict, obstruction, and resolution links.
+        """
+        self.save_table(model, flatten(roots, links))
+
+    def save_table(self, model: str, table: ModelTable):
+        """
+        Store a flattened model in one transaction, replacing any model with the same name.
+        :param str model: The model name.
+        :param ModelTable table: The model.
+        """
+        roots = set(table.roots)
+        with self.connection:
+            self.connection.execute("DELETE FROM models WHERE name = ?", (model,))
+            model_id = self.connection.execute("INSERT INTO models (name) VALUES (?)", (model,)).lastrowid
+
+            vertices = ((model_id, i, KIND_NAMES[table.kind[i]], table.name[i], table.annotation[i],
+                         table.leaf[i], table.attr[i], 1 if i in roots else 0)
+                        for i in range(len(table)))
+            edges = ((model_id, parent, position, child)
+                     for parent in range(len(table))
+                     for position, child in enumerate(table.children(parent)))
+            position = {}
+            performs = []
+            for goal, agent, operation in table.performs:
+                position[goal] = position.get(goal, -1) + 1
+                performs.append((model_id, goal, position[goal], agent, operation if operation != -1 else None))
+            links = ((model_id, i, int(t), a, b) for i, (t, a, b) in enumerate(table.links))
+            categories = ((model_id, goal, position, int(category))
+                          for goal, values in table.categories.items()
+                          for position, category in enumerate(values))
+
+            for sql, rows in (
+                    ("INSERT INTO vertices VALUES (?, ?, ?, ?, ?, ?, ?, ?)", vertices),
+                    ("INSERT INTO edges VALUES (?, ?, ?, ?)", edges),
+                    ("INSERT INTO performs VALUES (?, ?, ?, ?, ?)", performs),
+                    ("INSERT INTO links VALUES (?, ?, ?, ?, ?)", links),
+                    ("INSERT INTO categories VALUES (?, ?, ?, ?)", categories)):
+                for batch in _batches(rows, BATCH_SIZE):
+                    self.connection.executemany(sql, batch)
+
+    def delete(self, model: str):
+        """
+        Remove a model and everything stored for it.
+        :param str model: The model name.
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM models WHERE name = ?", (model,))
+
+    def query(self, sql: str, parameters=()):
+        """
+        Run a query returning (model, vertex_id, kind, name) columns as StoredVertex objects.
+        Join vertices as v and models as m, for example
+        "SELECT m.name, v.vertex_id, v.kind, v.name FROM vertices v JOIN models m ON m.id = v.model_id".
+        :param str sql: The query.
+        :param parameters: The query parameters.
+        :return list[StoredVertex]: The vertices.
+        """
+        return [StoredVertex(*row) for row in self.connection.execute(sql, parameters)]
+
+    def find(self, kind: type or str = None, name: str = None, model: str = None):
+        """
+        Find vertices by class and name, across all models or within one.
+        :param kind: The vertex class, or its name, e.g. AvoidGoal or "AvoidGoal".
+        :param str name: The exact name; use SQL LIKE wildcards with a trailing % for a prefix.
+        :param str model: Restrict the search to one model.
+        :return list[StoredVertex]: The matching vertices.
+        """
+        conditions = []
+        parameters = []
+        if kind is not None:
+            conditions.append("v.kind = ?")
+            parameters.append(kind if isinstance(kind, str) else kind.__name__)
+        if name is not None:
+            conditions.append("v.name LIKE ?" if "%" in name else "v.name = ?")
+            parameters.append(name)
+        if model is not None:
+            conditions.append("m.name = ?")
+            parameters.append(model)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self.query(
+            "SELECT m.name, v.vertex_id, v.kind, v.name FROM vertices v "
+            f"JOIN models m ON m.id = v.model_id {where} ORDER BY m.name, v.vertex_id",
+            parameters)
+
+    def goals_performed_by(self, agent_type: AgentType, kind: type or str = None, model: str = None):
+        """
+        Find goals with a performance link to an agent of the given type.
+        :param AgentType agent_type: The agent type, e.g. AgentType.SOFTWARE_AGENT.
+        :param kind: Restrict to goals of this class, e.g. AvoidGoal.
+        :param str model: Restrict the search to one model.
+        :return list[StoredVertex]: The goals.
+        """
+        conditions = ["a.kind = 'Agent'", "a.attr = ?"]
+        parameters = [int(agent_type)]
+        if kind is not None:
+            conditions.append("v.kind = ?")
+            parameters.append(kind if isinstance(kind, str) else kind.__name__)
+        if model is not None:
+            conditions.append("m.name = ?")
+            parameters.append(model)
+        return self.query(
+            "SELECT DISTINCT m.name, v.vertex_id, v.kind, v.name FROM performs p "
+            "JOIN vertices a ON a.model_id = p.model_id AND a.vertex_id = p.agent "
+            "JOIN vertices v ON v.model_id = p.model_id AND v.vertex_id = p.goal "
+            "JOIN models m ON m.id = p.model_id "
+            f"WHERE {' AND '.join(conditions)} ORDER BY m.name, v.vertex_id",
+            parameters)
+
+    def unresolved_obstacles(self, model: str = None):
+        """
+        Find obstacles without a resolution link.
+        :param str model: Restrict the search to one model.
+        :return list[StoredVertex]: The obstacles.
+        """
+        parameters = [int(EdgeType.RESOLUTION)]
+        condition = ""
+        if model is not None:
+            condition = "AND m.name = ?"
+            parameters.append(model)
+        return self.query(
+            "SELECT m.name, v.vertex_id, v.kind, v.name FROM vertices v "
+            "JOIN models m ON m.id = v.model_id "
+            "WHERE v.kind = 'Obstacle' AND NOT EXISTS (SELECT 1 FROM links l "
+            "WHERE l.model_id = v.model_id AND l.second = v.vertex_id AND l.edge_type = ?) "
+            f"{condition} ORDER BY m.name, v.vertex_id",
+            parameters)
+
+    def children(self, model: str, vertex_id: int):
+        """
+        Get the children of a vertex: the refinements of a goal or obstacle, or the children of a refinement.
+        :param str model: The model name.
+        :param int vertex_id: The vertex.
+        :return list[int]: The children, in order.
+        """
+        return [child for (child,) in self.connection.execute(
+            "SELECT child FROM edges WHERE model_id = ? AND parent = ? ORDER BY position",
+            (self._model_id(model), vertex_id))]
+
+    def parents(self, model: str, vertex_id: int):
+        """
+        Get the vertices that have this vertex as a child.
+        :param str model: The model name.
+        :param int vertex_id: The vertex.
+        :return list[int]: The parents.
+        """
+        return [parent for (parent,) in self.connection.execute(
+            "SELECT parent FROM edges WHERE model_id = ? AND child = ? ORDER BY parent",
+            (self._model_id(model), vertex_id))]
+
+    def roots(self, model: str):
+        """
+        Get the roots the model was saved with.
+        :param str model: The model name.
+        :return list[int]: The root vertices.
+        """
+        return [vertex_id for (vertex_id,) in self.connection.execute(
+            "SELECT vertex_id FROM vertices WHERE model_id = ? AND root = 1 ORDER BY vertex_id",
+            (self._model_id(model),))]
+
+    def load_table(self, model: str, vertex_ids: list[int] = None, depth: int = None):
+        """
+        Read a model, or the part of it below some vertices, into a ModelTable.
+
+        Only the requested vertices, their descendants down to depth refinement levels, and the
+        agents and operations of the loaded goals are read. Links are kept when both ends are loaded.
+        :param str model: The model name.
+        :param list[int] vertex_ids: The vertices to start from; the stored roots when None.
+        :param int depth: The number of refinement levels to load below each start vertex; all when None.
+        :return ModelTable: The loaded part, with the start vertices as roots.
+        """
+        model_id = self._model_id(model)
+        connection = self.connection
+        if vertex_ids is None:
+            vertex_ids = self.roots(model)
+
+        # Breadth-first by level; a goal and its refinements count as one level.
+        order = list(dict.fromkeys(vertex_ids))
+        loaded = set(order)
+        children_of = {}
+        frontier = order
+        level = 0
+        while frontier and (depth is None or level < depth):
+            next_frontier = []
+            pending = frontier
+            # Refinements are expanded in the same level as the goal or obstacle they refine.
+            while pending:
+                refinements = []
+                for batch in _batches(pending, IN_BATCH_SIZE):
+                    marks = ",".join("?" * len(batch))
+                    for parent, child, kind in connection.execute(
+                            "SELECT e.parent, e.child, v.kind FROM edges e JOIN vertices v "
+                            "ON v.model_id = e.model_id AND v.vertex_id = e.child "
+                            f"WHERE e.model_id = ? AND e.parent IN ({marks}) ORDER BY e.parent, e.position",
+                            [model_id, *batch]):
+                        children_of.setdefault(parent, []).append(child)
+                        if child in loaded:
+                            continue
+                        loaded.add(child)
+                        order.append(child)
+                        (refinements if kind == "Refinement" else next_frontier).append(child)
+                pending = refinements
+            frontier = next_frontier
+            level += 1
+
+        performs = []
+        for batch in _batches(order, IN_BATCH_SIZE):
+            marks = ",".join("?" * len(batch))
+            performs.extend(connection.execute(
+                "SELECT goal, agent, operation FROM performs "
+                f"WHERE model_id = ? AND goal IN ({marks}) ORDER BY goal, position",
+                [model_id, *batch]))
+        for _, agent, operation in performs:
+            for vertex_id in (agent, operation):
+                if vertex_id is not None and vertex_id not in loaded:
+                    loaded.add(vertex_id)
+                    order.append(vertex_id)
+
+        rows = {}
+        for batch in _batches(order, IN_BATCH_SIZE):
+            marks = ",".join("?" * len(batch))
+            for row in connection.execute(
+                    "SELECT vertex_id, kind, name, annotation, leaf, attr FROM vertices "
+                    f"WHERE model_id = ? AND vertex_id IN ({marks})", [model_id, *batch]):
+                rows[row[0]] = row
+        missing = [v for v in order if v not in rows]
+        if missing:
+            raise KeyError(f"Model {model!r} has no vertex {missing[0]}")
+
+        position = {vertex_id: i for i, vertex_id in enumerate(order)}
+        kind_codes = {name: code for code, name in enumerate(KIND_NAMES)}
+        table = ModelTable()
+        for vertex_id in order:
+            _, kind, name, annotation, leaf, attr = rows[vertex_id]
+            table.add_vertex(kind_codes[kind], name, annotation, leaf, attr)
+            table.end_children([position[c] for c in children_of.get(vertex_id, ())])
+        table.performs = [(position[g], position[a], position[o] if o is not None else -1)
+                          for g, a, o in performs]
+        for batch in _batches(order, IN_BATCH_SIZE):
+            marks = ",".join("?" * len(batch))
+            for goal, category in connection.execute(
+                    "SELECT goal, category FROM categories "
+                    f"WHERE model_id = ? AND goal IN ({marks}) ORDER BY goal, position",
+                    [model_id, *batch]):
+                table.categories.setdefault(position[goal], []).append(category)
+
+        links = []
+        for batch in _batches(order, IN_BATCH_SIZE):
+            marks = ",".join("?" * len(batch))
+            links.extend(connection.execute(
+                "SELECT position, edge_type, first, second FROM links "
+                f"WHERE model_id = ? AND first IN ({marks})", [model_id, *batch]))
+        table.links = [(EdgeType(t), position[a], position[b])
+                       for _, t, a, b in sorted(links) if a in position and b in position]
+        table.roots = [position[v] for v in dict.fromkeys(vertex_ids)]
+        return table
+
+    def load(self, model: str, vertex_ids: list[int] = None, depth: int = None):
+        """
+        Load a model, or the part of it below some vertices, as schema objects.
+        :param str model: The model name.
+        :param list[int] vertex_ids: The vertices to start from; the stored roots when None.
+        :param int depth: The number of refinement levels to load below each start vertex; all when None.
+        :return tuple: The start vertices and the links between loaded vertices.
+        """
+        return self.load_table(model, vertex_ids, depth).build()
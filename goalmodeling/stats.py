@@ -0,0 +1,189 @@
+"""
+Model metrics in one traversal: size, depth, fan-out, completeness, responsibility, and obstacle coverage.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+from collections import Counter, deque
+
+from .schema import (
+    Vertex,
+    Goal,
+    Obstacle,
+    Refinement,
+    DomainProperty,
+    ConflictLink,
+    ObstructionLink,
+    ResolutionLink,
+)
+
+
+class Distribution:
+    """
+    A histogram of small non-negative integers, such as depths and fan-outs.
+
+    Values are counted rather than stored, so percentiles only sort the distinct values.
+    """
+    def __init__(self):
+        self.counts = Counter()
+        self.total = 0
+        self.sum = 0
+
+    def add(self, value: int):
+        self.counts[value] += 1
+        self.total += 1
+        self.sum += value
+
+    def percentile(self, fraction: float):
+        """
+        Get the smallest value with at least the given fraction of values at or below it.
+        :param float fraction: Between 0 and 1.
+        :return int: The value, or 0 with no values.
+        """
+        if not self.total:
+            return 0
+        rank = max(1, -int(-fraction * self.total // 1))
+        seen = 0
+        for value in sorted(self.counts):
+            seen += self.counts[value]
+            if seen >= rank:
+                return value
+        return max(self.counts)
+
+    def to_dict(self):
+        """
+        Summarize the distribution.
+        :return dict: Count, mean, minimum, maximum, percentiles, and the histogram.
+        """
+        return {
+            "count": self.total,
+            "mean": self.sum / self.total if self.total else 0.0,
+            "min": min(self.counts) if self.total else 0,
+            "max": max(self.counts) if self.total else 0,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+            "histogram": {str(value): self.counts[value] for value in sorted(self.counts)},
+        }
+
+
+def _share(part: int, whole: int):
+    return part / whole if whole else 0.0
+
+
+def model_stats(roots: list[Vertex], links: list = None):
+    """
+    Compute the metrics of a model in one traversal.
+
+    The depth of a goal or obstacle is the number of refinements between it and the nearest
+    root. A vertex reached along several paths is counted once. Agents are told apart by name
+    and type, as diagrams repeat an agent at every goal it performs.
+    :param list[Vertex] roots: The root goals.
+    :param list links: The conflict, obstruction, and resolution links.
+    :return dict: The metrics, ready to be dumped as JSON.
+    """
+    links = links or []
+    kinds = Counter()
+    depth = Distribution()
+    leaf_depth = Distribution()
+    alternatives = Distribution()
+    children = Distribution()
+    agents_per_leaf = Distribution()
+    agents = set()
+    operations = set()
+    goals = refinements = complete = 0
+    leaf_goals = leaf_obstacles = flagged = 0
+
+    starts = list(roots)
+    obstructed = set()
+    resolved = set()
+    link_kinds = Counter()
+    for link in links:
+        link_kinds[type(link).__name__] += 1
+        if type(link) == ObstructionLink:
+            starts.append(link.obstacle)
+            obstructed.add(link.goal.node_id)
+        elif type(link) == ResolutionLink:
+            starts.append(link.goal)
+            resolved.add(link.obstacle.node_id)
+
+    # A refinement sits at the depth of the vertex it refines and its children one level
+    # below, so the queue takes steps of 0 and 1 and still reaches every vertex at its
+    # shortest depth first.
+    seen = set()
+    queue = deque()
+    for start in starts:
+        if start.node_id not in seen:
+            seen.add(start.node_id)
+            queue.append((start, 0))
+    leaf_goal_ids = []
+    obstacle_ids = []
+    while queue:
+        vertex, level = queue.popleft()
+        kinds[type(vertex).__name__] += 1
+        if vertex.leaf:
+            flagged += 1
+        if isinstance(vertex, Refinement):
+            refinements += 1
+            if vertex.complete:
+                complete += 1
+            children.add(len(vertex.children))
+            for child in vertex.children:
+                if child.node_id not in seen:
+                    seen.add(child.node_id)
+                    queue.append((child, level + 1))
+            continue
+
+        depth.add(level)
+        below = []
+        if isinstance(vertex, Goal):
+            goals += 1
+            below = vertex.disjunctions
+            keys = set()
+            for perform in vertex.performs:
+                keys.add((perform.agent.name, perform.agent.type))
+                if perform.operation is not None:
+                    operations.add(perform.operation.node_id)
+            agents |= keys
+            if not below:
+                leaf_goals += 1
+                leaf_goal_ids.append(vertex.node_id)
+                leaf_depth.add(level)
+                agents_per_leaf.add(len(keys))
+        elif isinstance(vertex, Obstacle):
+            below = vertex.refinements
+            obstacle_ids.append(vertex.node_id)
+            if not below:
+                leaf_obstacles += 1
+        if below:
+            alternatives.add(len(below))
+        for refinement in below:
+            if refinement.node_id not in seen:
+                seen.add(refinement.node_id)
+                queue.appendleft((refinement, level))
+
+    return {
+        "vertices": len(seen),
+        "kinds": dict(sorted(kinds.items())),
+        "links": dict(sorted(link_kinds.items())),
+        "goals": goals,
+        "obstacles": len(obstacle_ids),
+        "domain_properties": kinds.get(DomainProperty.__name__, 0),
+        "refinements": refinements,
+        "complete_refinements": complete,
+        "complete_share": _share(complete, refinements),
+        "leaf_goals": leaf_goals,
+        "leaf_obstacles": leaf_obstacles,
+        "flagged_leaves": flagged,
+        "agents": len(agents),
+        "operations": len(operations),
+        "conflicts": link_kinds.get(ConflictLink.__name__, 0),
+        "depth": depth.to_dict(),
+        "leaf_depth": leaf_depth.to_dict(),
+        "alternatives": alternatives.to_dict(),
+        "children": children.to_dict(),
+        "agents_per_leaf": agents_per_leaf.to_dict(),
+        "covered_leaf_share": _share(leaf_goals - agents_per_leaf.counts[0], leaf_goals),
+        "obstructed_leaf_share": _share(sum(1 for n in leaf_goal_ids if n in obstructed), leaf_goals),
+        "resolved_obstacle_share": _share(sum(1 for n in obstacle_ids if n in resolved), len(obstacle_ids)),
+    }
@@ -0,0 +1,160 @@
+"""
+Extracting and rendering slices of a refinement graph around a vertex.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+
+A slice is a set of node ids. It holds goals, obstacles, and domain properties, plus the
+refinements connecting them. All functions here use a ModelIndex, so their cost grows with the
+size of the slice and not with the size of the model.
+"""
+from collections import deque
+
+from .index import ModelIndex, link_endpoints, refinements_of
+from .schema import Vertex, Goal, Obstacle, generate_graph
+
+
+def _connect(index: ModelIndex, scope: set):
+    """
+    Add the refinements whose owner and at least one child are both in scope.
+    """
+    for node_id in list(scope):
+        for refinement in index.containing.get(node_id, []):
+            owner = index.owner.get(refinement.node_id)
+            if owner is not None and owner.node_id in scope:
+                scope.add(refinement.node_id)
+    return scope
+
+
+def ancestor_path(index: ModelIndex, vertex: Vertex):
+    """
+    Get the vertex and every goal or obstacle above it, up to the top-level goals.
+    :param ModelIndex index: The index of the model.
+    :param Vertex vertex: The vertex.
+    :return set: The node ids in the slice.
+    """
+    scope = {vertex.node_id}
+    queue = deque([vertex])
+    while queue:
+        current = queue.popleft()
+        for parent in index.parents(current):
+            if parent.node_id not in scope:
+                scope.add(parent.node_id)
+                queue.append(parent)
+    return _connect(index, scope)
+
+
+def descendants(index: ModelIndex, vertex: Vertex, depth: int = None):
+    """
+    Get the vertex and the goals, obstacles, and domain properties below it.
+    :param ModelIndex index: The index of the model.
+    :param Vertex vertex: The vertex.
+    :param int depth: The number of refinement levels to include; all when None.
+    :return set: The node ids in the slice.
+    """
+    scope = {vertex.node_id}
+    frontier = [vertex]
+    level = 0
+    while frontier and (depth is None or level < depth):
+        next_frontier = []
+        for current in frontier:
+            for refinement in refinements_of(current):
+                scope.add(refinement.node_id)
+                for child in refinement.children:
+                    if child.node_id not in scope:
+                        scope.add(child.node_id)
+                        next_frontier.append(child)
+        frontier = next_frontier
+        level += 1
+    return _connect(index, scope)
+
+
+def neighborhood(index: ModelIndex, vertex: Vertex, hops: int):
+    """
+    Get the goals, obstacles, and domain properties within a number of refinement hops of a vertex,
+    moving both up to parents and down to children.
+    :param ModelIndex index: The index of the model.
+    :param Vertex vertex: The vertex.
+    :param int hops: The number of hops.
+    :return set: The node ids in the slice.
+    """
+    scope = {vertex.node_id}
+    frontier = [vertex]
+    for _ in range(hops):
+        next_frontier = []
+        for current in frontier:
+            for other in index.parents(current) + index.children(current):
+                if other.node_id not in scope:
+                    scope.add(other.node_id)
+                    next_frontier.append(other)
+        frontier = next_frontier
+        if not frontier:
+            break
+    return _connect(index, scope)
+
+
+def depth_slice(index: ModelIndex, vertex: Vertex, depth: int = 2, ancestors: bool = True,
+                siblings: bool = True):
+    """
+    Get the slice for reviewing one vertex: its ancestors, its siblings, and depth levels of refinement below it.
+    :param ModelIndex index: The index of the model.
+    :param Vertex vertex: The vertex.
+    :param int depth: The number of refinement levels below the vertex.
+    :param bool ancestors: Include the path up to the top-level goals.
+    :param bool siblings: Include the other children of the refinements listing the vertex.
+    :return set: The node ids in the slice.
+    """
+    scope = descendants(index, vertex, depth)
+    if ancestors:
+        scope |= ancestor_path(index, vertex)
+    if siblings:
+        for refinement in index.parent_refinements(vertex):
+            owner = index.owner.get(refinement.node_id)
+            if owner is not None:
+                scope.add(owner.node_id)
+            scope.update(child.node_id for child in refinement.children)
+    return _connect(index, scope)
+
+
+def slice_roots(index: ModelIndex, scope: set):
+    """
+    Get the goals and obstacles of a slice that are not below another member of the slice.
+    :param ModelIndex index: The index of the model.
+    :param set scope: The slice.
+    :return list[Vertex]: The roots, in creation order.
+    """
+    roots = []
+    for node_id in sorted(scope):
+        vertex = index.vertices.get(node_id)
+        if not isinstance(vertex, (Goal, Obstacle)):
+            continue
+        if any(r.node_id in scope for r in index.containing.get(node_id, [])):
+            continue
+        roots.append(vertex)
+    return roots
+
+
+def slice_links(index: ModelIndex, scope: set):
+    """
+    Get the conflict, obstruction, and resolution links with both ends in a slice.
+    :param ModelIndex index: The index of the model.
+    :param set scope: The slice.
+    :return list: The links, in the order they were indexed.
+    """
+    links = {}
+    for node_id in scope:
+        for link in index.links_by_vertex.get(node_id, []):
+            first, second = link_endpoints(link)
+            if first.node_id in scope and second.node_id in scope:
+                links[id(link)] = link
+    return [links[key] for key in sorted(links, key=index.link_position.__getitem__)]
+
+
+def generate_slice(index: ModelIndex, scope: set):
+    """
+    Generate a Mermaid js diagram of a slice, with the links filtered to the slice.
+    :param ModelIndex index: The index of the model.
+    :param set scope: The slice.
+    :return str: The Mermaid diagram definition.
+    """
+    return generate_graph(slice_roots(index, scope), slice_links(index, scope), scope)
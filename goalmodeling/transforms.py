@@ -0,0 +1,276 @@
+"""
+Deriving new models from existing ones with map, filter, prune, and rewrite passes.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+
+A Transform is a chain of passes applied in one traversal of the model. Vertices are visited
+children first, and each goal, obstacle, domain property, and refinement is rebuilt only when a
+pass changes it or something below it; everything else is shared with the original model, which
+is never modified. Copies keep the node ids of the vertices they replace, like persistent
+versions, so the derived model draws with the same ids as the original.
+
+Passes run in the order they were added, on each vertex in turn, and a pass sees the children of
+a vertex as the whole chain left them. A chain of passes that each look at one vertex at a time,
+such as renaming or dropping by name or type, gives the same model as applying them one after
+the other.
+"""
+from .schema import (
+    Vertex,
+    Goal,
+    Obstacle,
+    Refinement,
+    ConflictLink,
+)
+
+
+def _copy(item):
+    """
+    Used internally for a shallow copy of a vertex or link, faster than copy.copy for these
+    plain classes.
+    """
+    changed = object.__new__(type(item))
+    changed.__dict__.update(item.__dict__)
+    return changed
+
+
+def updated(vertex: Vertex, **fields):
+    """
+    Copy a vertex with some of its attributes changed, for use in map and rewrite functions.
+    :param Vertex vertex: The vertex, left unchanged.
+    :param fields: The attributes to set on the copy.
+    :return Vertex: The copy, with the same node id.
+    """
+    changed = _copy(vertex)
+    for name, value in fields.items():
+        setattr(changed, name, value)
+    return changed
+
+
+def pattern(kind: type = None, **fields):
+    """
+    Make a match function for rewrite.
+    :param type kind: The class the vertex must be an instance of, if any.
+    :param fields: Attribute names mapped to the value the attribute must equal, or to a function
+        from the attribute to whether it matches.
+    :return: A function from a vertex to whether it matches.
+    """
+    def match(vertex):
+        if kind is not None and not isinstance(vertex, kind):
+            return False
+        for name, expected in fields.items():
+            if not hasattr(vertex, name):
+                return False
+            value = getattr(vertex, name)
+            if callable(expected) and not isinstance(expected, type):
+                if not expected(value):
+                    return False
+            elif value != expected:
+                return False
+        return True
+    return match
+
+
+def _structure(vertex: Vertex):
+    """
+    Get the name of the attribute holding what is below a vertex, if anything.
+    """
+    if isinstance(vertex, Goal):
+        return "disjunctions"
+    if isinstance(vertex, Obstacle):
+        return "refinements"
+    if isinstance(vertex, Refinement):
+        return "children"
+    return None
+
+
+class Transform:
+    """
+    An immutable chain of passes. Each method returns a new transform with one more pass, so a
+    transform can be kept and extended in several ways, and two transforms are chained with then
+    or +.
+
+    - map(function) replaces each goal, obstacle, and domain property with function(vertex).
+    - filter(predicate) drops the goals, obstacles, and domain properties it rejects.
+    - prune(predicate) drops the refinements it accepts.
+    - rewrite(match, replace) replaces each vertex, refinements included, for which match
+      returns a true value with replace(vertex, value), or drops it when that is None.
+
+    Functions return the vertex they were given to leave it unchanged, and use updated to change
+    it; a vertex modified in place would change the original model as well. A refinement left
+    without children is dropped, as are links touching a dropped vertex. Roots that are dropped
+    are left out of the result.
+    """
+    def __init__(self, passes: tuple = ()):
+        """
+        :param tuple passes: The passes, as (kind, function, argument) triples.
+        """
+        self.passes = tuple(passes)
+
+    def _with(self, kind: str, function, argument=None):
+        return Transform(self.passes + ((kind, function, argument),))
+
+    def map(self, function):
+        """
+        Add a pass replacing goals, obstacles, and domain properties.
+        :param function: A function from a vertex to its replacement.
+        :return Transform: The extended transform.
+        """
+        return self._with("map", function)
+
+    def filter(self, predicate):
+        """
+        Add a pass keeping only the goals, obstacles, and domain properties a predicate accepts.
+        :param predicate: A function from a vertex to whether to keep it.
+        :return Transform: The extended transform.
+        """
+        return self._with("filter", predicate)
+
+    def prune(self, predicate):
+        """
+        Add a pass dropping the refinements a predicate accepts.
+        :param predicate: A function from a refinement to whether to drop it.
+        :return Transform: The extended transform.
+        """
+        return self._with("prune", predicate)
+
+    def rewrite(self, match, replace):
+        """
+        Add a pass replacing the vertices matching a pattern.
+        :param match: A function from a vertex to a true value when it matches, such as one made
+            by pattern; the value is passed on to replace.
+        :param replace: A function from a matching vertex and the match value to its replacement,
+            or to None to drop it.
+        :return Transform: The extended transform.
+        """
+        return self._with("rewrite", replace, match)
+
+    def rename_prefix(self, old: str, new: str):
+        """
+        Add a pass replacing a prefix of goal, obstacle, and domain property names.
+        :param str old: The prefix to replace.
+        :param str new: Its replacement.
+        :return Transform: The extended transform.
+        """
+        def rename(vertex):
+            if vertex.name.startswith(old):
+                return updated(vertex, name=new + vertex.name[len(old):])
+            return vertex
+        return self.map(rename)
+
+    def then(self, other):
+        """
+        Chain another transform after this one, into one traversal.
+        :param Transform other: The transform to apply second.
+        :return Transform: The combined transform.
+        """
+        return Transform(self.passes + other.passes)
+
+    def __add__(self, other):
+        return self.then(other)
+
+    def __len__(self):
+        return len(self.passes)
+
+    def _visit(self, vertex: Vertex, attribute: str, done: dict):
+        """
+        Rebuild one vertex from its transformed children and run the passes on it.
+        :return: The new vertex, the same vertex when nothing changed, or None when dropped.
+        """
+        if attribute is not None:
+            below = getattr(vertex, attribute)
+            kept = []
+            changed = False
+            for item in below:
+                result = done.get(item.node_id, item)
+                if result is not item:
+                    changed = True
+                if result is not None:
+                    kept.append(result)
+            if changed:
+                if attribute == "children" and not kept:
+                    return None
+                vertex = _copy(vertex)
+                setattr(vertex, attribute, kept)
+        refinement = isinstance(vertex, Refinement)
+        for kind, function, argument in self.passes:
+            if kind == "map":
+                if not refinement:
+                    vertex = function(vertex)
+            elif kind == "filter":
+                if not refinement and not function(vertex):
+                    return None
+            elif kind == "prune":
+                if refinement and function(vertex):
+                    return None
+            else:
+                value = argument(vertex)
+                if value:
+                    vertex = function(vertex, value)
+            if vertex is None:
+                return None
+            refinement = isinstance(vertex, Refinement)
+        return vertex
+
+    def _run(self, start: Vertex, done: dict, entered: set):
+        """
+        Transform everything below a vertex, children first, without recursion.
+        """
+        stack = [(start, None)]
+        while stack:
+            vertex, ready = stack.pop()
+            if vertex.node_id in done:
+                continue
+            if ready is not None:
+                done[vertex.node_id] = self._visit(vertex, ready[0], done)
+                continue
+            if vertex.node_id in entered:
+                # Reached again below itself: a refinement cycle, left as it is.
+                continue
+            entered.add(vertex.node_id)
+            attribute = _structure(vertex)
+            stack.append((vertex, (attribute,)))
+            if attribute is not None:
+                for item in reversed(getattr(vertex, attribute)):
+                    if item.node_id not in done:
+                        stack.append((item, None))
+
+    def apply(self, roots: list[Vertex], links: list = None):
+        """
+        Derive a new model. The given model is not changed.
+        :param list[Vertex] roots: The root vertices.
+        :param list links: The conflict, obstruction, and resolution links.
+        :return tuple: The new roots and the new list of links.
+        """
+        links = list(links or [])
+        # node id -> the transformed vertex, or None when dropped.
+        done = {}
+        entered = set()
+        for root in roots:
+            self._run(root, done, entered)
+        new_roots = [done[root.node_id] for root in roots if done[root.node_id] is not None]
+
+        new_links = []
+        for link in links:
+            if type(link) == ConflictLink:
+                fields = ("goal1", "goal2")
+            else:
+                fields = ("goal", "obstacle")
+            ends = []
+            for name in fields:
+                end = getattr(link, name)
+                self._run(end, done, entered)
+                ends.append(done[end.node_id])
+            if any(end is None for end in ends):
+                continue
+            if all(end is getattr(link, name) for name, end in zip(fields, ends)):
+                new_links.append(link)
+                continue
+            new_link = _copy(link)
+            for name, end in zip(fields, ends):
+                setattr(new_link, name, end)
+            new_links.append(new_link)
+        return new_roots, new_links
+
+    def __call__(self, roots: list[Vertex], links: list = None):
+        return self.apply(roots, links)
@@ -0,0 +1,220 @@
+"""
+Checking a refinement graph for structural errors before rendering it.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+from enum import IntEnum
+
+from .schema import (
+    Vertex,
+    Goal,
+    Obstacle,
+    Refinement,
+    ConflictLink,
+    ObstructionLink,
+    ResolutionLink,
+)
+from .index import refinements_of
+
+
+class Severity(IntEnum):
+    """
+    How bad a problem is. Errors make the rendered diagram wrong or fail to render.
+    """
+    WARNING = 0
+    ERROR = 1
+
+
+class DiagnosticCode(IntEnum):
+    """
+    The problems the validator reports.
+    """
+    CYCLE = 0
+    EMPTY_REFINEMENT = 1
+    MIXED_REFINEMENT = 2
+    LINK_OUTSIDE_ROOTS = 3
+    AGENT_WITHOUT_OPERATION = 4
+
+
+class Diagnostic:
+    """
+    One problem found in a model.
+    """
+    def __init__(self,
+                 code: DiagnosticCode,
+                 severity: Severity,
+                 message: str,
+                 vertex: Vertex = None,
+                 link=None):
+        """
+        :param DiagnosticCode code: The kind of problem.
+        :param Severity severity: How bad the problem is.
+        :param str message: A readable description.
+        :param Vertex vertex: The vertex at fault, if any.
+        :param link: The conflict, obstruction, or resolution link at fault, if any.
+        """
+        self.code = code
+        self.severity = severity
+        self.message = message
+        self.vertex = vertex
+        self.link = link
+
+    def __repr__(self):
+        return f"Diagnostic({self.code.name}, {self.severity.name}, {self.message!r})"
+
+    def __str__(self):
+        return f"{self.severity.name.lower()}: {self.message}"
+
+
+class ValidationError(ValueError):
+    """
+    Raised by ensure_valid when a model has errors.
+    """
+    def __init__(self, diagnostics: list[Diagnostic]):
+        self.diagnostics = diagnostics
+        worst = max(diagnostics, key=lambda d: d.severity)
+        super().__init__(f"{len(diagnostics)} problem(s) in model; {worst}")
+
+
+def _describe(vertex: Vertex):
+    """
+    Used internally to name a vertex in a message.
+    """
+    name = getattr(vertex, "name", None)
+    return f'{vertex.get_node_id()} "{name}"' if name is not None else vertex.get_node_id()
+
+
+def _link_ends(link):
+    """
+    Used internally to split a link into the vertex generate_graph draws as a tree for it, if
+    any, and the vertices that must already be in the diagram.
+    """
+    if type(link) == ConflictLink:
+        return None, (link.goal1, link.goal2)
+    if type(link) == ObstructionLink:
+        return link.obstacle, (link.goal,)
+    if type(link) == ResolutionLink:
+        return link.goal, (link.obstacle,)
+    return None, ()
+
+
+def _below(vertex: Vertex):
+    """
+    Used internally to get the vertices one refinement level below a vertex.
+    """
+    if isinstance(vertex, Refinement):
+        return vertex.children
+    return refinements_of(vertex)
+
+
+def _check_vertex(vertex: Vertex, diagnostics: list[Diagnostic]):
+    """
+    Used internally to run the checks that need only the vertex and its direct edges.
+    """
+    if isinstance(vertex, Refinement):
+        if not vertex.children:
+            diagnostics.append(Diagnostic(
+                DiagnosticCode.EMPTY_REFINEMENT, Severity.ERROR,
+                f"refinement {vertex.get_node_id()} has no children",
+                vertex=vertex))
+            return
+        goals = obstacles = False
+        for child in vertex.children:
+            if isinstance(child, Obstacle):
+                obstacles = True
+            elif isinstance(child, Goal):
+                goals = True
+        if goals and obstacles:
+            diagnostics.append(Diagnostic(
+                DiagnosticCode.MIXED_REFINEMENT, Severity.ERROR,
+                f"refinement {vertex.get_node_id()} mixes goals and obstacles",
+                vertex=vertex))
+    elif isinstance(vertex, Goal):
+        for perform in vertex.performs:
+            if perform.operation is None:
+                diagnostics.append(Diagnostic(
+                    DiagnosticCode.AGENT_WITHOUT_OPERATION, Severity.WARNING,
+                    f"agent {_describe(perform.agent)} performs {_describe(vertex)} without an operation",
+                    vertex=perform.agent))
+
+
+def validate(roots: list[Vertex], links: list = None):
+    """
+    Check a model in one depth-first pass over its vertices and edges.
+
+    Reported problems are refinement cycles, refinements without children, refinements mixing
+    goals and obstacles, links to vertices that the roots and links do not reach, and agents
+    performing a goal without an operation.
+    :param list[Vertex] roots: The root goals, as passed to generate_graph.
+    :param list links: The conflict, obstruction, and resolution links.
+    :return list[Diagnostic]: The problems, in the order found.
+    """
+    links = links or []
+    diagnostics = []
+    # node id -> True while on the walk path, False once finished.
+    state = {}
+
+    starts = list(roots)
+    for link in links:
+        drawn, _ = _link_ends(link)
+        if drawn is not None:
+            starts.append(drawn)
+
+    for start in starts:
+        if start.node_id in state:
+            continue
+        state[start.node_id] = True
+        _check_vertex(start, diagnostics)
+        stack = [(start, iter(_below(start)))]
+        while stack:
+            vertex, successors = stack[-1]
+            for successor in successors:
+                seen = state.get(successor.node_id)
+                if seen is None:
+                    state[successor.node_id] = True
+                    _check_vertex(successor, diagnostics)
+                    stack.append((successor, iter(_below(successor))))
+                    break
+                if seen:
+                    diagnostics.append(Diagnostic(
+                        DiagnosticCode.CYCLE, Severity.ERROR,
+                        f"{_describe(successor)} is refined by its own descendant {_describe(vertex)}",
+                        vertex=successor))
+            else:
+                state[vertex.node_id] = False
+                stack.pop()
+
+    for link in links:
+        _, required = _link_ends(link)
+        for vertex in required:
+            if vertex.node_id not in state:
+                diagnostics.append(Diagnostic(
+                    DiagnosticCode.LINK_OUTSIDE_ROOTS, Severity.WARNING,
+                    f"link {type(link).__name__} points at {_describe(vertex)}, "
+                    f"which is not reachable from the roots",
+                    vertex=vertex, link=link))
+
+    return diagnostics
+
+
+def errors(diagnostics: list[Diagnostic]):
+    """
+    Keep only the diagnostics that are errors.
+    :return list[Diagnostic]: The errors.
+    """
+    return [d for d in diagnostics if d.severity == Severity.ERROR]
+
+
+def ensure_valid(roots: list[Vertex], links: list = None, strict: bool = False):
+    """
+    Validate a model before rendering it and raise if it has errors.
+    :param list[Vertex] roots: The root goals.
+    :param list links: The conflict, obstruction, and resolution links.
+    :param bool strict: Also raise on warnings.
+    :return list[Diagnostic]: The warnings, when no exception is raised.
+    """
+    diagnostics = validate(roots, links)
+    if any(strict or d.severity == Severity.ERROR for d in diagnostics):
+        raise ValidationError(diagnostics)
+    return diagnostics
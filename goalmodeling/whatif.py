@@ -0,0 +1,181 @@
+"""
+Evaluating many leaf-assignment and obstacle-occurrence scenarios against one model at once.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+from .schema import (
+    Vertex,
+    Refinement,
+    DomainProperty,
+    ObstructionLink,
+    ResolutionLink,
+)
+from .index import ModelIndex, refinements_of
+from .evaluation import dependencies, topological_order
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class BatchPlan:
+    """
+    A model compiled once into levels of bitwise operations.
+
+    Every vertex gets a slot. A slot holds one bit per scenario, either as a Python int or,
+    when the scenarios come as a NumPy array, as a boolean vector. Each level only reads slots
+    written by earlier levels. An input replaces what the refinements of its vertex give, but
+    an input goal can still be obstructed and an input obstacle resolved.
+
+    The evaluation is two-valued: a refinement holds when all its children hold, a goal or
+    obstacle holds when one of its refinements holds, an occurring obstacle denies the goals it
+    obstructs, and a satisfied goal prevents the obstacles it resolves. Whether a refinement is
+    complete does not matter here. Leaves that are not inputs are fixed: goals and obstacles do
+    not hold and domain properties do. With every leaf an input, the result matches Evaluation
+    reading weakly satisfied as satisfied.
+    """
+    def __init__(self,
+                 roots: list[Vertex],
+                 links: list = None,
+                 inputs: list[Vertex] = None,
+                 index: ModelIndex = None):
+        """
+        Compile a model.
+        :param list[Vertex] roots: The root goals, whose results are reported.
+        :param list links: The conflict, obstruction, and resolution links.
+        :param list[Vertex] inputs: The vertices given a value by each scenario, in column order.
+            Defaults to every goal and obstacle without refinements, in discovery order.
+        :param ModelIndex index: An index of the model, if one was already built.
+        """
+        self.index = index if index is not None else ModelIndex(roots, links)
+        self.roots = list(roots)
+        if inputs is None:
+            inputs = [v for v in self.index.vertices.values()
+                      if not isinstance(v, (Refinement, DomainProperty)) and not refinements_of(v)]
+        self.inputs = list(inputs)
+
+        order, cyclic = topological_order(self.index)
+        # node id -> slot. Slot 0 always holds nothing and slot 1 everything; vertices on a
+        # cycle share slot 0. The inputs get raw slots after the vertex slots.
+        self.slots = {}
+        for vertex in order:
+            self.slots[vertex.node_id] = len(self.slots) + 2
+        for vertex in cyclic:
+            self.slots[vertex.node_id] = 0
+        self.cyclic = cyclic
+        raw = {}
+        for vertex in self.inputs:
+            raw.setdefault(vertex.node_id, len(self.slots) + 2 + len(raw))
+        self.input_slots = [raw[v.node_id] for v in self.inputs]
+        self.size = len(self.slots) + 2 + len(raw)
+
+        # Each operation is (slot, conjunction, sources, blockers). The slot holds when all
+        # sources hold, for a conjunction, or any source holds otherwise, and no blocker holds.
+        level = {}
+        self.levels = []
+        for vertex in order:
+            depends = dependencies(self.index, vertex)
+            if vertex.node_id in raw:
+                depends = [d for d in depends if not isinstance(d, Refinement)]
+            depth = 1 + max((level[d.node_id] for d in depends if d.node_id in level), default=0)
+            level[vertex.node_id] = depth
+            while len(self.levels) < depth:
+                self.levels.append([])
+            self.levels[depth - 1].append(self._compile(vertex, raw.get(vertex.node_id)))
+
+    def _compile(self, vertex: Vertex, raw: int = None):
+        slots = self.slots
+        slot = slots[vertex.node_id]
+        if raw is None and isinstance(vertex, Refinement):
+            return slot, True, tuple(slots[c.node_id] for c in vertex.children), ()
+        refinements = refinements_of(vertex)
+        if raw is not None:
+            sources = (raw,)
+        elif refinements:
+            sources = tuple(slots[r.node_id] for r in refinements)
+        elif isinstance(vertex, DomainProperty):
+            sources = (1,)
+        else:
+            sources = ()
+        blockers = []
+        for link in self.index.links_of(vertex):
+            if type(link) == ObstructionLink and link.goal is vertex:
+                blockers.append(slots[link.obstacle.node_id])
+            elif type(link) == ResolutionLink and link.obstacle is vertex:
+                blockers.append(slots[link.goal.node_id])
+        return slot, False, sources, tuple(blockers)
+
+    def run_bits(self, columns: list[int], n_scenarios: int):
+        """
+        Evaluate scenarios given as one bitset per input, bit i being scenario i.
+        :param list[int] columns: The bitsets, in the order of inputs.
+        :param int n_scenarios: The number of scenarios.
+        :return dict: Every root mapped to the bitset of scenarios satisfying it.
+        """
+        full = (1 << n_scenarios) - 1
+        return self._run(columns, 0, full, lambda x: full ^ x)
+
+    def run(self, scenarios):
+        """
+        Evaluate scenarios given as an n_scenarios by n_inputs boolean matrix.
+
+        With a NumPy array the slots are boolean vectors and the result holds NumPy arrays.
+        Otherwise the matrix is a sequence of rows, the slots are packed into Python ints, and
+        the result holds lists of bools.
+        :param scenarios: The matrix, one row per scenario and one column per input.
+        :return dict: Every root mapped to whether each scenario satisfies it.
+        """
+        if numpy is not None and isinstance(scenarios, numpy.ndarray):
+            matrix = numpy.asarray(scenarios, dtype=bool)
+            n = matrix.shape[0]
+            columns = list(numpy.ascontiguousarray(matrix.T))
+            results = self._run(columns, numpy.zeros(n, dtype=bool), numpy.ones(n, dtype=bool),
+                                numpy.logical_not)
+            return results
+
+        rows = list(scenarios)
+        n = len(rows)
+        columns = [0] * len(self.inputs)
+        for j in range(len(self.inputs)):
+            bits = "".join("1" if rows[i][j] else "0" for i in range(n - 1, -1, -1))
+            columns[j] = int(bits, 2) if bits else 0
+        results = self.run_bits(columns, n)
+        return {root: [bool(bits >> i & 1) for i in range(n)] for root, bits in results.items()}
+
+    def _run(self, columns, empty, full, invert):
+        if len(columns) != len(self.inputs):
+            raise ValueError(f"expected {len(self.inputs)} input columns, got {len(columns)}")
+        values = [empty] * self.size
+        values[1] = full
+        for slot, column in zip(self.input_slots, columns):
+            values[slot] = column
+        for operations in self.levels:
+            for slot, conjunction, sources, blockers in operations:
+                if conjunction:
+                    value = full if sources else empty
+                    for source in sources:
+                        value = value & values[source]
+                else:
+                    value = empty
+                    for source in sources:
+                        value = value | values[source]
+                if blockers:
+                    blocked = empty
+                    for source in blockers:
+                        blocked = blocked | values[source]
+                    value = value & invert(blocked)
+                values[slot] = value
+        return {root: values[self.slots.get(root.node_id, 0)] for root in self.roots}
+
+
+def compile_plan(roots: list[Vertex], links: list = None, inputs: list[Vertex] = None):
+    """
+    Compile a model for batch evaluation.
+    :param list[Vertex] roots: The root goals.
+    :param list links: The conflict, obstruction, and resolution links.
+    :param list[Vertex] inputs: The vertices given a value by each scenario.
+    :return BatchPlan: The plan.
+    """
+    return BatchPlan(roots, links, inputs)
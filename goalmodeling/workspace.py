@@ -0,0 +1,284 @@
+"""
+A workspace holding one model and named views of it, rendered together with shared fragments.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+from collections import deque
+
+from .schema import (
+    Vertex,
+    Goal,
+    ObstructionLink,
+    ResolutionLink,
+    diagram_startup,
+    diagram_teardown,
+)
+from .index import ModelIndex, refinements_of, link_endpoints
+from .fragments import format_pieces, expand
+
+
+def _same(vertex):
+    return vertex
+
+
+def _children(refinement):
+    return refinement.children
+
+
+class View:
+    """
+    A named selection of a workspace model drawn as its own diagram.
+    """
+    def __init__(self,
+                 name: str,
+                 roots: list[Vertex] = None,
+                 include=None,
+                 depth: int = None,
+                 links: bool = True):
+        """
+        :param str name: The name of the view.
+        :param list[Vertex] roots: The goals the view starts from, by default the workspace roots.
+        :param include: A function from a vertex to whether the view shows it; a vertex left out
+            hides its subtree unless another shown parent reaches it. Roots are always shown.
+        :param int depth: The most refinement levels below the roots, or None for no limit.
+        :param bool links: Whether to draw the links between shown vertices, with the obstacles
+            obstructing shown goals and the goals resolving shown obstacles.
+        """
+        self.name = name
+        self.roots = list(roots) if roots is not None else None
+        self.include = include
+        self.depth = depth
+        self.links = links
+
+    def is_full(self):
+        """
+        Whether the view shows the whole model.
+        """
+        return self.roots is None and self.include is None and self.depth is None and self.links
+
+
+class Workspace:
+    """
+    Owns a model and the views defined on it.
+
+    Every view is drawn with its own visited set, so views never hide each other's vertices. The
+    text of a goal or obstacle is kept as fragments between renders and between views: a vertex
+    shown with all its refinements and children is formatted once for every view showing it
+    that way, and a vertex a view shows partially is formatted once for each such selection.
+    After changing a vertex, call invalidate, or edit the structure through the workspace.
+    """
+    def __init__(self, roots: list[Vertex], links: list = None, index: ModelIndex = None):
+        """
+        :param list[Vertex] roots: The root goals.
+        :param list links: The conflict, obstruction, and resolution links.
+        :param ModelIndex index: An index of the model, if one was already built.
+        """
+        self.roots = list(roots)
+        self.links = list(links or [])
+        self.index = index if index is not None else ModelIndex(self.roots, self.links)
+        self.views = {}
+        self.hits = 0
+        self.misses = 0
+        # node id -> excluded child ids -> pieces; view name -> scope; view name -> node id ->
+        # pieces, so a view rendered again skips working out what it excludes.
+        self._fragments = {}
+        self._scopes = {}
+        self._chosen = {}
+        # agent or operation node id -> node ids of the goals whose fragments draw it.
+        self._performers = {}
+
+    def add_view(self, name: str, roots: list[Vertex] = None, include=None, depth: int = None,
+                 links: bool = True):
+        """
+        Define a view, replacing any view with the same name. See View for the arguments.
+        :return View: The view.
+        """
+        view = View(name, roots, include, depth, links)
+        self.views[name] = view
+        self._scopes.pop(name, None)
+        self._chosen.pop(name, None)
+        return view
+
+    def remove_view(self, name: str):
+        self.views.pop(name)
+        self._scopes.pop(name, None)
+        self._chosen.pop(name, None)
+
+    def scope(self, name: str):
+        """
+        Get the node ids a view shows.
+        :return set: The node ids of the shown goals, obstacles, domain properties, and
+            refinements, or None for a view of the whole model.
+        """
+        if name in self._scopes:
+            return self._scopes[name]
+        view = self.views[name]
+        scope = None if view.is_full() else self._select(view)
+        self._scopes[name] = scope
+        return scope
+
+    def _select(self, view: View):
+        include = view.include
+        scope = set()
+        queue = deque()
+
+        def start(vertex):
+            if vertex.node_id not in scope:
+                scope.add(vertex.node_id)
+                queue.append((vertex, 0))
+
+        def spread():
+            while queue:
+                vertex, level = queue.popleft()
+                if view.depth is not None and level >= view.depth:
+                    continue
+                for refinement in refinements_of(vertex):
+                    kept = [c for c in refinement.children if include is None or include(c)]
+                    if not kept:
+                        continue
+                    scope.add(refinement.node_id)
+                    for child in kept:
+                        if child.node_id not in scope:
+                            scope.add(child.node_id)
+                            queue.append((child, level + 1))
+
+        for root in view.roots if view.roots is not None else self.roots:
+            start(root)
+        spread()
+        # Obstacles of shown goals and goals resolving shown obstacles, and what they bring in.
+        changed = view.links
+        while changed:
+            changed = False
+            for link in self.links:
+                if type(link) == ObstructionLink:
+                    anchor, carried = link.goal, link.obstacle
+                elif type(link) == ResolutionLink:
+                    anchor, carried = link.obstacle, link.goal
+                else:
+                    continue
+                if anchor.node_id in scope and carried.node_id not in scope \
+                        and (include is None or include(carried)):
+                    start(carried)
+                    changed = True
+            spread()
+        return scope
+
+    def _pieces(self, vertex: Vertex, scope: set):
+        excluded = ()
+        if scope is not None:
+            excluded = []
+            for refinement in refinements_of(vertex):
+                if refinement.node_id not in scope:
+                    excluded.append(refinement.node_id)
+                    continue
+                excluded.extend(c.node_id for c in refinement.children if c.node_id not in scope)
+            excluded = tuple(excluded)
+        entries = self._fragments.setdefault(vertex.node_id, {})
+        pieces = entries.get(excluded)
+        if pieces is not None:
+            self.hits += 1
+            return pieces
+        self.misses += 1
+        performs = vertex.performs if isinstance(vertex, Goal) else ()
+        for perform in performs:
+            self._performers.setdefault(perform.agent.node_id, set()).add(vertex.node_id)
+            if perform.operation is not None:
+                self._performers.setdefault(perform.operation.node_id, set()).add(vertex.node_id)
+        pieces = format_pieces(vertex, refinements_of(vertex), performs, _same, _children,
+                               scope if excluded else None)
+        entries[excluded] = pieces
+        return pieces
+
+    def render(self, name: str):
+        """
+        Generate the Mermaid js diagram of a view. It is the text generate_graph makes for the
+        roots and links of the view with its scope.
+        :param str name: The view name.
+        :return str: The diagram definition.
+        """
+        view = self.views[name]
+        scope = self.scope(name)
+        chosen = self._chosen.setdefault(name, {})
+
+        def pieces_of(vertex):
+            pieces = chosen.get(vertex.node_id)
+            if pieces is None:
+                pieces = chosen[vertex.node_id] = self._pieces(vertex, scope)
+            else:
+                self.hits += 1
+            return pieces
+
+        output = [diagram_startup()]
+        visited = set()
+        for root in view.roots if view.roots is not None else self.roots:
+            expand(root, visited, output, pieces_of)
+        for link in self.links if view.links else []:
+            if scope is not None and not all(v.node_id in scope for v in link_endpoints(link)):
+                continue
+            if type(link) == ObstructionLink:
+                expand(link.obstacle, visited, output, pieces_of)
+            elif type(link) == ResolutionLink:
+                expand(link.goal, visited, output, pieces_of)
+            output.append(link.to_string())
+            output.append("\n")
+        output.append(diagram_teardown())
+        return "".join(output)
+
+    def render_all(self, names: list[str] = None):
+        """
+        Render several views in one batch, sharing fragments between them.
+        :param list[str] names: The views, by default all of them.
+        :return dict: The view names mapped to their diagram definitions.
+        """
+        return {name: self.render(name) for name in (names if names is not None else self.views)}
+
+    def invalidate(self, vertex: Vertex = None):
+        """
+        Drop the fragments that show a changed vertex: its own, those of the goals and
+        obstacles it refines, whose text holds its name, and for an agent or operation those of
+        the goals performed through it. Scopes are recomputed too, as filters may depend on what
+        changed.
+        :param Vertex vertex: The changed vertex, or None to drop everything.
+        """
+        self._scopes.clear()
+        self._chosen.clear()
+        if vertex is None:
+            self._fragments.clear()
+            self._performers.clear()
+            return
+        self._fragments.pop(vertex.node_id, None)
+        for parent in self.index.parents(vertex):
+            self._fragments.pop(parent.node_id, None)
+        for goal in self._performers.pop(vertex.node_id, ()):
+            self._fragments.pop(goal, None)
+
+    def add_refinement(self, parent: Vertex, refinement):
+        """
+        Append a refinement to a goal or obstacle.
+        """
+        self.index.add_refinement(parent, refinement)
+        self.invalidate(parent)
+
+    def add_child(self, refinement, child: Vertex):
+        """
+        Append a child to a refinement.
+        """
+        self.index.add_child(refinement, child)
+        self.invalidate(refinement)
+
+    def add_link(self, link):
+        """
+        Add a conflict, obstruction, or resolution link.
+        """
+        self.links.append(link)
+        self.index.add_link(link)
+        self._scopes.clear()
+        self._chosen.clear()
+
+    def stats(self):
+        """
+        Get the fragment counters.
+        :return dict: The number of vertices with fragments, hits, and misses.
+        """
+        return {"vertices": len(self._fragments), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,116 @@
+"""
+Tests for rendering from asyncio.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+import asyncio
+import gc
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from goalmodeling.aio import AsyncRenderer, RenderCancelled, _render_graph
+from goalmodeling.examples import MODELS
+from goalmodeling.lod import LevelOfDetail
+from goalmodeling.profiling import RenderProfile
+from goalmodeling.schema import AchieveGoal, Refinement, generate_graph, generate_pako_link
+
+
+def run(coroutine_function):
+    async def main():
+        async with AsyncRenderer(max_concurrent=2) as renderer:
+            return await coroutine_function(renderer)
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("name", sorted(MODELS))
+def test_same_output_as_generate_graph(name):
+    roots, links = MODELS[name]()
+    expected = generate_graph(roots, links)
+    output, link = run(lambda renderer: asyncio.gather(
+        renderer.generate_graph(roots, links),
+        renderer.generate_pako_link(expected)))
+    assert output == expected
+    assert link == generate_pako_link(expected)
+
+
+def test_scope_lod_and_profile_are_passed_on():
+    roots, links = MODELS[sorted(MODELS)[0]]()
+    scope = {roots[0].node_id}
+    lod = LevelOfDetail(max_depth=1)
+    profile = RenderProfile()
+    scoped = run(lambda renderer: renderer.generate_graph(roots, links, scope=scope))
+    collapsed = run(lambda renderer: renderer.generate_graph(roots, links, lod=lod, profile=profile))
+    assert scoped == generate_graph(roots, links, scope=scope)
+    assert collapsed == generate_graph(roots, links, lod=LevelOfDetail(max_depth=1))
+    assert "tree" in profile.to_dict()["phases"]
+
+
+def test_pako_link_over_several_chunks():
+    text = "".join(f"node{i}[/\"Achieve[{i}]\"/]\n" for i in range(20000))
+    link = run(lambda renderer: renderer.generate_pako_link(text))
+    assert link == generate_pako_link(text)
+
+
+def test_cancelled_check_stops_the_render():
+    cancelled = threading.Event()
+    cancelled.set()
+    roots, links = MODELS[sorted(MODELS)[0]]()
+    with pytest.raises(RenderCancelled):
+        _render_graph(roots, links, None, None, None, cancelled)
+
+
+def test_semaphores_do_not_keep_loops_alive():
+    renderer = AsyncRenderer()
+    roots, links = MODELS[sorted(MODELS)[0]]()
+    try:
+        for _ in range(3):
+            asyncio.run(renderer.generate_graph(roots, links))
+        gc.collect()
+        assert len(renderer._semaphores) == 0
+    finally:
+        renderer.close()
+
+
+def test_cancelled_inside_a_single_root():
+    calls = []
+
+    def check():
+        calls.append(None)
+        if len(calls) == 3:
+            raise RenderCancelled()
+
+    roots, links = MODELS[sorted(MODELS)[0]]()
+    with pytest.raises(RenderCancelled):
+        generate_graph(roots[:1], [], check=check)
+    assert len(calls) == 3
+
+
+def test_cancelled_during_the_traversal_of_one_root():
+    cancelled = threading.Event()
+    drawn = []
+
+    class Watched(AchieveGoal):
+        def to_string(self):
+            drawn.append(self.name)
+            if self.name == "Goal 150":
+                cancelled.set()
+            return super().to_string()
+
+    chain = Watched("Leaf", leaf=True)
+    for i in range(300):
+        chain = Watched(f"Goal {i}", refinements=[Refinement(True, [chain])])
+    with pytest.raises(RenderCancelled):
+        _render_graph([chain], [], None, None, None, cancelled)
+    assert len(drawn) < 300
+
+
+def test_process_pools_are_rejected():
+    executor = ProcessPoolExecutor(max_workers=1)
+    try:
+        with pytest.raises(TypeError):
+            AsyncRenderer(executor=executor)
+    finally:
+        executor.shutdown()
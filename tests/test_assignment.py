@@ -0,0 +1,69 @@
+"""
+Tests that proposed agent assignments respect capabilities and capacities and cost the least.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+import random
+from itertools import product
+
+import pytest
+
+from goalmodeling.assignment import AgentProfile, Requirement, assign
+from goalmodeling.responsibility import ResponsibilityIndex
+from goalmodeling.schema import AchieveGoal, Agent, AgentType, Operation, OperationCategory, PerformanceLink, Refinement
+
+
+def instance(rng: random.Random):
+    agents = [Agent(f"Agent {i}", rng.choice(list(AgentType))) for i in range(3)]
+    leaves = [AchieveGoal(f"Goal {i}", leaf=True) for i in range(6)]
+    done = AchieveGoal("Done", leaf=True, performs=[
+        PerformanceLink(agents[0], Operation("Done", OperationCategory.ENVIRONMENT_OPERATION))])
+    root = AchieveGoal("Root", refinements=[Refinement(True, leaves + [done])])
+    profiles = [AgentProfile(agent, set(OperationCategory), capacity=rng.choice([None, 2, 3]),
+                             cost=rng.choice([1.0, 2.0, 3.5])) for agent in agents]
+    needs = {goal.node_id: Requirement(agent_types=set(rng.sample(list(AgentType), rng.randint(1, 2))))
+             for goal in leaves}
+    return ResponsibilityIndex([root]), profiles, lambda goal: needs[goal.node_id]
+
+
+def best(responsibilities, profiles, requirement):
+    # Every way of giving each goal an allowed agent or none: most goals placed, then least cost.
+    goals = responsibilities.uncovered()
+    options = [[None] + [p for p in profiles if requirement(goal).allows(p)] for goal in goals]
+    result = None
+    for choice in product(*options):
+        loads = [responsibilities.load(p.agent) + choice.count(p) for p in profiles]
+        if any(p.capacity is not None and n > p.capacity for p, n in zip(profiles, loads)):
+            continue
+        placed = sum(c is not None for c in choice)
+        cost = sum(p.cost * n * (n + 1) / 2 for p, n in zip(profiles, loads))
+        if result is None or (-placed, cost) < result:
+            result = (-placed, cost)
+    return -result[0], result[1]
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_assignment_is_optimal(seed):
+    responsibilities, profiles, requirement = instance(random.Random(seed))
+    assignment = assign(responsibilities, profiles, requirement)
+    for goal, profile in assignment.goals.items():
+        assert requirement(goal).allows(profile)
+    for profile, load in zip(profiles, assignment.loads):
+        assert profile.capacity is None or load <= profile.capacity
+        assert load == responsibilities.load(profile.agent) + sum(
+            p is profile for p in assignment.goals.values())
+    placed, cost = best(responsibilities, profiles, requirement)
+    assert len(assignment.goals) == placed
+    assert assignment.cost() == pytest.approx(cost)
+
+
+def test_apply_covers_the_goals():
+    agent = Agent("Clerk", AgentType.ENVIRONMENT_AGENT)
+    goals = [AchieveGoal(f"Goal {i}", leaf=True) for i in range(3)]
+    responsibilities = ResponsibilityIndex([AchieveGoal("Root", refinements=[Refinement(True, goals)])])
+    assignment = assign(responsibilities, [AgentProfile(agent, capacity=2)])
+    assert len(assignment.unassigned) == 1
+    assert assignment.apply(responsibilities) == 2
+    assert len(responsibilities.uncovered()) == 1
+    assert responsibilities.load(agent) == 2
@@ -0,0 +1,50 @@
+"""
+Tests for the row errors of the bulk loader.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+from goalmodeling.bulk import loads_csv
+from goalmodeling.schema import generate_graph
+
+
+def names(vertices):
+    return [vertex.name for vertex in vertices]
+
+
+def children(goal):
+    return [child.name for refinement in goal.disjunctions for child in refinement.children]
+
+
+def test_cycle_and_self_parent_are_reported_and_kept_as_roots():
+    roots, links, errors = loads_csv("id,kind,parent\na,Achieve,b\nb,Achieve,a\nc,Achieve,c\n")
+    assert names(roots) == ["a", "b", "c"]
+    assert [(error.line, error.column) for error in errors] == [(2, "parent"), (3, "parent"), (4, "parent")]
+    assert all("cycle" in error.message for error in errors)
+    assert generate_graph(roots, links)
+
+
+def test_vertices_below_a_cycle_stay_attached():
+    roots, _, errors = loads_csv("id,kind,parent\na,Achieve,b\nb,Achieve,a\nd,Achieve,a\ne,Achieve,d\n")
+    assert names(roots) == ["a", "b"]
+    assert children(roots[0]) == ["d"]
+    assert children(roots[0].disjunctions[0].children[0]) == ["e"]
+    assert [error.line for error in errors] == [2, 3]
+
+
+def test_cycle_through_refinement_table():
+    roots, _, errors = loads_csv("id,kind,parent\na,Achieve,r1\nb,Achieve,a\n", "id,parent\nr1,b\n")
+    assert names(roots) == ["a", "b"]
+    assert [error.line for error in errors] == [2, 3]
+
+
+def test_tree_has_no_errors():
+    roots, _, errors = loads_csv("id,kind,parent\nroot,Achieve,\nx,Achieve,root\ny,Obstacle,x\n")
+    assert errors == []
+    assert names(roots) == ["root"]
+
+
+def test_unknown_parent_is_kept_as_root():
+    roots, _, errors = loads_csv("id,kind,parent\na,Achieve,missing\n")
+    assert names(roots) == ["a"]
+    assert "unknown parent" in errors[0].message
@@ -0,0 +1,94 @@
+"""
+Tests that minimal cut sets are exactly the minimal sets of leaf obstacles obstructing a goal.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+import random
+from itertools import combinations
+
+import pytest
+
+from goalmodeling.cutsets import CutSetAnalysis
+from goalmodeling.schema import AchieveGoal, Obstacle, ObstructionLink, Refinement
+
+
+def random_model(rng: random.Random):
+    leaves = [Obstacle(f"leaf {i}") for i in range(rng.randint(3, 7))]
+
+    def obstacle(depth):
+        if depth == 0 or rng.random() < 0.4:
+            return rng.choice(leaves)
+        return Obstacle(f"obstacle {depth}", refinements=[
+            Refinement(True, [obstacle(depth - 1) for _ in range(rng.randint(1, 2))])
+            for _ in range(rng.randint(1, 2))])
+
+    links = []
+
+    def goal(depth):
+        if depth == 0 or rng.random() < 0.3:
+            result = AchieveGoal(f"leaf goal {depth}", leaf=True)
+        else:
+            result = AchieveGoal(f"goal {depth}", refinements=[
+                Refinement(True, [goal(depth - 1) for _ in range(rng.randint(1, 3))])
+                for _ in range(rng.randint(1, 2))])
+        for _ in range(rng.choice([0, 0, 1, 2])):
+            links.append(ObstructionLink(result, obstacle(2)))
+        return result
+
+    return goal(3), links
+
+
+def obstructed(vertex, occurring: set, links: list):
+    # A direct reading of the semantics, independent of the bitset families.
+    if isinstance(vertex, Obstacle):
+        if not vertex.refinements:
+            return vertex.node_id in occurring
+        return any(all(obstructed(c, occurring, links) for c in r.children if isinstance(c, Obstacle))
+                   for r in vertex.refinements)
+    if any(link.goal is vertex and obstructed(link.obstacle, occurring, links) for link in links):
+        return True
+    return bool(vertex.disjunctions) and all(
+        any(obstructed(c, occurring, links) for c in r.children) for r in vertex.disjunctions)
+
+
+def brute_force(root, links, leaves):
+    found = []
+    for size in range(len(leaves) + 1):
+        for subset in combinations(leaves, size):
+            ids = {o.node_id for o in subset}
+            if any(m <= ids for m in found):
+                continue
+            if obstructed(root, ids, links):
+                found.append(ids)
+    return sorted(sorted(s) for s in found)
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_cut_sets_are_exactly_the_minimal_ones(seed):
+    root, links = random_model(random.Random(seed))
+    analysis = CutSetAnalysis([root], links)
+    cuts = analysis.cut_sets(root)
+    assert not cuts.truncated
+    assert sorted(sorted(o.node_id for o in cut) for cut in cuts) == brute_force(root, links, analysis.leaves)
+
+
+def test_smallest_first_and_single_points():
+    single, first, second = Obstacle("Single"), Obstacle("First"), Obstacle("Second")
+    pair = Obstacle("Pair", refinements=[Refinement(True, [first, second])])
+    goal = AchieveGoal("Goal", leaf=True)
+    cuts = CutSetAnalysis([goal], [ObstructionLink(goal, pair), ObstructionLink(goal, single)]).cut_sets(goal)
+    assert [len(cut) for cut in cuts] == [1, 2]
+    assert cuts.single_points() == [single]
+    assert cuts.importance()[0][0] is single
+
+
+def test_caps_mark_the_result_truncated():
+    first, second = Obstacle("First"), Obstacle("Second")
+    pair = Obstacle("Pair", refinements=[Refinement(True, [first, second])])
+    goal = AchieveGoal("Goal", leaf=True)
+    links = [ObstructionLink(goal, pair), ObstructionLink(goal, Obstacle("Single"))]
+    cuts = CutSetAnalysis([goal], links, max_order=1).cut_sets(goal)
+    assert cuts.truncated and [len(cut) for cut in cuts] == [1]
+    cuts = CutSetAnalysis([goal], links, top_k=1).cut_sets(goal)
+    assert cuts.truncated and len(cuts) == 1
@@ -0,0 +1,95 @@
+"""
+Tests for label propagation and incremental re-evaluation.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+import random
+
+from benchmarks.generator import generate_model
+from goalmodeling.evaluation import Evaluation, Label
+from goalmodeling.schema import AchieveGoal, Goal, Obstacle, ObstructionLink, Refinement, ResolutionLink
+
+
+def test_and_refinement_takes_the_worst_child():
+    first, second = AchieveGoal("First", leaf=True), AchieveGoal("Second", leaf=True)
+    root = AchieveGoal("Root", refinements=[Refinement(True, [first, second])])
+    assert Evaluation([root], [], {first: True, second: True}).label(root) == Label.SATISFIED
+    assert Evaluation([root], [], {first: True, second: False}).label(root) == Label.DENIED
+    assert Evaluation([root], [], {first: True}).label(root) == Label.UNKNOWN
+
+
+def test_incomplete_refinement_is_weakened():
+    leaf = AchieveGoal("Leaf", leaf=True)
+    root = AchieveGoal("Root", refinements=[Refinement(False, [leaf])])
+    assert Evaluation([root], [], {leaf: True}).label(root) == Label.WEAKLY_SATISFIED
+
+
+def test_alternatives_take_the_best():
+    first, second = AchieveGoal("First", leaf=True), AchieveGoal("Second", leaf=True)
+    root = AchieveGoal("Root", refinements=[Refinement(True, [first]), Refinement(True, [second])])
+    assert Evaluation([root], [], {first: False, second: True}).label(root) == Label.SATISFIED
+
+
+def test_shared_refinement():
+    leaf = AchieveGoal("Leaf", leaf=True)
+    shared = Refinement(True, [leaf])
+    first = AchieveGoal("First", refinements=[shared])
+    second = AchieveGoal("Second", refinements=[shared, shared])
+    root = AchieveGoal("Root", refinements=[Refinement(True, [first, second])])
+    evaluation = Evaluation([root], [], {leaf: True})
+    assert not evaluation.cyclic
+    assert [evaluation.label(v) for v in (first, second, root)] == [Label.SATISFIED] * 3
+    changed = evaluation.assign(leaf, False)
+    assert {first, second, root} <= set(changed)
+    assert evaluation.label(root) == Label.DENIED
+
+
+def test_shared_goal():
+    leaf = AchieveGoal("Leaf", leaf=True)
+    first = AchieveGoal("First", refinements=[Refinement(True, [leaf])])
+    second = AchieveGoal("Second", refinements=[Refinement(True, [leaf])])
+    root = AchieveGoal("Root", refinements=[Refinement(True, [first, second])])
+    assert Evaluation([root], [], {leaf: True}).label(root) == Label.SATISFIED
+
+
+def test_obstruction_and_resolution():
+    goal = AchieveGoal("Goal", leaf=True)
+    obstacle = Obstacle("Obstacle")
+    guard = AchieveGoal("Guard", leaf=True)
+    links = [ObstructionLink(goal, obstacle), ResolutionLink(guard, obstacle)]
+    assert Evaluation([goal, guard], links, {goal: True}).label(goal) == Label.SATISFIED
+    assert Evaluation([goal, guard], links, {goal: True, obstacle: True, guard: False}).label(goal) == Label.DENIED
+    # An unknown resolving goal leaves it open whether the obstacle occurs.
+    assert Evaluation([goal, guard], links, {goal: True, obstacle: True}).label(goal) == Label.UNKNOWN
+    # The resolving goal holding prevents the obstacle even when it is assigned to occur.
+    evaluation = Evaluation([goal, guard], links, {goal: True, obstacle: True, guard: True})
+    assert evaluation.label(obstacle) == Label.DENIED
+    assert evaluation.label(goal) == Label.SATISFIED
+
+
+def test_refinement_cycle_stays_unknown():
+    first = AchieveGoal("First")
+    second = AchieveGoal("Second", refinements=[Refinement(True, [first])])
+    first.disjunctions = [Refinement(True, [second])]
+    evaluation = Evaluation([first], [], {})
+    assert {first.node_id, second.node_id} <= evaluation.cyclic
+    assert evaluation.label(first) == Label.UNKNOWN
+
+
+def test_assign_matches_a_fresh_evaluation():
+    roots, links = generate_model(300, sharing=0.2, obstacle_density=0.2, seed=2)
+    evaluation = Evaluation(roots, links)
+    rng = random.Random(4)
+    vertices = list(evaluation.index.vertices.values())
+    leaves = [v for v in vertices if isinstance(v, (Goal, Obstacle))]
+    assignment = {}
+    for _ in range(40):
+        vertex = rng.choice(leaves)
+        value = rng.choice([True, False, Label.WEAKLY_SATISFIED, None])
+        evaluation.assign(vertex, value)
+        if value is None:
+            assignment.pop(vertex, None)
+        else:
+            assignment[vertex] = value
+    assert evaluation.labels == Evaluation(roots, links, assignment).labels
@@ -0,0 +1,65 @@
+"""
+Tests for the goals obstacles and conflicts reach in the impact report.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+from goalmodeling.schema import AchieveGoal, Obstacle, Refinement, ObstructionLink, ResolutionLink, ConflictLink
+from goalmodeling.impact import ImpactReport
+
+
+def model():
+    goal = AchieveGoal("G", leaf=True)
+    other = AchieveGoal("G2", leaf=True)
+    root = AchieveGoal("Root", refinements=[Refinement(True, [goal, other])])
+    return root, goal, other, Obstacle("O")
+
+
+def names(goals):
+    return [goal.name for goal in goals]
+
+
+def test_obstacle_denies_the_goals_above():
+    root, goal, _, obstacle = model()
+    impact, = ImpactReport([root], [ObstructionLink(goal, obstacle)]).impacts
+    assert names(impact.affected) == ["G", "Root"]
+    assert names(impact.denied) == ["G", "Root"]
+    assert names(impact.roots) == ["Root"]
+    assert not impact.resolved
+
+
+def test_resolution_above_the_obstructed_goal_does_not_hide_it():
+    root, goal, _, obstacle = model()
+    report = ImpactReport([root], [ObstructionLink(goal, obstacle), ResolutionLink(root, obstacle)])
+    impact, = report.impacts
+    assert names(impact.affected) == ["G", "Root"]
+    assert names(impact.denied) == ["G", "Root"]
+    assert impact.resolved
+    assert report.unresolved() == []
+
+
+def test_alternative_refinement_only_affects():
+    goal = AchieveGoal("G", leaf=True)
+    root = AchieveGoal("Root", refinements=[Refinement(True, [goal]),
+                                            Refinement(True, [AchieveGoal("Other", leaf=True)])])
+    obstacle = Obstacle("O")
+    impact, = ImpactReport([root], [ObstructionLink(goal, obstacle)]).impacts
+    assert names(impact.affected) == ["G", "Root"]
+    assert names(impact.denied) == ["G"]
+
+
+def test_refinement_cycle_is_not_dropped():
+    first = AchieveGoal("A", leaf=True)
+    second = AchieveGoal("B", refinements=[Refinement(True, [first])])
+    first.refinements = [Refinement(True, [second])]
+    first.leaf = False
+    root = AchieveGoal("Root", refinements=[Refinement(True, [second])])
+    impact, = ImpactReport([root], [ObstructionLink(first, Obstacle("O"))]).impacts
+    assert sorted(names(impact.denied)) == ["A", "B", "Root"]
+
+
+def test_conflict_denies_what_both_goals_deny():
+    root, goal, other, _ = model()
+    impact, = ImpactReport([root], [ConflictLink(goal, other)]).impacts
+    assert sorted(names(impact.affected)) == ["G", "G2", "Root"]
+    assert names(impact.denied) == ["Root"]
@@ -0,0 +1,60 @@
+"""
+Tests for editing lazy proxies under a memory budget.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+import gc
+
+from goalmodeling.examples import MODELS
+from goalmodeling.lazy import LazyModel, TableSource
+from goalmodeling.schema import Agent, generate_graph
+from goalmodeling.serialization import flatten
+
+
+def open_model(budget=1, name="figure8.2"):
+    roots, links = MODELS[name]()
+    return LazyModel(TableSource(flatten(roots, links)), budget=budget)
+
+
+def render_everything(model):
+    return generate_graph(model.roots(), model.links())
+
+
+def test_rendering_does_not_pin():
+    model = open_model()
+    render_everything(model)
+    assert model.stats()["pinned"] == 0
+    assert model.stats()["live_resolved"] <= 1
+
+
+def test_scalar_edit_survives_eviction():
+    model = open_model()
+    child = model.roots()[0].disjunctions[0].children[0]
+    key = model.key(child)
+    child.name = "Edited"
+    del child
+    render_everything(model)
+    gc.collect()
+    assert model.stats()["evicted"] > 0
+    assert model.vertex(key).name == "Edited"
+    assert "Edited" in render_everything(model)
+
+
+def test_agent_edit_survives_eviction():
+    model = open_model(budget=None, name="figure8.4")
+    agent = next(v for v in (model.vertex(key) for key in range(model.source.size())) if isinstance(v, Agent))
+    key = model.key(agent)
+    agent.name = "Renamed agent"
+    del agent
+    gc.collect()
+    assert model.vertex(key).name == "Renamed agent"
+
+
+def test_node_ids_are_stable_without_a_table_per_key():
+    model = open_model()
+    first = [v.node_id for v in model.roots()]
+    render_everything(model)
+    gc.collect()
+    assert [v.node_id for v in model.roots()] == first
+    assert model._node_ids == {}
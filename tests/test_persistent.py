@@ -0,0 +1,99 @@
+"""
+Tests for editing shared vertices in persistent versions.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+import re
+
+from goalmodeling.schema import AchieveGoal, Refinement, ObstructionLink, Obstacle, generate_graph
+from goalmodeling.persistent import freeze, FragmentCache, Version
+
+
+def shared_model():
+    shared = AchieveGoal("Shared", leaf=True)
+    b = AchieveGoal("B", refinements=[Refinement(True, [shared])])
+    c = AchieveGoal("C", refinements=[Refinement(True, [shared])])
+    a = AchieveGoal("A", refinements=[Refinement(True, [b, c])])
+    return a, shared
+
+
+def labels(text, node_id):
+    return set(re.findall(r"node%d(\[[^\]]*\][^ \n:]*)" % node_id, text))
+
+
+def test_rename_through_one_path_renames_every_occurrence():
+    a, shared = shared_model()
+    version = freeze([a])
+    renamed = version.update((0, 0, 0, 0, 0), name="Renamed")
+    text = FragmentCache().render(renamed)
+    assert labels(text, shared.node_id) == {'[/"Achieve[Renamed]"/]'}
+    assert renamed.get((0, 0, 1, 0, 0)).vertex.name == "Renamed"
+    # The original version is unchanged.
+    assert version.get((0, 0, 1, 0, 0)).vertex.name == "Shared"
+
+
+def test_thaw_gives_one_vertex_per_id():
+    a, shared = shared_model()
+    roots, _ = freeze([a]).update((0, 0, 0, 0, 0), name="Renamed").thaw()
+    b, c = roots[0].disjunctions[0].children
+    assert b.disjunctions[0].children[0] is c.disjunctions[0].children[0]
+
+
+def test_edit_below_shared_vertex():
+    a, shared = shared_model()
+    shared.leaf = False
+    shared.disjunctions = [Refinement(True, [AchieveGoal("Below", leaf=True)])]
+    version = freeze([a]).update((0, 0, 1, 0, 0, 0, 0), name="Changed")
+    assert version.get((0, 0, 0, 0, 0, 0, 0)).vertex.name == "Changed"
+    roots, links = version.thaw()
+    assert FragmentCache().render(version) == generate_graph(roots, links)
+
+
+def test_inserted_existing_node_is_shared():
+    a, shared = shared_model()
+    other = AchieveGoal("Other", leaf=True)
+    version = freeze([a, other])
+    node = version.get((1,))
+    version = version.insert((0, 0), node).update((1,), name="Moved")
+    assert version.get((0, 0, 2)).vertex.name == "Moved"
+    roots, links = version.thaw()
+    assert FragmentCache().render(version) == generate_graph(roots, links)
+
+
+def test_edit_of_linked_start():
+    a, shared = shared_model()
+    obstacle = Obstacle("Blocked")
+    version = freeze([a], [ObstructionLink(shared, obstacle)])
+    version = version.update((0, 0, 0, 0, 0), name="Renamed")
+    roots, links = version.thaw()
+    assert links[0].goal is roots[0].disjunctions[0].children[0].disjunctions[0].children[0]
+    assert FragmentCache().render(version) == generate_graph(roots, links)
+
+
+def test_inserted_vertex_is_edited_on_the_fast_path(monkeypatch):
+    root = AchieveGoal("Root", refinements=[Refinement(True, [AchieveGoal(f"{i}", leaf=True) for i in range(50)])])
+    version = freeze([root]).insert((0, 0), AchieveGoal("New", leaf=True))
+    version = version.insert((0, 0, 50), Refinement(True, [AchieveGoal("Below", leaf=True)]))
+    version = version.add_root(AchieveGoal("Second root", leaf=True))
+
+    def walk_everything(*args):
+        raise AssertionError("edit rebuilt the whole version")
+
+    monkeypatch.setattr(Version, "_substitute", walk_everything)
+    version = version.update((0, 0, 50), name="Renamed")
+    version = version.update((0, 0, 50, 0, 0), name="Renamed below")
+    version = version.update((1,), name="Renamed root")
+    assert version.get((0, 0, 50)).vertex.name == "Renamed"
+    assert version.get((0, 0, 50, 0, 0)).vertex.name == "Renamed below"
+
+
+def test_reinserted_node_is_edited_everywhere():
+    root = AchieveGoal("Root", refinements=[Refinement(True, [AchieveGoal("Child", leaf=True)])])
+    version = freeze([root])
+    child = version.get((0, 0, 0))
+    version = version.insert((0,), Refinement(True, [AchieveGoal("Other", leaf=True)]))
+    version = version.insert((0, 1), child).update((0, 0, 0), name="Renamed")
+    assert version.get((0, 1, 1)).vertex.name == "Renamed"
+    roots, links = version.thaw()
+    assert FragmentCache().render(version) == generate_graph(roots, links)
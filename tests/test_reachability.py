@@ -0,0 +1,112 @@
+"""
+Tests that reachability queries agree with a walk of the model as it grows.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+import random
+
+from goalmodeling.index import ModelIndex
+from goalmodeling.reachability import ReachabilityIndex
+from goalmodeling.schema import AchieveGoal, Obstacle, Refinement, ObstructionLink
+from benchmarks.generator import generate_model
+
+
+def walked_roots(index: ReachabilityIndex, vertex):
+    # Every parentless vertex from which a walk down the edges reaches the vertex.
+    found = []
+    for top in index.vertices:
+        if index.parents[top]:
+            continue
+        seen, stack = {top}, [top]
+        while stack:
+            node_id = stack.pop()
+            if node_id == vertex.node_id:
+                found.append(index.vertices[top])
+                break
+            for child in index.children[node_id]:
+                if child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+    return found
+
+
+def check(index: ReachabilityIndex):
+    for vertex in index.vertices.values():
+        assert index.roots_of(vertex) == walked_roots(index, vertex), vertex.name
+
+
+def test_roots_of_after_incremental_edges():
+    roots, links = generate_model(300, sharing=0.2, obstacle_density=0.2, conflict_density=0.01)
+    index = ReachabilityIndex(roots, links)
+    check(index)
+    rng = random.Random(3)
+    model = ModelIndex(roots, links)
+    goals = [v for v in model.vertices.values() if isinstance(v, AchieveGoal)]
+    for step in range(30):
+        parent = rng.choice(goals)
+        if step % 3 == 0:
+            index.add_refinement(parent, Refinement(True, [AchieveGoal(f"new {step}")]))
+        elif step % 3 == 1:
+            # An existing vertex becomes shared.
+            index.add_refinement(parent, Refinement(True, [rng.choice(goals)]))
+        else:
+            index.add_link(ObstructionLink(parent, Obstacle(f"obstacle {step}")))
+    check(index)
+
+
+def test_separate_top_obstacle_is_its_own_root():
+    goal = AchieveGoal("Goal")
+    obstacle = Obstacle("Obstacle")
+    index = ReachabilityIndex([goal, obstacle])
+    assert index.roots_of(obstacle) == [obstacle]
+    index.add_link(ObstructionLink(goal, obstacle))
+    assert index.roots_of(obstacle) == [goal]
+
+
+def walked_below(index: ReachabilityIndex, top: int):
+    seen, stack = {top}, [top]
+    while stack:
+        for child in index.children[stack.pop()]:
+            if child not in seen:
+                seen.add(child)
+                stack.append(child)
+    return seen
+
+
+def check_reaches(index: ReachabilityIndex):
+    vertices = list(index.vertices.values())
+    for ancestor in vertices:
+        below = walked_below(index, ancestor.node_id)
+        for descendant in vertices:
+            assert index.reaches(ancestor, descendant) == (descendant.node_id in below)
+
+
+def test_reaches_matches_a_walk_as_the_model_grows():
+    roots, links = generate_model(150, sharing=0.3, obstacle_density=0.2, conflict_density=0.01, seed=5)
+    index = ReachabilityIndex(roots, links)
+    check_reaches(index)
+    rng = random.Random(7)
+    goals = [v for v in index.vertices.values() if isinstance(v, AchieveGoal)]
+    for step in range(20):
+        parent = rng.choice(goals)
+        if step % 2:
+            index.add_refinement(parent, Refinement(True, [rng.choice(goals)]))
+        else:
+            index.add_refinement(parent, Refinement(True, [AchieveGoal(f"new {step}")]))
+    check_reaches(index)
+
+
+def test_tree_shaped_model_keeps_no_reach():
+    roots, links = generate_model(300, sharing=0.0, obstacle_density=0.0, conflict_density=0.0)
+    index = ReachabilityIndex(roots, links)
+    assert index.reach == {}
+    assert not index.below_shared
+
+
+def test_cycle_reaches_every_vertex_on_it():
+    first = AchieveGoal("First")
+    second = AchieveGoal("Second", refinements=[Refinement(True, [first])])
+    first.disjunctions = [Refinement(True, [second])]
+    index = ReachabilityIndex([first])
+    assert index.reaches(second, first) and index.reaches(first, second)
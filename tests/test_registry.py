@@ -0,0 +1,71 @@
+"""
+Tests for releasing models from the model registry once they are collected.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+import gc
+
+from goalmodeling.examples import achievement_model, conflicts_model
+from goalmodeling.registry import ModelRegistry
+from goalmodeling.serialization import dumps
+from goalmodeling.server import RenderService
+
+
+def test_dropped_model_is_released():
+    registry = ModelRegistry()
+    roots, links = achievement_model()
+    model_id = registry.register(roots, links, "achievement")
+    released = []
+    registry.attach(model_id, {"cached": 1}, released.append)
+    stats = registry.stats()
+    assert stats["live_models"] == 1
+    assert stats["live_vertices"] == registry.live(model_id) > 0
+
+    del roots, links
+    gc.collect()
+    stats = registry.stats()
+    assert not registry.is_alive(model_id)
+    assert registry.live(model_id) == 0
+    assert stats["registered"] == stats["released"] == 1
+    assert stats["live_models"] == stats["live_vertices"] == 0
+    assert released == [{"cached": 1}]
+
+
+def test_live_model_is_kept():
+    registry = ModelRegistry()
+    kept = achievement_model()
+    kept_id = registry.register(*kept)
+    dropped_id = registry.register(*conflicts_model())
+    state = {"cached": 1}
+    registry.attach(kept_id, state)
+    gc.collect()
+    assert registry.models() == [kept_id]
+    assert not registry.is_alive(dropped_id)
+    assert registry.stats()["live_vertices"] == registry.live(kept_id) > 0
+    assert state == {"cached": 1}
+
+
+def test_unregister_releases_state_at_once():
+    registry = ModelRegistry()
+    roots, links = achievement_model()
+    model_id = registry.register(roots, links)
+    state = {"cached": 1}
+    registry.attach(model_id, state)
+    registry.unregister(model_id)
+    assert state == {}
+    assert registry.stats()["released"] == 1
+    # State attached to a model no longer tracked is released at once.
+    later = {"cached": 1}
+    registry.attach(model_id, later)
+    assert later == {}
+
+
+def test_rendered_models_are_released():
+    service = RenderService(registry=ModelRegistry())
+    for model in (achievement_model(), conflicts_model()):
+        service.render(dumps(*model).encode("utf-8"))
+    gc.collect()
+    models = service.stats()["models"]
+    assert models["registered"] == models["released"] == 2
+    assert models["live_models"] == models["live_vertices"] == 0
@@ -0,0 +1,27 @@
+"""
+Tests for incremental updates of the responsibility index.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+from goalmodeling.schema import AchieveGoal, Refinement, Agent, AgentType
+from goalmodeling.responsibility import ResponsibilityIndex
+
+
+def test_added_goals_are_indexed_once():
+    leaf = AchieveGoal("Leaf")
+    root = AchieveGoal("Root", refinements=[Refinement(True, [leaf])])
+    index = ResponsibilityIndex([root])
+    assert index.summary()["leaf_goals"] == 1
+
+    first, second = AchieveGoal("First"), AchieveGoal("Second")
+    index.add_refinement(leaf, Refinement(True, [first]))
+    index.add_child(leaf.disjunctions[0], second)
+    assert set(index.uncovered()) == {first, second}
+
+    index.add_perform(first, Agent("Robot", AgentType.SOFTWARE_AGENT))
+    index.add_child(leaf.disjunctions[0], AchieveGoal("Third"))
+    summary = index.summary()
+    assert summary["leaf_goals"] == 3
+    assert summary["uncovered"] == 2
+    assert summary["software_load"] == 1
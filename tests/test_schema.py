@@ -0,0 +1,72 @@
+"""
+Tests for escaping and memoizing the labels of the Mermaid diagram.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+import pytest
+
+from goalmodeling.schema import (
+    AchieveGoal,
+    Agent,
+    AgentType,
+    Obstacle,
+    Operation,
+    OperationCategory,
+    PerformanceLink,
+    Refinement,
+    annotation_diagram,
+    escape_label,
+    generate_graph,
+)
+
+
+@pytest.mark.parametrize("text, quoted, expected", [
+    ('Say "hi"', True, "Say #quot;hi#quot;"),
+    ("Two\nlines\r\nhere", True, "Two<br>lines<br>here"),
+    ("Keep [brackets] (and) {braces}", True, "Keep [brackets] (and) {braces}"),
+    ("Keep [brackets] (and) {braces}", False, "Keep #91;brackets#93; #40;and#41; #123;braces#125;"),
+    ("Step #1; then #quot;", True, "Step #35;1; then #35;quot;"),
+    ("Step #1; then #quot;", False, "Step #35;1; then #35;quot;"),
+    ("Issue #12 and a; b", True, "Issue #12 and a; b"),
+    ("Issue #12 and a; b", False, "Issue #12 and a; b"),
+    ("<b>Bold</b> _markdown_", True, "<b>Bold</b> _markdown_"),
+])
+def test_escape_label(text, quoted, expected):
+    assert escape_label(text, quoted) == expected
+
+
+def test_goal_and_obstacle_labels_stay_quoted():
+    goal = AchieveGoal('Quote " and #9; [x]')
+    obstacle = Obstacle("Line\nbreak")
+    assert goal.to_string() == f'node{goal.node_id}[/"Achieve[Quote #quot; and #35;9; [x]]"/]'
+    assert obstacle.to_string() == f'node{obstacle.node_id}[\\"Line<br>break"\\]'
+
+
+def test_agent_label_is_bare():
+    agent = Agent("Bank {core} (v2) #3;", AgentType.SOFTWARE_AGENT)
+    assert agent.to_string() == f"node{agent.node_id}{{{{Bank #123;core#125; #40;v2#41; #35;3;}}}}"
+
+
+def test_annotation_is_escaped():
+    goal = AchieveGoal("Goal", annotation='Says "no"\nand #1;')
+    assert annotation_diagram(goal) == (f'annotationnode{goal.node_id}["Says #quot;no#quot;<br>and #35;1;"]'
+                                        f':::stroke -.- node{goal.node_id}\n')
+
+
+def test_rendering_again_after_edits():
+    agent = Agent("Clerk", AgentType.ENVIRONMENT_AGENT)
+    goal = AchieveGoal("Pay", performs=[PerformanceLink(agent, Operation("Send", OperationCategory(0)))],
+                       leaf=True, annotation="Monthly")
+    root = AchieveGoal("Root", refinements=[Refinement(True, [goal])])
+    before = generate_graph([root])
+    assert generate_graph([root]) == before
+    goal.name = 'Pay "now"'
+    agent.name = "Clerk [night]"
+    goal.annotation = "Weekly"
+    after = generate_graph([root])
+    assert 'Achieve[Pay #quot;now#quot;]' in after and "Pay]" not in after
+    assert "fa:fa-person Clerk #91;night#93;}}" in after and "Clerk}}" not in after
+    assert "Weekly" in after and "Monthly" not in after
+    goal.node_id += 1000
+    assert f"node{goal.node_id}[/" in generate_graph([root])
@@ -0,0 +1,46 @@
+"""
+Tests for incremental updates and the leaf and unrefined filters of the search index.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+from goalmodeling.schema import AchieveGoal, Obstacle, Refinement
+from goalmodeling.search import SearchIndex
+
+
+def model():
+    marked = AchieveGoal("Marked leaf", leaf=True)
+    open_goal = AchieveGoal("Open goal")
+    root = AchieveGoal("Root goal", refinements=[Refinement(True, [marked, open_goal])])
+    return root, marked, open_goal
+
+
+def names(vertices):
+    return sorted(vertex.name for vertex in vertices)
+
+
+def test_leaf_follows_the_leaf_flag():
+    root, marked, open_goal = model()
+    index = SearchIndex([root])
+    assert names(index.search(leaf=True)) == ["Marked leaf"]
+    assert names(index.search(unrefined=True)) == ["Marked leaf", "Open goal"]
+    assert names(index.search(unrefined=False)) == ["Root goal"]
+
+
+def test_update_indexes_only_new_vertices():
+    root, marked, open_goal = model()
+    index = SearchIndex([root])
+    assert index.update() == 0
+    index.index.add_refinement(open_goal, Refinement(True, [Obstacle("Late obstacle")]))
+    assert len(index.search("late")) == 0
+    assert index.update() == 1
+    assert names(index.search("late")) == ["Late obstacle"]
+    assert index.update() == 0
+
+
+def test_add_refinement_updates_unrefined():
+    root, marked, open_goal = model()
+    index = SearchIndex([root])
+    index.add_refinement(open_goal, Refinement(True, [AchieveGoal("Sub goal")]))
+    assert names(index.search(unrefined=True)) == ["Marked leaf", "Sub goal"]
+    assert names(index.search("goal", unrefined=False)) == ["Open goal", "Root goal"]
@@ -0,0 +1,84 @@
+"""
+Tests that goal categories survive every encoding of a model.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+import pickle
+import struct
+
+import pytest
+
+from goalmodeling.lazy import LazyModel, TableSource, JSONLinesSource
+from goalmodeling.schema import AchieveGoal, SoftGoal, Refinement, GoalCategory
+from goalmodeling.serialization import (
+    dumps,
+    loads,
+    flatten,
+    to_bytes,
+    from_bytes,
+    write_jsonl,
+)
+from goalmodeling.transfer import ModelPayload
+
+CATEGORIES = [GoalCategory.INFORMATION, GoalCategory.QOS_SAFETY]
+
+
+def categorized_model():
+    child = SoftGoal("Child", leaf=True, categories=[GoalCategory.ACCURACY])
+    root = AchieveGoal("Root", refinements=[Refinement(True, [child, AchieveGoal("Plain", leaf=True)])],
+                       categories=CATEGORIES)
+    return [root], []
+
+
+def categories_of(roots):
+    child, plain = roots[0].disjunctions[0].children
+    return roots[0].categories, child.categories, plain.categories
+
+
+EXPECTED = (CATEGORIES, [GoalCategory.ACCURACY], [])
+
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_round_trip_keeps_categories(binary):
+    roots, _ = loads(dumps(*categorized_model(), binary=binary))
+    assert categories_of(roots) == EXPECTED
+
+
+def test_payload_keeps_categories():
+    payload = pickle.loads(pickle.dumps(ModelPayload(*categorized_model())))
+    assert categories_of(payload.roots) == EXPECTED
+
+
+def test_lazy_sources_keep_categories(tmp_path):
+    table = flatten(*categorized_model())
+    assert categories_of(LazyModel(TableSource(from_bytes(to_bytes(table)))).roots()) == EXPECTED
+    path = tmp_path / "model.jsonl"
+    with open(path, "w") as fp:
+        write_jsonl(table, fp)
+    source = JSONLinesSource(str(path))
+    try:
+        assert categories_of(LazyModel(source).roots()) == EXPECTED
+    finally:
+        source.close()
+
+
+def test_version_1_binary_is_still_read():
+    data = to_bytes(flatten([AchieveGoal("Old", leaf=True)]))
+    # Rewrite as version 1: no categories section.
+    header = struct.Struct("<4sHQ12Q")
+    magic, _, count, *lengths = header.unpack_from(data)
+    old = struct.pack("<4sHQ11Q", magic, 1, count, *lengths[:11]) + data[header.size:header.size + sum(lengths[:11])]
+    roots, _ = loads(old)
+    assert roots[0].name == "Old" and roots[0].categories == []
+
+
+def test_inconsistent_categories_are_rejected():
+    data = bytearray(to_bytes(flatten(*categorized_model())))
+    # The last integer is a category value; cut it and fix the section length.
+    header = struct.Struct("<4sHQ12Q")
+    magic, version, count, *lengths = header.unpack_from(data)
+    lengths[11] -= 4
+    cut = struct.pack("<4sHQ12Q", magic, version, count, *lengths) + bytes(data[header.size:-4])
+    with pytest.raises(ValueError):
+        loads(cut)
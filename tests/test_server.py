@@ -0,0 +1,120 @@
+"""
+Tests for the error replies of the local render server.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+import http.client
+import json
+import threading
+
+import pytest
+
+from goalmodeling.schema import AchieveGoal, Refinement
+from goalmodeling.serialization import dumps
+from goalmodeling.examples import achievement_model
+from goalmodeling.server import make_server, RenderService, MAX_DEPTH
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = make_server(port=0, max_body=4096)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def post(server, body, path="/render"):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=10)
+    try:
+        connection.request("POST", path, body=body)
+        response = connection.getresponse()
+        return response.status, response.read().decode("utf-8")
+    finally:
+        connection.close()
+
+
+def test_valid_model_renders(server):
+    status, text = post(server, dumps(*achievement_model()))
+    assert status == 200
+    assert text.startswith("flowchart BT")
+
+
+@pytest.mark.parametrize("body", [b"[1, 2]", b"5", b'"model"', b"null"])
+def test_json_that_is_not_an_object_is_rejected(server, body):
+    status, text = post(server, body)
+    assert status == 400
+    assert "JSON object" in text
+
+
+def test_empty_refinement_is_rejected(server):
+    goal = AchieveGoal("Empty", refinements=[Refinement(True, [])])
+    status, text = post(server, dumps([goal]))
+    assert status == 400
+    assert "no children" in text
+
+
+def test_goal_listed_as_refinement_is_rejected(server):
+    data = json.loads(dumps([AchieveGoal("Parent"), AchieveGoal("Child")]))
+    data["child_offsets"] = [0, 1, 1]
+    data["child_index"] = [1]
+    data["roots"] = [0]
+    status, text = post(server, json.dumps(data))
+    assert status == 400
+    assert "cannot be a child" in text
+
+
+def chain(levels):
+    root = goal = AchieveGoal("0")
+    for level in range(1, levels):
+        child = AchieveGoal(str(level))
+        goal.disjunctions = [Refinement(True, [child])]
+        goal = child
+    return root
+
+
+def test_render_failure_gets_a_status():
+    class FailingService:
+        def render(self, body, output, mode):
+            raise RuntimeError("injected")
+
+    failing = make_server(port=0)
+    failing.RequestHandlerClass.service = FailingService()
+    thread = threading.Thread(target=failing.serve_forever, daemon=True)
+    thread.start()
+    try:
+        status, text = post(failing, dumps(*achievement_model()))
+    finally:
+        failing.shutdown()
+        failing.server_close()
+    assert status == 500
+    assert "RuntimeError" in text
+
+
+def test_depth_limit():
+    service = RenderService()
+    assert service.render(dumps([chain(MAX_DEPTH)], binary=True)).startswith("flowchart BT")
+    with pytest.raises(ValueError, match=f"deeper than {MAX_DEPTH}"):
+        service.render(dumps([chain(MAX_DEPTH + 1)], binary=True))
+
+
+def test_deep_model_is_rejected_before_rendering(server):
+    server.RequestHandlerClass.service.max_depth = 3
+    try:
+        status, text = post(server, dumps([chain(4)]))
+    finally:
+        server.RequestHandlerClass.service.max_depth = MAX_DEPTH
+    assert status == 400
+    assert "deeper than 3 levels" in text
+
+
+def test_body_above_limit_is_rejected(server):
+    status, _ = post(server, b"{" + b" " * 5000 + b"}")
+    assert status == 413
+
+
+def test_unknown_path(server):
+    status, _ = post(server, b"{}", "/nothing")
+    assert status == 404
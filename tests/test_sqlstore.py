@@ -0,0 +1,47 @@
+"""
+Tests that the SQLite store keeps goal categories.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+from goalmodeling.lazy import LazyModel, SQLiteSource
+from goalmodeling.schema import AchieveGoal, SoftGoal, Refinement, GoalCategory
+from goalmodeling.sqlstore import SQLiteStore
+
+CATEGORIES = [GoalCategory.INFORMATION, GoalCategory.QOS_SAFETY]
+
+
+def categorized_model():
+    child = SoftGoal("Child", leaf=True, categories=[GoalCategory.ACCURACY])
+    return [AchieveGoal("Root", refinements=[Refinement(True, [child])], categories=CATEGORIES)]
+
+
+def categories_of(roots):
+    return roots[0].categories, roots[0].disjunctions[0].children[0].categories
+
+
+def test_load_restores_categories():
+    with SQLiteStore() as store:
+        roots = categorized_model()
+        store.save("model", roots)
+        loaded, _ = store.load("model")
+        assert categories_of(loaded) == (CATEGORIES, [GoalCategory.ACCURACY])
+
+
+def test_partial_load_and_lazy_source_restore_categories():
+    with SQLiteStore() as store:
+        store.save("model", categorized_model())
+        child = store.find(name="Child")[0].vertex_id
+        loaded, _ = store.load("model", [child])
+        assert loaded[0].categories == [GoalCategory.ACCURACY]
+        lazy = LazyModel(SQLiteSource(store, "model")).roots()
+        assert categories_of(lazy) == (CATEGORIES, [GoalCategory.ACCURACY])
+
+
+def test_saving_again_replaces_categories():
+    with SQLiteStore() as store:
+        store.save("model", categorized_model())
+        store.save("model", [AchieveGoal("Plain", leaf=True)])
+        loaded, _ = store.load("model")
+        assert loaded[0].categories == []
+        assert store.connection.execute("SELECT COUNT(*) FROM categories").fetchone()[0] == 0
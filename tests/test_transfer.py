@@ -0,0 +1,69 @@
+"""
+Tests for sending models to other processes by pickling and through shared memory.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+import multiprocessing
+import pickle
+from multiprocessing import shared_memory
+
+import pytest
+
+from goalmodeling.examples import MODELS
+from goalmodeling.schema import AchieveGoal, Refinement, generate_graph
+from goalmodeling.serialization import flatten
+from goalmodeling.transfer import ModelPayload, SharedModel
+
+
+def shared_model():
+    shared = AchieveGoal("Shared", leaf=True)
+    first = AchieveGoal("First", refinements=[Refinement(True, [shared])])
+    second = AchieveGoal("Second", refinements=[Refinement(True, [shared])])
+    return [AchieveGoal("Root", refinements=[Refinement(True, [first, second])])], []
+
+
+def describe(model):
+    roots, links = model.roots, model.links
+    first, second = roots[0].disjunctions[0].children
+    shared = first.disjunctions[0].children[0] is second.disjunctions[0].children[0]
+    return generate_graph(roots, links), [root.node_id for root in roots], shared
+
+
+def test_payload_keeps_node_ids_and_sharing():
+    roots, links = shared_model()
+    payload = pickle.loads(pickle.dumps(ModelPayload(roots, links)))
+    diagram, node_ids, shared = describe(payload)
+    assert diagram == generate_graph(roots, links)
+    assert node_ids == [root.node_id for root in roots]
+    assert shared
+
+
+@pytest.mark.parametrize("name", sorted(MODELS))
+def test_payload_rebuilds_the_same_model(name):
+    roots, links = MODELS[name]()
+    payload = pickle.loads(pickle.dumps(ModelPayload(roots, links)))
+    assert vars(flatten(payload.roots, payload.links)) == vars(flatten(roots, links))
+    assert generate_graph(payload.roots, payload.links) == generate_graph(roots, links)
+
+
+def test_round_trip_through_a_pool():
+    roots, links = shared_model()
+    expected = generate_graph(roots, links), [root.node_id for root in roots], True
+    with multiprocessing.Pool(2) as pool, SharedModel(roots, links) as shared:
+        assert pool.map(describe, [ModelPayload(roots, links), shared]) == [expected, expected]
+
+
+def test_only_the_owner_frees_the_memory():
+    roots, links = shared_model()
+    shared = SharedModel(roots, links)
+    attached = pickle.loads(pickle.dumps(shared))
+    assert describe(attached)[0] == generate_graph(roots, links)
+    attached.unlink()
+    attached.close()
+    reopened = shared_memory.SharedMemory(name=shared.name)
+    reopened.close()
+    with shared:
+        pass
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=shared.name)
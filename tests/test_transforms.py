@@ -0,0 +1,63 @@
+"""
+Tests that transforms derive the models generate_graph expects, sharing what they do not change.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+import pytest
+
+from goalmodeling.examples import MODELS
+from goalmodeling.index import ModelIndex
+from goalmodeling.schema import generate_graph, SoftGoal, Refinement, Goal
+from goalmodeling.transforms import Transform, pattern, updated
+from benchmarks.generator import generate_model
+
+CHAIN = (Transform()
+         .filter(lambda vertex: not isinstance(vertex, SoftGoal))
+         .rename_prefix("Achieve", "Reach")
+         .prune(lambda refinement: not refinement.complete))
+
+
+@pytest.mark.parametrize("name", sorted(MODELS))
+def test_empty_transform_shares_everything(name):
+    roots, links = MODELS[name]()
+    new_roots, new_links = Transform().apply(roots, links)
+    assert all(a is b for a, b in zip(new_roots, roots))
+    assert all(a is b for a, b in zip(new_links, links))
+
+
+@pytest.mark.parametrize("name", sorted(MODELS))
+def test_chain_equals_passes_one_at_a_time(name):
+    roots, links = MODELS[name]()
+    before = generate_graph(roots, links)
+    new_roots, new_links = CHAIN.apply(roots, links)
+    step_roots, step_links = roots, links
+    for step in CHAIN.passes:
+        step_roots, step_links = Transform((step,)).apply(step_roots, step_links)
+    assert generate_graph(new_roots, new_links) == generate_graph(step_roots, step_links)
+    # The original model is unchanged.
+    assert generate_graph(roots, links) == before
+
+    vertices = ModelIndex(new_roots, new_links).vertices.values()
+    assert not any(isinstance(vertex, SoftGoal) for vertex in vertices)
+    assert not any(isinstance(vertex, Refinement) and not vertex.complete for vertex in vertices)
+
+
+def test_unchanged_subtrees_are_shared():
+    roots, links = generate_model(2000, sharing=0.1, obstacle_density=0.1, conflict_density=0.05)
+    rename = Transform().map(lambda v: updated(v, name="X") if v is roots[0] else v)
+    new_roots, new_links = rename.apply(roots, links)
+    assert new_roots[0] is not roots[0] and new_roots[0].name == "X"
+    assert new_roots[0].disjunctions is roots[0].disjunctions
+    old = ModelIndex(roots, links).vertices
+    new = ModelIndex(new_roots, new_links).vertices
+    assert sum(1 for node_id, vertex in new.items() if old.get(node_id) is not vertex) == 1
+
+
+def test_rewrite_with_pattern():
+    roots, links = MODELS["figure9.5"]()
+    leaf_goals = pattern(Goal, disjunctions=[])
+    new_roots, new_links = Transform().rewrite(leaf_goals, lambda v, _: updated(v, leaf=True)).apply(roots, links)
+    for vertex in ModelIndex(new_roots, new_links).vertices.values():
+        if isinstance(vertex, Goal) and not vertex.disjunctions:
+            assert vertex.leaf
@@ -0,0 +1,85 @@
+"""
+Tests for the diagnostics of the model validator.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+import pytest
+
+from goalmodeling.examples import MODELS
+from goalmodeling.schema import (
+    AchieveGoal,
+    Agent,
+    AgentType,
+    ConflictLink,
+    Obstacle,
+    ObstructionLink,
+    PerformanceLink,
+    Refinement,
+)
+from goalmodeling.validation import DiagnosticCode, Severity, ValidationError, ensure_valid, errors, validate
+
+
+def codes(diagnostics):
+    return [(d.code, d.severity) for d in diagnostics]
+
+
+@pytest.mark.parametrize("name", sorted(MODELS))
+def test_examples_are_valid(name):
+    assert errors(validate(*MODELS[name]())) == []
+
+
+def test_cycle():
+    first = AchieveGoal("First")
+    second = AchieveGoal("Second", refinements=[Refinement(True, [first])])
+    first.disjunctions = [Refinement(True, [second])]
+    diagnostics = validate([first])
+    assert codes(diagnostics) == [(DiagnosticCode.CYCLE, Severity.ERROR)]
+    assert diagnostics[0].vertex is first
+
+
+def test_shared_vertex_is_not_a_cycle():
+    shared = AchieveGoal("Shared", leaf=True)
+    root = AchieveGoal("Root", refinements=[Refinement(True, [shared]), Refinement(True, [shared])])
+    assert validate([root]) == []
+
+
+def test_empty_refinement():
+    empty = Refinement(True, [])
+    diagnostics = validate([AchieveGoal("Root", refinements=[empty])])
+    assert codes(diagnostics) == [(DiagnosticCode.EMPTY_REFINEMENT, Severity.ERROR)]
+    assert diagnostics[0].vertex is empty
+
+
+def test_mixed_refinement():
+    mixed = Refinement(True, [AchieveGoal("Goal", leaf=True), Obstacle("Obstacle")])
+    diagnostics = validate([AchieveGoal("Root", refinements=[mixed])])
+    assert codes(diagnostics) == [(DiagnosticCode.MIXED_REFINEMENT, Severity.ERROR)]
+
+
+def test_link_outside_roots():
+    root = AchieveGoal("Root", leaf=True)
+    outside = AchieveGoal("Outside", leaf=True)
+    link = ConflictLink(root, outside)
+    diagnostics = validate([root], [link, ObstructionLink(root, Obstacle("Drawn with its link"))])
+    assert codes(diagnostics) == [(DiagnosticCode.LINK_OUTSIDE_ROOTS, Severity.WARNING)]
+    assert diagnostics[0].vertex is outside and diagnostics[0].link is link
+
+
+def test_agent_without_operation():
+    agent = Agent("Clerk", AgentType.ENVIRONMENT_AGENT)
+    goal = AchieveGoal("Pay", performs=[PerformanceLink(agent, None)], leaf=True)
+    diagnostics = validate([goal])
+    assert codes(diagnostics) == [(DiagnosticCode.AGENT_WITHOUT_OPERATION, Severity.WARNING)]
+    assert diagnostics[0].vertex is agent
+
+
+def test_ensure_valid_raises_on_errors_and_strict_warnings():
+    with pytest.raises(ValidationError) as raised:
+        ensure_valid([AchieveGoal("Root", refinements=[Refinement(True, [])])])
+    assert codes(raised.value.diagnostics) == [(DiagnosticCode.EMPTY_REFINEMENT, Severity.ERROR)]
+    agent = Agent("Clerk", AgentType.ENVIRONMENT_AGENT)
+    roots = [AchieveGoal("Pay", performs=[PerformanceLink(agent, None)], leaf=True)]
+    assert len(ensure_valid(roots)) == 1
+    with pytest.raises(ValidationError):
+        ensure_valid(roots, strict=True)
@@ -0,0 +1,69 @@
+"""
+Tests for evaluating many scenarios at once, with and without NumPy.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+import random
+
+import pytest
+
+from benchmarks.generator import generate_model
+from goalmodeling.evaluation import Evaluation, Label
+from goalmodeling.index import ModelIndex
+from goalmodeling.schema import AchieveGoal, Goal, Obstacle, ObstructionLink, Refinement, ResolutionLink
+from goalmodeling.whatif import BatchPlan
+
+
+def scenarios(plan: BatchPlan, count: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [[rng.random() < 0.6 for _ in plan.inputs] for _ in range(count)]
+
+
+def model():
+    # Every goal and obstacle is reported, not only the root, which rarely holds.
+    roots, links = generate_model(200, sharing=0.2, obstacle_density=0.2, seed=1)
+    vertices = ModelIndex(roots, links).vertices.values()
+    return [v for v in vertices if isinstance(v, (Goal, Obstacle))], links
+
+
+def test_small_model():
+    first, second = AchieveGoal("First", leaf=True), AchieveGoal("Second", leaf=True)
+    obstacle, guard = Obstacle("Obstacle"), AchieveGoal("Guard", leaf=True)
+    root = AchieveGoal("Root", refinements=[Refinement(True, [first, second])])
+    plan = BatchPlan([root, guard], [ObstructionLink(first, obstacle), ResolutionLink(guard, obstacle)],
+                     inputs=[first, second, obstacle, guard])
+    rows = [[True, True, False, False], [True, False, False, False],
+            [True, True, True, False], [True, True, True, True]]
+    assert plan.run(rows)[root] == [True, False, False, True]
+
+
+def test_matches_evaluation():
+    roots, links = model()
+    plan = BatchPlan(roots, links)
+    rows = scenarios(plan, 40)
+    results = plan.run(rows)
+    assert 0 < sum(map(sum, results.values())) < len(rows) * len(roots)
+    for i, row in enumerate(rows):
+        evaluation = Evaluation(roots, links, dict(zip(plan.inputs, row)))
+        for root in roots:
+            expected = evaluation.label(root) >= Label.WEAKLY_SATISFIED
+            assert results[root][i] == expected
+
+
+def test_numpy_gives_the_same_result():
+    numpy = pytest.importorskip("numpy")
+    roots, links = model()
+    plan = BatchPlan(roots, links)
+    rows = scenarios(plan, 300, seed=2)
+    packed = plan.run(rows)
+    vectors = plan.run(numpy.array(rows, dtype=bool))
+    for root in roots:
+        assert vectors[root].tolist() == packed[root]
+
+
+def test_wrong_number_of_columns():
+    roots, links = model()
+    plan = BatchPlan(roots, links)
+    with pytest.raises(ValueError):
+        plan.run_bits([0], 1)
@@ -0,0 +1,95 @@
+"""
+Tests that workspace views render like generate_graph on the same selection.
+Author(s): ateeq@cmu.edu
+
+2026-10-19: Initial version; AS.
+"""
+import pytest
+
+from goalmodeling.examples import MODELS
+from goalmodeling.schema import (
+    generate_graph,
+    SoftGoal,
+    Refinement,
+    AchieveGoal,
+    Agent,
+    AgentType,
+    Operation,
+    OperationCategory,
+    PerformanceLink,
+)
+from goalmodeling.workspace import Workspace
+from benchmarks.generator import generate_model
+
+
+def expected(workspace, name, roots, links):
+    view = workspace.views[name]
+    return generate_graph(view.roots or roots, links if view.links else [], workspace.scope(name))
+
+
+@pytest.fixture
+def model():
+    return generate_model(2000, sharing=0.2, obstacle_density=0.2, conflict_density=0.01, annotation_length=5)
+
+
+@pytest.mark.parametrize("name", sorted(MODELS))
+def test_full_view_is_generate_graph(name):
+    roots, links = MODELS[name]()
+    workspace = Workspace(roots, links)
+    workspace.add_view("all")
+    assert workspace.render("all") == generate_graph(roots, links)
+
+
+def test_views_render_like_generate_graph(model):
+    roots, links = model
+    workspace = Workspace(roots, links)
+    workspace.add_view("all")
+    for i, child in enumerate(roots[0].disjunctions[0].children):
+        workspace.add_view(f"sub{i}", roots=[child])
+    workspace.add_view("shallow", depth=3)
+    workspace.add_view("hard", include=lambda vertex: not isinstance(vertex, SoftGoal))
+    workspace.add_view("nolinks", links=False)
+    diagrams = workspace.render_all()
+    for name in workspace.views:
+        assert diagrams[name] == expected(workspace, name, roots, links), name
+    # A second batch reuses the fragments and gives the same text.
+    assert workspace.render_all() == diagrams
+
+
+def test_edits_show_in_every_view(model):
+    roots, links = model
+    workspace = Workspace(roots, links)
+    workspace.add_view("all")
+    sub = roots[0].disjunctions[0].children[0]
+    workspace.add_view("sub", roots=[sub])
+    workspace.render_all()
+
+    goal = sub.disjunctions[0].children[0]
+    goal.name = "RENAMED"
+    workspace.invalidate(goal)
+    workspace.add_refinement(goal, Refinement(True, [AchieveGoal("NEWCHILD")]))
+    diagrams = workspace.render_all()
+    for name in workspace.views:
+        assert diagrams[name] == expected(workspace, name, roots, links), name
+    assert "RENAMED" in diagrams["sub"] and "NEWCHILD" in diagrams["sub"]
+
+
+def test_invalidating_an_agent_or_operation_redraws_its_goals():
+    agent = Agent("Robot", AgentType.SOFTWARE_AGENT)
+    operation = Operation("Move", OperationCategory.SOFTWARE_TO_BE_OPERATION)
+    first = AchieveGoal("First", leaf=True, performs=[PerformanceLink(agent, operation)])
+    second = AchieveGoal("Second", leaf=True, performs=[PerformanceLink(agent, None)])
+    root = AchieveGoal("Root", refinements=[Refinement(True, [first, second])])
+    workspace = Workspace([root])
+    workspace.add_view("all")
+    workspace.add_view("first", roots=[first])
+    workspace.render_all()
+
+    agent.name = "Drone"
+    workspace.invalidate(agent)
+    operation.name = "Fly"
+    workspace.invalidate(operation)
+    diagrams = workspace.render_all()
+    assert diagrams["all"] == generate_graph([root])
+    assert diagrams["first"] == generate_graph([first])
+    assert "Robot" not in diagrams["all"] and "Fly" in diagrams["first"]